@@ -1,22 +1,51 @@
 """Application factory for the Sunbeam Online Course Portal backend."""
 
-from flask import Flask
+from flask import Flask, Response
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 from backend.config.settings import settings
+from backend.middlewares.auth_middleware import authenticate_request
+from backend.middlewares.load_shedding import (
+    UNAVAILABLE_ERRORS,
+    release_breaker_probe,
+    shed_load,
+    unavailable_response,
+)
+from backend.middlewares.read_your_writes import mark_primary_after_write, pin_primary_reads
 from backend.routes import register_blueprints
+from backend.utils.metrics import registry
 
 
 def create_app() -> Flask:
     """Create and configure the Flask application instance."""
     app = Flask(__name__)
     app.config["SECRET_KEY"] = settings.secret_key
-
+    if settings.trusted_proxy_hops:
+        # Take the client address and scheme from the proxies' X-Forwarded-* headers
+        hops = settings.trusted_proxy_hops
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+
+    # Reject early when the database is down or its pool queue is full.
+    app.before_request(shed_load)
+    app.teardown_request(release_breaker_probe)
+    # Breaker open or pool exhausted: 503 with Retry-After from any route.
+    for error in UNAVAILABLE_ERRORS:
+        app.register_error_handler(error, unavailable_response)
+    # Verify the bearer token once per request; route decorators read g.auth_claims.
+    app.before_request(authenticate_request)
+    # Clients that just wrote read from the primary until replicas catch up.
+    app.before_request(pin_primary_reads)
+    app.after_request(mark_primary_after_write)
     register_blueprints(app)
 
     @app.get("/health")
     def health_check():
         return {"status": "ok"}
 
+    @app.get("/metrics")
+    def metrics():
+        return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
     return app
 
 
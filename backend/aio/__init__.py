@@ -0,0 +1,27 @@
+"""Optional async serving mode (Quart + aiomysql behind an ASGI server).
+
+Install the extra dependencies with ``pip install -r backend/requirements-async.txt``.
+"""
+try:
+    import a2wsgi  # noqa: F401
+    import aiomysql  # noqa: F401
+    import quart  # noqa: F401
+except ImportError as exc:
+    raise ImportError(
+        "The async serving mode needs its optional dependencies: "
+        "pip install -r backend/requirements-async.txt"
+    ) from exc
+
+from .app import create_asgi_app, create_async_app
+from .db import AsyncDatabase, execute_non_query, execute_query, execute_single, stream_query, transaction
+
+__all__ = [
+    "AsyncDatabase",
+    "create_asgi_app",
+    "create_async_app",
+    "execute_non_query",
+    "execute_query",
+    "execute_single",
+    "stream_query",
+    "transaction",
+]
@@ -0,0 +1,69 @@
+"""ASGI application: async read endpoints in front of the Flask app.
+
+Requests that match one of the async routes are served by Quart on the event
+loop; everything else (writes, auth, /health, /metrics) is handed to the
+regular Flask app on a thread pool sized like the synchronous DB pool.
+"""
+from __future__ import annotations
+
+from a2wsgi import WSGIMiddleware
+from flask import Flask
+from quart import Quart
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import RequestRedirect
+
+from backend import create_app
+from backend.aio.auth import authenticate_request
+from backend.aio.db import AsyncDatabase
+from backend.aio.guards import release_breaker_probe, shed_load, unavailable_response
+from backend.aio.routes import async_courses_bp, async_videos_bp
+from backend.config.settings import settings
+from backend.middlewares.load_shedding import UNAVAILABLE_ERRORS
+
+
+def create_async_app() -> Quart:
+    """Quart app holding only the async read routes."""
+    # The async routes talk to MySQL through aiomysql, and the repository SQL
+    # they reuse is spelled for the configured driver.
+    if settings.db_backend != "mysql":
+        raise RuntimeError(
+            f"The async serving mode needs DB_BACKEND=mysql (DB_BACKEND is {settings.db_backend!r})"
+        )
+    app = Quart(__name__, static_folder=None)
+    app.config["SECRET_KEY"] = settings.secret_key
+
+    app.before_request(shed_load)
+    app.before_request(authenticate_request)
+    app.teardown_request(release_breaker_probe)
+    for error in UNAVAILABLE_ERRORS:
+        app.register_error_handler(error, unavailable_response)
+    app.register_blueprint(async_courses_bp, url_prefix="/api/courses")
+    app.register_blueprint(async_videos_bp, url_prefix="/api/videos")
+
+    @app.after_serving
+    async def close_pool() -> None:
+        await AsyncDatabase.close()
+
+    return app
+
+
+def create_asgi_app(flask_app: Flask | None = None):
+    """ASGI callable dispatching between the async routes and ``flask_app``."""
+    async_app = create_async_app()
+    sync_app = WSGIMiddleware(flask_app or create_app(), workers=settings.db_pool_max_size)
+    routes = async_app.url_map.bind("")
+
+    def is_async_route(scope) -> bool:
+        try:
+            routes.match(scope["path"], method=scope["method"])
+        except (HTTPException, RequestRedirect):
+            return False
+        return True
+
+    async def app(scope, receive, send) -> None:
+        if scope["type"] == "lifespan" or (scope["type"] == "http" and is_async_route(scope)):
+            await async_app(scope, receive, send)
+        else:
+            await sync_app(scope, receive, send)
+
+    return app
@@ -0,0 +1,68 @@
+"""Quart versions of the bearer-token stage and route decorators."""
+from __future__ import annotations
+
+from functools import wraps
+
+from quart import g, jsonify, request
+
+from backend.middlewares.auth_middleware import AuthError, authenticate, owner_denial, role_denial
+
+
+async def authenticate_request() -> None:
+    """before_request stage: verify the bearer token once and keep the result on ``g``."""
+    g.auth_claims = None
+    g.auth_error = None
+    try:
+        g.auth_claims = authenticate(request.headers.get("Authorization"))
+    except AuthError as e:
+        g.auth_error = e.message
+
+
+def _unauthorized(message: str, status: int = 401):
+    return jsonify({
+        "success": False,
+        "message": message
+    }), status
+
+
+def require_roles(*roles: str):
+    """Decorator allowing only tokens whose ``role`` claim is one of ``roles``."""
+    def decorator(f):
+        @wraps(f)
+        async def decorated_function(*args, **kwargs):
+            if g.auth_claims is None:
+                return _unauthorized(g.auth_error)
+
+            denial = role_denial(g.auth_claims, roles)
+            if denial:
+                return _unauthorized(denial, 403)
+
+            return await f(*args, **kwargs)
+
+        return decorated_function
+
+    return decorator
+
+
+def require_owner_or_admin(param: str = "email"):
+    """Decorator allowing admins, or the user whose email is the ``param`` URL argument."""
+    def decorator(f):
+        @wraps(f)
+        async def decorated_function(*args, **kwargs):
+            if g.auth_claims is None:
+                return _unauthorized(g.auth_error)
+
+            denial = owner_denial(g.auth_claims, kwargs.get(param) or "")
+            if denial:
+                return _unauthorized(denial, 403)
+
+            return await f(*args, **kwargs)
+
+        return decorated_function
+
+    return decorator
+
+
+def check_admin_role(f):
+    """Decorator to check if the user has admin role."""
+    return require_roles("admin")(f)
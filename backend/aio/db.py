@@ -0,0 +1,229 @@
+"""aiomysql counterpart of ``backend.db.pool`` for the async serving mode.
+
+Connections run in autocommit so plain reads always see committed data;
+``transaction()`` opens an explicit transaction for multi-statement writes.
+Query and checkout metrics, the circuit breaker, statement timeouts and
+request budgets are shared with the synchronous pool; aiomysql errors are
+translated into ``backend.db.errors`` so callers catch the same exceptions.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import aiomysql
+from mysql.connector import errorcode
+
+from backend.config.settings import settings
+from backend.db.breaker import breaker
+from backend.db.database import QUERY_DURATION, QUERY_ERRORS, QUERY_ROWS, record_statement
+from backend.db.errors import (
+    DatabaseError,
+    DuplicateKeyError,
+    IntegrityError,
+    PoolTimeoutError,
+    QueryTimeoutError,
+)
+from backend.db.pool import CHECKOUT_HOLD, CHECKOUT_TIMEOUTS, CHECKOUT_WAIT
+from backend.db.timeouts import statement_timeout
+from backend.utils.metrics import gauge, statement_shape
+
+
+def translate_aiomysql_error(exc: aiomysql.MySQLError) -> DatabaseError:
+    errno = exc.args[0] if exc.args and isinstance(exc.args[0], int) else None
+    if isinstance(exc, aiomysql.IntegrityError):
+        error_class = DuplicateKeyError if errno == errorcode.ER_DUP_ENTRY else IntegrityError
+    elif errno == errorcode.ER_QUERY_TIMEOUT:
+        return QueryTimeoutError("Query cancelled: it ran past its time limit", errno=errno)
+    else:
+        error_class = DatabaseError
+    return error_class(str(exc), errno=errno)
+
+
+class AsyncDatabase:
+    _pool: aiomysql.Pool | None = None
+    _lock: asyncio.Lock | None = None
+
+    @classmethod
+    async def get_pool(cls) -> aiomysql.Pool:
+        if cls._pool is None:
+            if cls._lock is None:
+                cls._lock = asyncio.Lock()
+            async with cls._lock:
+                if cls._pool is None:
+                    cls._pool = await aiomysql.create_pool(
+                        host=settings.mysql_host,
+                        port=settings.mysql_port,
+                        user=settings.mysql_user,
+                        password=settings.mysql_password,
+                        db=settings.mysql_database,
+                        minsize=settings.async_db_pool_min_size,
+                        maxsize=settings.async_db_pool_max_size,
+                        pool_recycle=settings.db_pool_idle_recycle_seconds,
+                        autocommit=True,
+                    )
+        return cls._pool
+
+    @classmethod
+    async def close(cls) -> None:
+        pool, cls._pool = cls._pool, None
+        if pool is not None:
+            pool.close()
+            await pool.wait_closed()
+
+
+def _async_pool_stat(attr: str):
+    def read() -> int | None:
+        pool = AsyncDatabase._pool
+        return None if pool is None else getattr(pool, attr)
+    return read
+
+
+gauge("async_db_pool_size", "Connections currently open by the async pool", callback=_async_pool_stat("size"))
+gauge("async_db_pool_free", "Open connections idle in the async pool", callback=_async_pool_stat("freesize"))
+
+
+# max_execution_time (ms) last sent on each connection
+_session_timeouts: weakref.WeakKeyDictionary[aiomysql.Connection, int] = weakref.WeakKeyDictionary()
+
+
+async def _set_statement_timeout(connection: aiomysql.Connection, seconds: float) -> None:
+    """Async ``PooledConnection.set_statement_timeout``: only sent when the value changes."""
+    millis = math.ceil(seconds * 1000) if seconds else 0
+    if _session_timeouts.get(connection) == millis:
+        return
+    async with connection.cursor() as cursor:
+        await cursor.execute(f"SET SESSION max_execution_time = {millis}")
+    _session_timeouts[connection] = millis
+
+
+@asynccontextmanager
+async def acquire(
+    *, timeout: float | None = None, budgeted: bool = True
+) -> AsyncIterator[aiomysql.Connection]:
+    """Check out a connection, giving up after ``DB_POOL_ACQUIRE_TIMEOUT``.
+
+    Like ``Database.get_connection``: raises ``DatabaseUnavailableError``
+    while the circuit breaker is open, ``QueryTimeoutError`` once the
+    request's budget is spent, and caps the connection's SELECTs at
+    ``statement_timeout(timeout, budgeted=...)``.
+
+    A connection whose user raised (or was cancelled) may hold an unread
+    result or an open transaction, so it is closed instead of reused.
+    """
+    breaker.allow()
+    seconds = statement_timeout(timeout, budgeted=budgeted)
+    pool = await AsyncDatabase.get_pool()
+    started = time.perf_counter()
+    try:
+        connection = await asyncio.wait_for(pool.acquire(), settings.db_pool_acquire_timeout)
+    except asyncio.TimeoutError:
+        CHECKOUT_TIMEOUTS.inc()
+        raise PoolTimeoutError(
+            f"Timed out after {settings.db_pool_acquire_timeout}s waiting for a database connection"
+        ) from None
+    except aiomysql.MySQLError as exc:
+        error = translate_aiomysql_error(exc)
+        breaker.record_error(time.perf_counter() - started, error)
+        raise error from exc
+    checked_out = time.perf_counter()
+    CHECKOUT_WAIT.observe(checked_out - started)
+    try:
+        try:
+            await _set_statement_timeout(connection, seconds)
+        except aiomysql.MySQLError as exc:
+            raise translate_aiomysql_error(exc) from exc
+        yield connection
+    except BaseException:
+        connection.close()
+        raise
+    finally:
+        pool.release(connection)
+        CHECKOUT_HOLD.observe(time.perf_counter() - checked_out)
+
+
+@asynccontextmanager
+async def transaction() -> AsyncIterator[aiomysql.DictCursor]:
+    """Yield a dict cursor inside a transaction, committed when the block exits cleanly."""
+    async with acquire() as connection:
+        await connection.begin()
+        async with connection.cursor(aiomysql.DictCursor) as cursor:
+            yield cursor
+        await connection.commit()
+
+
+async def execute_query(query: str, params: tuple | dict | None = None) -> list[dict]:
+    shape = statement_shape(query)
+    async with acquire() as connection:
+        # Time the statement only; pool wait is not the database's doing.
+        started = time.perf_counter()
+        try:
+            async with connection.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(query, params)
+                results = list(await cursor.fetchall()) if cursor.description else []
+        except aiomysql.MySQLError as exc:
+            error = translate_aiomysql_error(exc)
+            record_statement(shape, started, error)
+            raise error from exc
+        except Exception as exc:
+            record_statement(shape, started, exc)
+            raise
+    record_statement(shape, started)
+    QUERY_ROWS.observe(len(results), statement=shape)
+    return results
+
+
+async def stream_query(
+    query: str, params: tuple | dict | None = None, batch_size: int | None = None
+) -> AsyncIterator[dict]:
+    """Yield rows from an unbuffered cursor, ``batch_size`` rows per fetch.
+
+    As in ``backend.db.database.stream_query``, streams run without a
+    statement timeout or request budget and are recorded with the circuit
+    breaker once, when the statement has executed. If the consumer stops
+    early the connection is closed rather than drained.
+    """
+    shape = statement_shape(query)
+    batch_size = batch_size or settings.stream_batch_size
+    rows = 0
+    async with acquire(timeout=0, budgeted=False) as connection:
+        started = time.perf_counter()
+        executed = False
+        try:
+            cursor = await connection.cursor(aiomysql.SSDictCursor)
+            await cursor.execute(query, params)
+            breaker.record(time.perf_counter() - started)
+            executed = True
+            while True:
+                batch = await cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+                rows += len(batch)
+                for row in batch:
+                    yield row
+            await cursor.close()
+        except GeneratorExit:
+            raise
+        except Exception as exc:
+            error = translate_aiomysql_error(exc) if isinstance(exc, aiomysql.MySQLError) else exc
+            QUERY_ERRORS.inc(statement=shape)
+            if not executed:
+                breaker.record_error(time.perf_counter() - started, error)
+            if error is exc:
+                raise
+            raise error from exc
+    QUERY_DURATION.observe(time.perf_counter() - started, statement=shape)
+    QUERY_ROWS.observe(rows, statement=shape)
+
+
+async def execute_single(query: str, params: tuple | dict | None = None) -> dict | None:
+    results = await execute_query(query, params)
+    return results[0] if results else None
+
+
+async def execute_non_query(query: str, params: tuple | dict | None = None) -> None:
+    await execute_query(query, params)
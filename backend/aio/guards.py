@@ -0,0 +1,84 @@
+"""Quart versions of the database guards in ``backend.middlewares``.
+
+Load shedding here only looks at the circuit breaker: aiomysql does not
+expose its wait queue, so the async pool's backlog is bounded by
+``DB_POOL_ACQUIRE_TIMEOUT`` alone.
+"""
+from __future__ import annotations
+
+from functools import wraps
+
+from quart import current_app, jsonify, request
+
+from backend.db.breaker import breaker
+from backend.db.errors import DatabaseError, QueryTimeoutError
+from backend.db.timeouts import end_budget, start_budget
+from backend.middlewares.load_shedding import LOAD_SHED
+from backend.middlewares.query_budget import BUDGET_EXCEEDED, endpoint_budget
+
+
+def _sync_endpoint(endpoint: str | None) -> str | None:
+    """``async_courses.get_all_courses`` -> ``courses.get_all_courses``, the key DB_ENDPOINT_BUDGETS uses."""
+    return endpoint.removeprefix("async_") if endpoint else endpoint
+
+
+async def shed_load():
+    """before_request stage: 503 early while the database circuit breaker is open."""
+    view = current_app.view_functions.get(request.endpoint)
+    if view is None or getattr(view, "serves_when_degraded", False):
+        return None
+    if breaker.is_open():
+        LOAD_SHED.inc(reason="circuit_open")
+        response = jsonify({
+            "success": False,
+            "message": "Database is unavailable; please retry shortly"
+        })
+        response.headers["Retry-After"] = str(breaker.retry_after())
+        return response, 503
+    return None
+
+
+async def release_breaker_probe(exc: BaseException | None = None) -> None:
+    """teardown_request stage: free the breaker probe if this request held it."""
+    breaker.release_probe()
+
+
+def query_budget(view):
+    """Async ``backend.middlewares.query_budget``; budgets are keyed by the Flask endpoint name."""
+
+    @wraps(view)
+    async def wrapper(*args, **kwargs):
+        seconds = endpoint_budget(_sync_endpoint(request.endpoint))
+        if not seconds:
+            return await view(*args, **kwargs)
+        token = start_budget(seconds)
+        try:
+            return await view(*args, **kwargs)
+        finally:
+            end_budget(token)
+
+    return wrapper
+
+
+def unavailable_response(exc: DatabaseError):
+    response = jsonify({
+        "success": False,
+        "message": str(exc)
+    })
+    response.headers["Retry-After"] = str(getattr(exc, "retry_after", 1))
+    return response, 503
+
+
+def budget_exceeded_response(exc: QueryTimeoutError):
+    BUDGET_EXCEEDED.inc(endpoint=_sync_endpoint(request.endpoint) or "")
+    return jsonify({
+        "success": False,
+        "message": f"{exc}. Narrow the filters or page size and try again."
+    }), 503
+
+
+def stale_response(response):
+    """Mark ``response`` as served from a stale cache entry."""
+    response.headers["Warning"] = '110 - "Response is Stale"'
+    response.headers["Cache-Control"] = "no-store"
+    return response
@@ -0,0 +1,242 @@
+"""Async versions of the read-heavy course and video endpoints.
+
+Responses, status codes and caching headers match the Flask handlers in
+``backend.routes``; the SQL is shared with them through ``backend.db.repository``.
+The same database guards apply: load shedding while the circuit breaker is
+open, per-endpoint budgets, and the stale catalog (see ``backend.aio.guards``).
+"""
+from __future__ import annotations
+
+from datetime import date
+
+import aiomysql
+from quart import Blueprint, Response, jsonify, request
+
+from backend.aio.auth import check_admin_role, require_owner_or_admin
+from backend.aio.db import execute_query, stream_query
+from backend.aio.guards import budget_exceeded_response, query_budget, stale_response
+from backend.aio.streaming import stream_json_response
+from backend.db import DatabaseError, QueryTimeoutError
+from backend.db.repository import (
+    ACTIVE_COURSES_SQL,
+    COURSE_COLUMNS,
+    COURSE_TABLE,
+    STUDENT_TABLE,
+    STUDENT_VIDEOS_SQL,
+    VIDEO_COLUMNS,
+    VIDEO_TABLE,
+    courses_query,
+    videos_query,
+)
+from backend.middlewares.load_shedding import UNAVAILABLE_ERRORS, serves_when_degraded
+from backend.routes.courseRoutes import catalog_cache
+from backend.utils.cache import MISSING
+from backend.utils.conditional import make_validator
+from backend.utils.pagination import PaginationError, parse_page_request, split_page
+from backend.utils.streaming import wants_stream
+
+# Other database errors map to 400 as in the sync routes.
+DB_ERRORS = (aiomysql.MySQLError, DatabaseError)
+
+async_courses_bp = Blueprint("async_courses", __name__)
+async_videos_bp = Blueprint("async_videos", __name__)
+
+
+@async_courses_bp.get("/all-active-courses")
+@serves_when_degraded
+@query_budget
+async def get_all_active_courses():
+    """GET: get all active courses"""
+    current_date = date.today()
+
+    validator = make_validator((COURSE_TABLE,), current_date)
+    if validator.is_fresh(request):
+        return validator.not_modified(Response)
+
+    try:
+        try:
+            results = await catalog_cache.get_or_load_async(
+                current_date.isoformat(), lambda: execute_query(ACTIVE_COURSES_SQL, (current_date,))
+            )
+        except DatabaseError:
+            # Answer from the last listing we had while the database is struggling
+            results = catalog_cache.get_stale(current_date.isoformat())
+            if results is MISSING:
+                raise
+            return stale_response(jsonify({
+                "success": True,
+                "data": results
+            })), 200
+
+        if not results:
+            return validator.apply(jsonify({
+                "success": True,
+                "message": "No Courses Found."
+            })), 200
+
+        return validator.apply(jsonify({
+            "success": True,
+            "data": results
+        })), 200
+
+    except UNAVAILABLE_ERRORS:
+        raise
+    except QueryTimeoutError as e:
+        return budget_exceeded_response(e)
+    except DB_ERRORS as e:
+        return jsonify({
+            "success": False,
+            "message": str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "message": str(e)
+        }), 500
+
+
+@async_courses_bp.get("/all-courses")
+@check_admin_role
+@query_budget
+async def get_all_courses():
+    """GET: get all courses (filter datewise), paginated by course_id"""
+    start_date = request.args.get("startDate")
+    end_date = request.args.get("endDate")
+
+    try:
+        page = parse_page_request(request.args, "course_id", COURSE_COLUMNS)
+    except PaginationError as e:
+        return jsonify({
+            "success": False,
+            "message": str(e)
+        }), 400
+
+    try:
+        if wants_stream(request.args):
+            sql, params = courses_query(page.select_list, start_date, end_date, page.after)
+            return await stream_json_response(stream_query(sql, params)), 200
+
+        sql, params = courses_query(page.select_list, start_date, end_date, page.after, page.limit + 1)
+        results = await execute_query(sql, params)
+
+        if not results:
+            return jsonify({
+                "success": True,
+                "message": "No Records Found."
+            }), 200
+
+        results, next_cursor = split_page(results, page)
+        return jsonify({
+            "success": True,
+            "data": results,
+            "next_cursor": next_cursor
+        }), 200
+
+    except UNAVAILABLE_ERRORS:
+        raise
+    except QueryTimeoutError as e:
+        return budget_exceeded_response(e)
+    except DB_ERRORS as e:
+        return jsonify({
+            "success": False,
+            "message": str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "message": str(e)
+        }), 500
+
+
+@async_videos_bp.get("/all/<string:email>/<int:course_id>")
+@require_owner_or_admin("email")
+@query_budget
+async def get_videos_for_student(email: str, course_id: int):
+    """GET: get all videos of a course registered by a student (own account or admin)."""
+    email = email.strip().lower()
+    validator = make_validator(
+        (VIDEO_TABLE, COURSE_TABLE, STUDENT_TABLE), email, course_id, private=True
+    )
+    if validator.is_fresh(request):
+        return validator.not_modified(Response)
+
+    try:
+        results = await execute_query(STUDENT_VIDEOS_SQL, (email, course_id))
+
+        if not results:
+            return validator.apply(jsonify({
+                "success": True,
+                "message": "No active videos available for this course."
+            })), 200
+
+        return validator.apply(jsonify({
+            "success": True,
+            "data": results
+        })), 200
+
+    except UNAVAILABLE_ERRORS:
+        raise
+    except QueryTimeoutError as exc:
+        return budget_exceeded_response(exc)
+    except DB_ERRORS as exc:
+        return jsonify({
+            "success": False,
+            "message": str(exc)
+        }), 400
+    except Exception as exc:
+        return jsonify({
+            "success": False,
+            "message": str(exc)
+        }), 500
+
+
+@async_videos_bp.get("/all-videos")
+@check_admin_role
+@query_budget
+async def get_all_videos():
+    """GET: get all videos (admin) with optional courseId filter, paginated by video_id."""
+    course_id = request.args.get("courseId")
+
+    try:
+        page = parse_page_request(request.args, "video_id", VIDEO_COLUMNS)
+    except PaginationError as exc:
+        return jsonify({
+            "success": False,
+            "message": str(exc)
+        }), 400
+
+    try:
+        if wants_stream(request.args):
+            sql, params = videos_query(page.select_list, course_id, page.after)
+            return await stream_json_response(stream_query(sql, params)), 200
+
+        sql, params = videos_query(page.select_list, course_id, page.after, page.limit + 1)
+        results = await execute_query(sql, params)
+
+        if not results:
+            return jsonify({
+                "success": True,
+                "message": "No videos found."
+            }), 200
+
+        results, next_cursor = split_page(results, page)
+        return jsonify({
+            "success": True,
+            "data": results,
+            "next_cursor": next_cursor
+        }), 200
+
+    except UNAVAILABLE_ERRORS:
+        raise
+    except QueryTimeoutError as exc:
+        return budget_exceeded_response(exc)
+    except DB_ERRORS as exc:
+        return jsonify({
+            "success": False,
+            "message": str(exc)
+        }), 400
+    except Exception as exc:
+        return jsonify({
+            "success": False,
+            "message": str(exc)
+        }), 500
@@ -0,0 +1,38 @@
+"""Async twin of ``backend.utils.streaming.stream_json_response``."""
+from __future__ import annotations
+
+from typing import AsyncIterator
+
+from quart import Response, current_app
+
+from backend.config.settings import settings
+
+
+async def stream_json_response(rows: AsyncIterator[dict], batch_size: int | None = None) -> Response:
+    """Stream ``{"success": true, "data": [...]}`` one batch of rows at a time.
+
+    The first row is awaited before the response is built so connection and
+    query errors still reach the caller's ``except`` blocks.
+    """
+    dumps = current_app.json.dumps
+    batch_size = batch_size or settings.stream_batch_size
+    first = await anext(rows, None)
+
+    async def generate() -> AsyncIterator[str]:
+        try:
+            yield '{"success": true, "data": ['
+            if first is not None:
+                chunk, separator = [dumps(first)], ""
+                async for row in rows:
+                    chunk.append(dumps(row))
+                    if len(chunk) >= batch_size:
+                        yield separator + ",".join(chunk)
+                        chunk, separator = [], ","
+                if chunk:
+                    yield separator + ",".join(chunk)
+            yield "]}"
+        finally:
+            # Release the query's connection promptly if the client disconnects.
+            await rows.aclose()
+
+    return Response(generate(), mimetype="application/json")
@@ -0,0 +1,4 @@
+from backend.aio import create_asgi_app
+
+
+app = create_asgi_app()
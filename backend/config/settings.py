@@ -12,11 +12,75 @@ class Settings:
     secret_key: str = os.getenv("SECRET_KEY", "change-me")
     jwt_algorithm: str = os.getenv("JWT_ALGORITHM", "HS256")
     jwt_expiration_minutes: int = int(os.getenv("JWT_EXPIRATION_MINUTES", "60"))
+    refresh_token_expiration_days: int = int(os.getenv("REFRESH_TOKEN_EXPIRATION_DAYS", "30"))
+    password_hasher: str = os.getenv("PASSWORD_HASHER", "scrypt")
+    scrypt_n: int = int(os.getenv("SCRYPT_N", "16384"))
+    scrypt_r: int = int(os.getenv("SCRYPT_R", "8"))
+    scrypt_p: int = int(os.getenv("SCRYPT_P", "1"))
+    pbkdf2_iterations: int = int(os.getenv("PBKDF2_ITERATIONS", "600000"))
+    password_hash_workers: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    password_hash_max_pending: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+    password_hash_queue_timeout: float = float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", "2"))
+    token_cache_size: int = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))
+    rate_limit_backend: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    rate_limit_max_keys: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+    login_ip_max_attempts: int = int(os.getenv("LOGIN_IP_MAX_ATTEMPTS", "30"))
+    login_ip_window_seconds: int = int(os.getenv("LOGIN_IP_WINDOW_SECONDS", "60"))
+    login_email_max_failures: int = int(os.getenv("LOGIN_EMAIL_MAX_FAILURES", "5"))
+    login_email_window_seconds: int = int(os.getenv("LOGIN_EMAIL_WINDOW_SECONDS", "900"))
+    token_ip_max_attempts: int = int(os.getenv("TOKEN_IP_MAX_ATTEMPTS", "120"))
+    token_ip_window_seconds: int = int(os.getenv("TOKEN_IP_WINDOW_SECONDS", "60"))
+    # Reverse proxies in front of the app whose X-Forwarded-* headers are trusted
+    trusted_proxy_hops: int = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+    db_backend: str = os.getenv("DB_BACKEND", "mysql")
+    sqlite_path: str = os.getenv("SQLITE_PATH", "institute_management.db")
+    sqlite_busy_timeout: float = float(os.getenv("SQLITE_BUSY_TIMEOUT", "5"))
     mysql_host: str = os.getenv("MYSQL_HOST", "localhost")
     mysql_port: int = int(os.getenv("MYSQL_PORT", "3306"))
     mysql_user: str = os.getenv("MYSQL_USER", "root")
     mysql_password: str = os.getenv("MYSQL_PASSWORD", "root")
     mysql_database: str = os.getenv("MYSQL_DATABASE", "institute_management_db")
+    db_pool_min_size: int = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+    db_pool_max_size: int = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+    db_pool_acquire_timeout: float = float(os.getenv("DB_POOL_ACQUIRE_TIMEOUT", "10"))
+    db_pool_idle_recycle_seconds: int = int(os.getenv("DB_POOL_IDLE_RECYCLE_SECONDS", "300"))
+    db_statement_cache_size: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "64"))
+    db_replica_hosts: str = os.getenv("DB_REPLICA_HOSTS", "")
+    db_replica_acquire_timeout: float = float(os.getenv("DB_REPLICA_ACQUIRE_TIMEOUT", "1"))
+    db_replica_health_interval: float = float(os.getenv("DB_REPLICA_HEALTH_INTERVAL", "5"))
+    db_replica_max_lag_seconds: float = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))
+    db_replica_retry_seconds: float = float(os.getenv("DB_REPLICA_RETRY_SECONDS", "30"))
+    db_read_your_writes_seconds: float = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
+    db_query_timeout: float = float(os.getenv("DB_QUERY_TIMEOUT", "30"))
+    db_request_budget: float = float(os.getenv("DB_REQUEST_BUDGET", "5"))
+    db_endpoint_budgets: str = os.getenv("DB_ENDPOINT_BUDGETS", "")
+    db_breaker_window_seconds: int = int(os.getenv("DB_BREAKER_WINDOW_SECONDS", "10"))
+    db_breaker_min_calls: int = int(os.getenv("DB_BREAKER_MIN_CALLS", "20"))
+    db_breaker_failure_ratio: float = float(os.getenv("DB_BREAKER_FAILURE_RATIO", "0.5"))
+    db_breaker_slow_seconds: float = float(os.getenv("DB_BREAKER_SLOW_SECONDS", "2"))
+    db_breaker_open_seconds: float = float(os.getenv("DB_BREAKER_OPEN_SECONDS", "15"))
+    db_admission_max_waiting: int = int(os.getenv("DB_ADMISSION_MAX_WAITING", "20"))
+    async_db_pool_min_size: int = int(os.getenv("ASYNC_DB_POOL_MIN_SIZE", "1"))
+    async_db_pool_max_size: int = int(os.getenv("ASYNC_DB_POOL_MAX_SIZE", "20"))
+    cache_backend: str = os.getenv("CACHE_BACKEND", "memory")
+    cache_ttl_seconds: int = int(os.getenv("CACHE_TTL_SECONDS", "300"))
+    cache_max_entries: int = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    cache_stale_seconds: int = int(os.getenv("CACHE_STALE_SECONDS", "86400"))
+    page_size_default: int = int(os.getenv("PAGE_SIZE_DEFAULT", "100"))
+    page_size_max: int = int(os.getenv("PAGE_SIZE_MAX", "1000"))
+    bulk_chunk_size: int = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+    bulk_max_rows: int = int(os.getenv("BULK_MAX_ROWS", "10000"))
+    stream_batch_size: int = int(os.getenv("STREAM_BATCH_SIZE", "500"))
+    conditional_get_window_seconds: int = int(os.getenv("CONDITIONAL_GET_WINDOW_SECONDS", "60"))
+    server_backend: str = os.getenv("SERVER_BACKEND", "auto")
+    server_host: str = os.getenv("SERVER_HOST", "0.0.0.0")
+    server_port: int = int(os.getenv("SERVER_PORT", "5000"))
+    server_workers: int = int(os.getenv("SERVER_WORKERS", "0"))
+    server_threads: int = int(os.getenv("SERVER_THREADS", "0"))
+    server_db_connection_budget: int = int(os.getenv("SERVER_DB_CONNECTION_BUDGET", "100"))
+    server_timeout: int = int(os.getenv("SERVER_TIMEOUT", "30"))
+    server_graceful_timeout: int = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))
+    server_pidfile: str = os.getenv("SERVER_PIDFILE", "")
 
 
 settings = Settings()
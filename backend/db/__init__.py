@@ -1,9 +1,33 @@
-from .pool import Database, execute_non_query, execute_query, execute_single
+from .database import (
+    Database,
+    execute_non_query,
+    execute_query,
+    execute_single,
+    stream_query,
+)
+from .drivers import Driver, get_driver, register_driver
+from .errors import (
+    DatabaseError,
+    DatabaseUnavailableError,
+    DuplicateKeyError,
+    IntegrityError,
+    PoolTimeoutError,
+    QueryTimeoutError,
+)
 
 __all__ = [
     "Database",
+    "DatabaseError",
+    "DatabaseUnavailableError",
+    "Driver",
+    "DuplicateKeyError",
+    "IntegrityError",
+    "PoolTimeoutError",
+    "QueryTimeoutError",
     "execute_non_query",
     "execute_query",
     "execute_single",
+    "get_driver",
+    "register_driver",
+    "stream_query",
 ]
-
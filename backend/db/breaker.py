@@ -0,0 +1,191 @@
+"""Circuit breaker in front of the database.
+
+Statement outcomes are tallied in one-second buckets over the last
+``DB_BREAKER_WINDOW_SECONDS``. Once at least ``DB_BREAKER_MIN_CALLS`` have
+been seen and the share that failed or took longer than
+``DB_BREAKER_SLOW_SECONDS`` reaches ``DB_BREAKER_FAILURE_RATIO``, the breaker
+opens: ``Database.get_connection`` raises ``DatabaseUnavailableError`` without
+touching the pool for ``DB_BREAKER_OPEN_SECONDS``. After that a single probe
+is let through; its outcome closes the breaker or opens it again. A probe
+that ends without touching the database (``release_probe``) frees the slot
+for the next caller.
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from backend.config.settings import settings
+from backend.db.errors import DatabaseError, DatabaseUnavailableError, IntegrityError, PoolTimeoutError
+from backend.utils.metrics import counter, gauge
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+_STATE_VALUES = {CLOSED: 0, OPEN: 1, HALF_OPEN: 2}
+
+# Token of the probe the current context was granted, if any
+_probe: ContextVar[object | None] = ContextVar("db_breaker_probe", default=None)
+
+BREAKER_TRANSITIONS = counter(
+    "db_circuit_transitions_total", "Database circuit breaker state changes, by new state", ("state",)
+)
+
+
+# Errors that say nothing about the database's own health
+_NOT_DATABASE_HEALTH = (IntegrityError, PoolTimeoutError, DatabaseUnavailableError)
+
+
+def counts_as_failure(exc: BaseException) -> bool:
+    """Whether ``exc`` says something about the database's health.
+
+    Constraint violations are the caller's problem, a pool timeout means this
+    process is overloaded (admission control's job), and the breaker's own
+    rejections must not keep it open.
+    """
+    return isinstance(exc, DatabaseError) and not isinstance(exc, _NOT_DATABASE_HEALTH)
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        window: float,
+        min_calls: int,
+        failure_ratio: float,
+        slow_seconds: float,
+        open_seconds: float,
+    ) -> None:
+        self.window = max(1, int(window))
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.slow_seconds = slow_seconds
+        self.open_seconds = open_seconds
+        self._lock = threading.Lock()
+        # [second, calls, bad] per one-second bucket, oldest first
+        self._buckets: deque[list[int]] = deque()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        # The outstanding probe's token (None: nobody holds it) and start time
+        self._probe: object | None = None
+        self._probe_started = 0.0
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def _transition(self, state: str, now: float) -> None:
+        self._state = state
+        if state == OPEN:
+            self._opened_at = now
+        if state != HALF_OPEN:
+            self._probe = None
+        self._buckets.clear()
+        BREAKER_TRANSITIONS.inc(state=state)
+
+    def retry_after(self) -> int:
+        """Whole seconds until the breaker will let a probe through."""
+        left = self._opened_at + self.open_seconds - time.monotonic()
+        return max(1, math.ceil(left))
+
+    def is_open(self) -> bool:
+        """Whether callers should be turned away without trying; never claims the probe."""
+        now = time.monotonic()
+        if self._state == OPEN:
+            return now < self._opened_at + self.open_seconds
+        if self._state == HALF_OPEN:
+            return self._probe is not None and now < self._probe_started + self.open_seconds
+        return False
+
+    def allow(self) -> None:
+        """Raise ``DatabaseUnavailableError`` unless a call may go to the database now.
+
+        When a probe is due, the calling context becomes the probe and keeps
+        passing until the probe's outcome is recorded or ``release_probe``.
+        """
+        if self._state == CLOSED:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            if self._state == HALF_OPEN and self._probe is not None and _probe.get() is self._probe:
+                return
+            # Open long enough, the probe slot was released, or the last probe
+            # never reported back: this caller becomes the probe.
+            if (self._state == OPEN and now >= self._opened_at + self.open_seconds) or (
+                self._state == HALF_OPEN
+                and (self._probe is None or now >= self._probe_started + self.open_seconds)
+            ):
+                if self._state == OPEN:
+                    self._transition(HALF_OPEN, now)
+                self._probe = token = object()
+                self._probe_started = now
+                _probe.set(token)
+                return
+        raise DatabaseUnavailableError(
+            "Database is unavailable; please retry shortly", retry_after=self.retry_after()
+        )
+
+    def release_probe(self) -> None:
+        """Drop the current context's probe claim (at request teardown).
+
+        If the probe recorded no outcome, the slot goes to the next caller
+        instead of staying blocked for ``open_seconds``.
+        """
+        token = _probe.get()
+        if token is None:
+            return
+        _probe.set(None)
+        with self._lock:
+            if self._state == HALF_OPEN and self._probe is token:
+                self._probe = None
+
+    def record(self, seconds: float, failed: bool = False) -> None:
+        """Tally one database call that took ``seconds`` (``failed`` if it raised)."""
+        bad = failed or seconds >= self.slow_seconds
+        now = time.monotonic()
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(OPEN if bad else CLOSED, now)
+                return
+            if self._state == OPEN:
+                return
+            second = int(now)
+            buckets = self._buckets
+            while buckets and buckets[0][0] <= second - self.window:
+                buckets.popleft()
+            if buckets and buckets[-1][0] == second:
+                bucket = buckets[-1]
+            else:
+                bucket = [second, 0, 0]
+                buckets.append(bucket)
+            bucket[1] += 1
+            bucket[2] += bad
+            if not bad:
+                return
+            calls = sum(entry[1] for entry in buckets)
+            failures = sum(entry[2] for entry in buckets)
+            if calls >= self.min_calls and failures >= self.failure_ratio * calls:
+                self._transition(OPEN, now)
+
+    def record_error(self, seconds: float, exc: BaseException) -> None:
+        if counts_as_failure(exc):
+            self.record(seconds, failed=True)
+        elif isinstance(exc, IntegrityError):
+            # The database answered; the statement itself was at fault.
+            self.record(seconds)
+
+
+breaker = CircuitBreaker(
+    window=settings.db_breaker_window_seconds,
+    min_calls=settings.db_breaker_min_calls,
+    failure_ratio=settings.db_breaker_failure_ratio,
+    slow_seconds=settings.db_breaker_slow_seconds,
+    open_seconds=settings.db_breaker_open_seconds,
+)
+
+gauge(
+    "db_circuit_state", "Database circuit breaker state (0 closed, 1 open, 2 half-open)",
+    callback=lambda: _STATE_VALUES[breaker.state],
+)
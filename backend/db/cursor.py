@@ -0,0 +1,105 @@
+"""DB-API cursor wrapper shared by the drivers."""
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, Sequence
+
+from backend.db.errors import DatabaseError
+
+Translate = Callable[[Exception], DatabaseError]
+
+
+class Cursor:
+    """Delegates to a driver cursor, translating errors and (optionally) SQL and row shape.
+
+    ``prepare`` rewrites the repo's ``%s``-style SQL for drivers with another
+    paramstyle; ``as_dicts`` builds dict rows for drivers without dict cursors.
+    """
+
+    __slots__ = ("_raw", "_translate", "_error_types", "_prepare", "_as_dicts")
+
+    def __init__(
+        self,
+        raw,
+        translate: Translate,
+        error_types: tuple[type[Exception], ...],
+        prepare: Callable[[str], str] | None = None,
+        as_dicts: bool = False,
+    ) -> None:
+        self._raw = raw
+        self._translate = translate
+        self._error_types = error_types
+        self._prepare = prepare
+        self._as_dicts = as_dicts
+
+    def _call(self, method: Callable[..., Any], *args) -> Any:
+        try:
+            return method(*args)
+        except self._error_types as exc:
+            raise self._translate(exc) from exc
+
+    def _row(self, row):
+        if not self._as_dicts or row is None:
+            return row
+        return dict(zip([column[0] for column in self._raw.description], row))
+
+    def _rows(self, rows: list) -> list:
+        if not self._as_dicts:
+            return rows
+        names = [column[0] for column in self._raw.description]
+        return [dict(zip(names, row)) for row in rows]
+
+    def execute(self, query: str, params: Sequence | dict | None = None) -> None:
+        if self._prepare is not None:
+            query = self._prepare(query)
+        if params is None:
+            self._call(self._raw.execute, query)
+        else:
+            self._call(self._raw.execute, query, params)
+
+    def executemany(self, query: str, seq_params: Iterable[Sequence]) -> None:
+        if self._prepare is not None:
+            query = self._prepare(query)
+        self._call(self._raw.executemany, query, seq_params)
+
+    def fetchone(self):
+        return self._row(self._call(self._raw.fetchone))
+
+    def fetchmany(self, size: int) -> list:
+        return self._rows(self._call(self._raw.fetchmany, size))
+
+    def fetchall(self) -> list:
+        return self._rows(self._call(self._raw.fetchall))
+
+    @property
+    def description(self):
+        return self._raw.description
+
+    @property
+    def with_rows(self) -> bool:
+        return self._raw.description is not None
+
+    @property
+    def rowcount(self) -> int:
+        return self._raw.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._raw.lastrowid
+
+    def close(self) -> None:
+        self._call(self._raw.close)
+
+    def __enter__(self) -> Cursor:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class PreparedCursor(Cursor):
+    """Cursor over a statement cached on its connection; ``close()`` leaves it prepared."""
+
+    __slots__ = ()
+
+    def close(self) -> None:
+        pass
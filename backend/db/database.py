@@ -0,0 +1,196 @@
+"""Query helpers on top of the configured driver (see ``backend.db.drivers``)."""
+from __future__ import annotations
+
+import time
+from typing import Callable, Iterator
+
+from backend.config.settings import settings
+from backend.db.breaker import breaker
+from backend.db.drivers import Driver, get_driver
+from backend.db.errors import DatabaseError
+from backend.db.pool import ConnectionPool
+from backend.db.timeouts import statement_timeout
+from backend.utils.metrics import ROW_BUCKETS, counter, gauge, histogram, statement_shape
+
+
+QUERY_DURATION = histogram(
+    "db_query_duration_seconds", "execute_query latency per statement shape", ("statement",)
+)
+QUERY_ROWS = histogram(
+    "db_query_rows_returned", "Rows returned by execute_query per statement shape",
+    ("statement",), buckets=ROW_BUCKETS,
+)
+QUERY_ERRORS = counter(
+    "db_query_errors_total", "execute_query calls that raised, per statement shape", ("statement",)
+)
+
+
+class Database:
+    """Process-wide entry point; delegates to the driver selected by ``DB_BACKEND``."""
+
+    @staticmethod
+    def driver() -> Driver:
+        return get_driver()
+
+    @classmethod
+    def configure(cls, min_size: int | None = None, max_size: int | None = None) -> None:
+        """Override the pool size used the next time the pool is created."""
+        get_driver().configure(min_size=min_size, max_size=max_size)
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget the current connections without closing them.
+
+        For forked worker processes: sockets inherited from the parent must be
+        left to the parent, so the child just opens connections of its own.
+        """
+        get_driver().reset()
+
+    @classmethod
+    def get_pool(cls) -> ConnectionPool:
+        """The MySQL pool; only the mysql driver has one."""
+        return get_driver().get_pool()
+
+    @classmethod
+    def get_connection(cls, replica: bool = False, *, timeout: float | None = None, budgeted: bool = True):
+        """A pooled connection; ``replica=True`` lets a read replica serve it.
+
+        Its statements are capped by ``statement_timeout(timeout, budgeted=...)``,
+        so a request whose budget is spent gets ``QueryTimeoutError`` here
+        without taking a connection; while the circuit breaker is open this
+        raises ``DatabaseUnavailableError`` instead.
+        """
+        breaker.allow()
+        seconds = statement_timeout(timeout, budgeted=budgeted)
+        started = time.perf_counter()
+        try:
+            connection = get_driver().get_connection(replica)
+        except DatabaseError as exc:
+            breaker.record_error(time.perf_counter() - started, exc)
+            raise
+        try:
+            connection.set_statement_timeout(seconds)
+        except Exception:
+            connection.discard()
+            raise
+        return connection
+
+
+def _pool_stat(name: str) -> Callable[[], int | None]:
+    def read() -> int | None:
+        stats = get_driver().stats()
+        return None if stats is None else stats[name]
+    return read
+
+
+gauge("db_pool_size", "Connections currently open by the pool", callback=_pool_stat("size"))
+gauge("db_pool_idle", "Open connections sitting idle in the pool", callback=_pool_stat("idle"))
+gauge("db_pool_in_use", "Connections currently checked out", callback=_pool_stat("in_use"))
+gauge("db_pool_waiting", "Callers queued for a connection", callback=_pool_stat("waiting"))
+
+
+def record_statement(shape: str, started: float, exc: BaseException | None = None) -> None:
+    """Metrics and circuit-breaker bookkeeping for a statement begun at ``started``."""
+    elapsed = time.perf_counter() - started
+    if exc is None:
+        QUERY_DURATION.observe(elapsed, statement=shape)
+        breaker.record(elapsed)
+    else:
+        QUERY_ERRORS.inc(statement=shape)
+        breaker.record_error(elapsed, exc)
+
+
+def execute_query(
+    query: str,
+    params: tuple | dict | None = None,
+    *,
+    prepared: bool = False,
+    replica: bool = False,
+    timeout: float | None = None,
+) -> list[dict]:
+    """Run ``query`` on a pooled connection.
+
+    ``prepared`` reuses a per-connection prepared statement; ``replica`` lets a
+    read replica answer a read; ``timeout`` overrides ``DB_QUERY_TIMEOUT``.
+    """
+    shape = statement_shape(query)
+    connection = Database.get_connection(replica, timeout=timeout)
+    # Time the statement only; pool wait is admission control's concern.
+    started = time.perf_counter()
+    try:
+        cursor = connection.prepared(query) if prepared else connection.cursor(dictionary=True)
+        with cursor:
+            cursor.execute(query, params)
+            if cursor.with_rows:
+                results = cursor.fetchall()
+            else:
+                connection.commit()
+                results = []
+    except Exception as exc:
+        record_statement(shape, started, exc)
+        raise
+    finally:
+        connection.close()
+    record_statement(shape, started)
+    QUERY_ROWS.observe(len(results), statement=shape)
+    return results
+
+
+def stream_query(
+    query: str, params: tuple | dict | None = None, batch_size: int | None = None, replica: bool = False
+) -> Iterator[dict]:
+    """Yield rows from an unbuffered cursor, ``batch_size`` rows per fetch.
+
+    The connection stays checked out until the generator is exhausted or
+    closed. If the consumer stops early, the connection is discarded rather
+    than draining the rest of the result set. Streams run without a
+    statement timeout or request budget: both measure wall time, which for an
+    unbuffered cursor includes the client's reading pace, and cutting a
+    stream off after its headers are sent only truncates the body.
+    """
+    shape = statement_shape(query)
+    batch_size = batch_size or settings.stream_batch_size
+    rows = 0
+    connection = Database.get_connection(replica, timeout=0, budgeted=False)
+    started = time.perf_counter()
+    executed = False
+    try:
+        cursor = connection.cursor(dictionary=True, buffered=False)
+        cursor.execute(query, params)
+        # One breaker entry per stream, timed to the first row: the database's
+        # share. Errors after this point can stem from the client's pace.
+        breaker.record(time.perf_counter() - started)
+        executed = True
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            rows += len(batch)
+            yield from batch
+        cursor.close()
+    except GeneratorExit:
+        connection.discard()
+        raise
+    except Exception as exc:
+        QUERY_ERRORS.inc(statement=shape)
+        if not executed:
+            breaker.record_error(time.perf_counter() - started, exc)
+        connection.discard()
+        raise
+    finally:
+        connection.close()
+    QUERY_DURATION.observe(time.perf_counter() - started, statement=shape)
+    QUERY_ROWS.observe(rows, statement=shape)
+
+
+def execute_single(
+    query: str, params: tuple | dict | None = None, *, prepared: bool = False
+) -> dict | None:
+    results = execute_query(query, params, prepared=prepared)
+    return results[0] if results else None
+
+
+def execute_non_query(
+    query: str, params: tuple | dict | None = None, *, prepared: bool = False
+) -> None:
+    execute_query(query, params, prepared=prepared)
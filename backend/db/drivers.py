@@ -0,0 +1,324 @@
+"""Database drivers: where connections come from and how SQL is spelled.
+
+``DB_BACKEND`` selects the driver. Route SQL is written with ``%s``
+placeholders and asks the driver (``backend.db.dialect``) for the few
+expressions that differ between engines.
+"""
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict
+
+from backend.config.settings import settings
+from backend.db.cursor import Cursor
+from backend.db.errors import DatabaseError, DuplicateKeyError, IntegrityError, QueryTimeoutError
+from backend.db.pool import ConnectionPool
+from backend.db.replicas import ReplicaSet, parse_hosts
+
+
+class Driver:
+    """Connection source plus SQL dialect; the defaults are MySQL's spelling."""
+
+    name = ""
+    insert_ignore = "INSERT IGNORE"
+
+    def now(self) -> str:
+        return "NOW()"
+
+    def date_add_days(self, expr: str, days: str = "%s") -> str:
+        return f"DATE_ADD({expr}, INTERVAL {days} DAY)"
+
+    def null_safe_eq(self, left: str, right: str) -> str:
+        return f"{left} <=> {right}"
+
+    def datetime_column(self, expr: str, alias: str) -> str:
+        """Select ``expr`` as ``alias`` so it comes back as a datetime."""
+        return f"{expr} AS {alias}"
+
+    def get_connection(self, replica: bool = False):
+        """A connection for the caller; ``replica`` allows a read replica (primary otherwise)."""
+        raise NotImplementedError
+
+    def configure(self, min_size: int | None = None, max_size: int | None = None) -> None:
+        """Per-process connection limits; ignored by drivers without a pool."""
+
+    def reset(self) -> None:
+        """Drop inherited connections (after fork) without closing them."""
+
+    def stats(self) -> dict | None:
+        return None
+
+
+class MySQLDriver(Driver):
+    name = "mysql"
+
+    def __init__(self) -> None:
+        self._pool: ConnectionPool | None = None
+        self._replicas: ReplicaSet | None = None
+        self._lock = threading.Lock()
+        self._min_size: int | None = None
+        self._max_size: int | None = None
+
+    def configure(self, min_size: int | None = None, max_size: int | None = None) -> None:
+        with self._lock:
+            self._min_size = min_size
+            self._max_size = max_size
+
+    def reset(self) -> None:
+        # Sockets inherited from the parent must be left to the parent.
+        with self._lock:
+            self._pool = None
+            self._replicas = None
+
+    def _new_pool(self, host: str, port: int) -> ConnectionPool:
+        max_size = self._max_size or settings.db_pool_max_size
+        min_size = settings.db_pool_min_size if self._min_size is None else self._min_size
+        return ConnectionPool(
+            min_size=min(min_size, max_size),
+            max_size=max_size,
+            acquire_timeout=settings.db_pool_acquire_timeout,
+            idle_recycle=settings.db_pool_idle_recycle_seconds,
+            statement_cache_size=settings.db_statement_cache_size,
+            host=host,
+            port=port,
+            user=settings.mysql_user,
+            password=settings.mysql_password,
+            database=settings.mysql_database,
+        )
+
+    def get_pool(self) -> ConnectionPool:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = self._new_pool(settings.mysql_host, settings.mysql_port)
+        return self._pool
+
+    def get_replicas(self) -> ReplicaSet | None:
+        if self._replicas is None and settings.db_replica_hosts:
+            with self._lock:
+                if self._replicas is None:
+                    hosts = parse_hosts(settings.db_replica_hosts, settings.mysql_port)
+                    self._replicas = ReplicaSet(hosts, self._new_pool) if hosts else None
+        return self._replicas
+
+    def get_connection(self, replica: bool = False):
+        if replica:
+            replicas = self.get_replicas()
+            connection = replicas.connection() if replicas is not None else None
+            if connection is not None:
+                return connection
+        return self.get_pool().get_connection()
+
+    def stats(self) -> dict | None:
+        pool = self._pool
+        return None if pool is None else pool.stats()
+
+
+# ---------------------- SQLite ----------------------
+
+SQLITE_SCHEMA = Path(__file__).resolve().parents[2] / "database" / "schema.sqlite.sql"
+
+# Store timestamps in the same "YYYY-MM-DD HH:MM:SS" form datetime('now') produces,
+# so text comparisons against it order correctly, and read DATE/DATETIME columns
+# back as the same Python types mysql.connector returns.
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" ", "seconds"))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter("DATE", lambda raw: date.fromisoformat(raw.decode()))
+sqlite3.register_converter("DATETIME", lambda raw: datetime.fromisoformat(raw.decode()))
+
+_PLACEHOLDER = re.compile(r"%([s%])")
+
+
+@lru_cache(maxsize=1024)
+def _qmark(query: str) -> str:
+    """Rewrite ``%s`` placeholders (and ``%%`` escapes) to sqlite3's qmark style."""
+    return _PLACEHOLDER.sub(lambda match: "?" if match.group(1) == "s" else "%", query)
+
+
+def translate_sqlite_error(exc: Exception) -> DatabaseError:
+    if isinstance(exc, sqlite3.IntegrityError):
+        message = str(exc)
+        unique = message.startswith(("UNIQUE constraint failed", "PRIMARY KEY must be unique"))
+        error_class = DuplicateKeyError if unique else IntegrityError
+    elif isinstance(exc, sqlite3.OperationalError) and str(exc) == "interrupted":
+        # Raised when the statement-timeout progress handler aborts a query
+        return QueryTimeoutError("Query cancelled: it ran past its time limit")
+    else:
+        error_class = DatabaseError
+    return error_class(str(exc), errno=getattr(exc, "sqlite_errorcode", None))
+
+
+_SQLITE_ERRORS = (sqlite3.Error,)
+
+# SQLite virtual-machine instructions between statement-timeout checks
+_PROGRESS_STEPS = 10_000
+
+
+class SQLiteConnection:
+    """A thread's long-lived SQLite connection with the pooled-connection interface."""
+
+    def __init__(self, raw: sqlite3.Connection, driver: SQLiteDriver) -> None:
+        self._raw = raw
+        self._driver = driver
+        self._discarded = False
+        self._timed = False
+
+    def cursor(self, dictionary: bool = False, buffered: bool = True) -> Cursor:
+        # sqlite3 cursors step lazily, so ``buffered`` needs no special handling.
+        return Cursor(self._raw.cursor(), translate_sqlite_error, _SQLITE_ERRORS, _qmark, dictionary)
+
+    def prepared(self, query: str) -> Cursor:
+        # sqlite3 already keeps compiled statements per connection (cached_statements).
+        return self.cursor(dictionary=True)
+
+    def set_statement_timeout(self, seconds: float | None) -> None:
+        """Interrupt statements still running ``seconds`` from now; None or 0 lifts the cap.
+
+        Unlike MySQL's per-statement limit, the deadline covers every statement
+        until the connection is closed.
+        """
+        if not seconds:
+            self._clear_timeout()
+            return
+        deadline = time.monotonic() + seconds
+        self._raw.set_progress_handler(lambda: time.monotonic() > deadline, _PROGRESS_STEPS)
+        self._timed = True
+
+    def _clear_timeout(self) -> None:
+        if self._timed:
+            self._raw.set_progress_handler(None, 0)
+            self._timed = False
+
+    def commit(self) -> None:
+        try:
+            self._raw.commit()
+        except sqlite3.Error as exc:
+            raise translate_sqlite_error(exc) from exc
+
+    def rollback(self) -> None:
+        try:
+            self._raw.rollback()
+        except sqlite3.Error as exc:
+            raise translate_sqlite_error(exc) from exc
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._raw.in_transaction
+
+    def close(self) -> None:
+        """Hand the connection back to its thread, ending any open transaction."""
+        if self._discarded:
+            return
+        if self._raw.in_transaction:
+            self._raw.rollback()
+        self._clear_timeout()
+
+    def discard(self) -> None:
+        self._discarded = True
+        self._driver.discard(self)
+        self._raw.close()
+
+    def __enter__(self) -> SQLiteConnection:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SQLiteDriver(Driver):
+    """Embedded SQLite in WAL mode with one connection per thread.
+
+    WAL lets readers run alongside the single writer; the schema in
+    ``database/schema.sqlite.sql`` is applied on first connect.
+    """
+
+    name = "sqlite"
+    insert_ignore = "INSERT OR IGNORE"
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path or settings.sqlite_path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_applied = False
+
+    def now(self) -> str:
+        return "datetime('now', 'localtime')"
+
+    def date_add_days(self, expr: str, days: str = "%s") -> str:
+        return f"datetime({expr}, '+' || ({days}) || ' days')"
+
+    def null_safe_eq(self, left: str, right: str) -> str:
+        return f"{left} IS {right}"
+
+    def datetime_column(self, expr: str, alias: str) -> str:
+        # PARSE_COLNAMES applies the DATETIME converter and strips the "[...]" suffix.
+        return f'{expr} AS "{alias} [DATETIME]"'
+
+    def _connect(self) -> sqlite3.Connection:
+        raw = sqlite3.connect(
+            self.path,
+            timeout=settings.sqlite_busy_timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+            cached_statements=settings.db_statement_cache_size,
+            uri=self.path.startswith("file:"),
+        )
+        raw.execute("PRAGMA foreign_keys = ON")
+        raw.execute("PRAGMA journal_mode = WAL")
+        raw.execute("PRAGMA synchronous = NORMAL")
+        if not self._schema_applied:
+            with self._schema_lock:
+                if not self._schema_applied:
+                    raw.executescript(SQLITE_SCHEMA.read_text())
+                    self._schema_applied = True
+        return raw
+
+    def get_connection(self, replica: bool = False) -> SQLiteConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            try:
+                connection = SQLiteConnection(self._connect(), self)
+            except sqlite3.Error as exc:
+                raise translate_sqlite_error(exc) from exc
+            self._local.connection = connection
+        return connection
+
+    def discard(self, connection: SQLiteConnection) -> None:
+        if getattr(self._local, "connection", None) is connection:
+            self._local.connection = None
+
+    def reset(self) -> None:
+        # SQLite connections must not be used across fork().
+        self._local = threading.local()
+
+
+DriverFactory = Callable[[], Driver]
+
+_drivers: Dict[str, DriverFactory] = {
+    MySQLDriver.name: MySQLDriver,
+    SQLiteDriver.name: SQLiteDriver,
+}
+_driver: Driver | None = None
+_driver_lock = threading.Lock()
+
+
+def register_driver(name: str, factory: DriverFactory) -> None:
+    """Make ``factory()`` selectable via ``DB_BACKEND`` (register before importing the routes)."""
+    _drivers[name] = factory
+
+
+def get_driver() -> Driver:
+    global _driver
+    if _driver is None:
+        with _driver_lock:
+            if _driver is None:
+                factory = _drivers.get(settings.db_backend)
+                if factory is None:
+                    raise ValueError(f"Unknown database backend: {settings.db_backend}")
+                _driver = factory()
+    return _driver
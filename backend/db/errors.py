@@ -0,0 +1,39 @@
+"""Driver-neutral database exceptions.
+
+Each driver translates its client library's errors into these, so route code
+catches ``DatabaseError`` (and ``DuplicateKeyError`` for unique-key clashes)
+without importing mysql.connector or sqlite3.
+"""
+from __future__ import annotations
+
+
+class DatabaseError(Exception):
+    """Base class for every error raised through ``backend.db``."""
+
+    def __init__(self, message: str, errno: int | None = None) -> None:
+        super().__init__(message)
+        self.errno = errno
+
+
+class IntegrityError(DatabaseError):
+    """A constraint (foreign key, NOT NULL, unique) rejected the statement."""
+
+
+class DuplicateKeyError(IntegrityError):
+    """A row clashed with an existing primary or unique key."""
+
+
+class PoolTimeoutError(DatabaseError):
+    """Raised when no connection frees up within the pool's acquire timeout."""
+
+
+class QueryTimeoutError(DatabaseError):
+    """A statement ran past its time limit, or the request's time budget ran out."""
+
+
+class DatabaseUnavailableError(DatabaseError):
+    """The circuit breaker is open; nothing was sent to the database."""
+
+    def __init__(self, message: str, retry_after: int = 1) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
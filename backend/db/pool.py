@@ -1,48 +1,350 @@
+"""Thread-safe MySQL connection pool."""
 from __future__ import annotations
 
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+
 import mysql.connector
-from mysql.connector import pooling
+from mysql.connector import errorcode
+
+from backend.db.cursor import Cursor, PreparedCursor
+from backend.db.errors import (
+    DatabaseError,
+    DuplicateKeyError,
+    IntegrityError,
+    PoolTimeoutError,
+    QueryTimeoutError,
+)
+from backend.utils.metrics import counter, histogram
+
+
+CHECKOUT_WAIT = histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting to check a connection out of the pool"
+)
+CHECKOUT_HOLD = histogram(
+    "db_pool_connection_hold_seconds", "Time a connection stayed checked out before being returned"
+)
+CHECKOUT_TIMEOUTS = counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up after the acquire timeout"
+)
+STATEMENT_CACHE = counter(
+    "db_statement_cache_total", "Prepared-statement lookups per connection, by result", ("result",)
+)
+
+
+def translate_mysql_error(exc: Exception) -> DatabaseError:
+    errno = getattr(exc, "errno", None)
+    if isinstance(exc, mysql.connector.IntegrityError):
+        error_class = DuplicateKeyError if errno == errorcode.ER_DUP_ENTRY else IntegrityError
+    elif errno == errorcode.ER_QUERY_TIMEOUT:
+        return QueryTimeoutError("Query cancelled: it ran past its time limit", errno=errno)
+    else:
+        error_class = DatabaseError
+    return error_class(str(exc), errno=errno)
+
+
+_MYSQL_ERRORS = (mysql.connector.Error,)
+
+
+class _Waiter:
+    """A caller parked in the pool's FIFO wait queue."""
+
+    __slots__ = ("event", "entry", "may_create")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.entry: _Entry | None = None
+        self.may_create = False
+
+
+class _Entry:
+    """A raw connection plus the bookkeeping the pool needs for it."""
+
+    __slots__ = ("raw", "idle_since", "statements", "max_execution_ms")
+
+    def __init__(self, raw) -> None:
+        self.raw = raw
+        self.idle_since = time.monotonic()
+        # SQL text -> (that exact str object, prepared cursor), least recently used first
+        self.statements: OrderedDict[str, tuple[str, object]] = OrderedDict()
+        # Session max_execution_time last set on this connection (None: server default)
+        self.max_execution_ms: int | None = None
+
+
+class PooledConnection:
+    """Proxy handed out by the pool; ``close()`` returns the connection to it."""
+
+    __slots__ = ("_pool", "_entry", "_checked_out")
+
+    def __init__(self, pool: ConnectionPool, entry: _Entry) -> None:
+        self._pool = pool
+        self._entry = entry
+        self._checked_out = time.perf_counter()
+
+    def __getattr__(self, name: str):
+        return getattr(self._raw(), name)
+
+    def _live_entry(self) -> _Entry:
+        if self._entry is None:
+            raise DatabaseError("Connection has already been returned to the pool")
+        return self._entry
+
+    def _raw(self):
+        return self._live_entry().raw
+
+    def cursor(self, *args, **kwargs) -> Cursor:
+        try:
+            raw = self._raw().cursor(*args, **kwargs)
+        except mysql.connector.Error as exc:
+            raise translate_mysql_error(exc) from exc
+        return Cursor(raw, translate_mysql_error, _MYSQL_ERRORS)
+
+    def prepared(self, query: str) -> Cursor:
+        """Dict cursor for ``query`` as a server-side prepared statement.
+
+        Statements are cached on the underlying connection (up to the pool's
+        ``statement_cache_size``, least recently used evicted), so a hot
+        query is parsed once per connection rather than once per call. The
+        connector still sends COM_STMT_RESET before every execute, so each
+        call costs a reset round trip on top of the execute; with a
+        ``statement_cache_size`` of 0 this returns a plain dict cursor
+        (text protocol, one round trip, parsed every time) instead.
+        """
+        if not self._pool.statement_cache_size:
+            return self.cursor(dictionary=True)
+        entry = self._live_entry()
+        statements = entry.statements
+        cached = statements.get(query)
+        if cached is None:
+            STATEMENT_CACHE.inc(result="miss")
+            try:
+                raw = entry.raw.cursor(prepared=True, dictionary=True)
+            except mysql.connector.Error as exc:
+                raise translate_mysql_error(exc) from exc
+            # The connector re-prepares unless it is handed the same str object again.
+            cached = statements[query] = (query, raw)
+            while len(statements) > self._pool.statement_cache_size:
+                _, (_, evicted) = statements.popitem(last=False)
+                try:
+                    evicted.close()
+                except mysql.connector.Error as exc:
+                    raise translate_mysql_error(exc) from exc
+        else:
+            STATEMENT_CACHE.inc(result="hit")
+            statements.move_to_end(query)
+        key, raw = cached
+        return PreparedCursor(raw, translate_mysql_error, _MYSQL_ERRORS, lambda _query: key)
+
+    def set_statement_timeout(self, seconds: float | None) -> None:
+        """Cap how long each SELECT on this connection may run; None or 0 lifts the cap.
+
+        MySQL cancels a SELECT that runs past ``max_execution_time`` and leaves
+        the connection usable, so a timed-out query still returns it to the
+        pool. The session variable is only sent when the value changes.
+        """
+        entry = self._live_entry()
+        millis = math.ceil(seconds * 1000) if seconds else 0
+        if entry.max_execution_ms == millis:
+            return
+        try:
+            entry.raw.cmd_query(f"SET SESSION max_execution_time = {millis}")
+        except mysql.connector.Error as exc:
+            raise translate_mysql_error(exc) from exc
+        entry.max_execution_ms = millis
+
+    def commit(self) -> None:
+        try:
+            self._raw().commit()
+        except mysql.connector.Error as exc:
+            raise translate_mysql_error(exc) from exc
+
+    def rollback(self) -> None:
+        try:
+            self._raw().rollback()
+        except mysql.connector.Error as exc:
+            raise translate_mysql_error(exc) from exc
+
+    def close(self) -> None:
+        if self._entry is not None:
+            entry, self._entry = self._entry, None
+            CHECKOUT_HOLD.observe(time.perf_counter() - self._checked_out)
+            self._pool.release(entry)
+
+    def discard(self) -> None:
+        """Close the underlying connection instead of returning it for reuse."""
+        if self._entry is not None:
+            entry, self._entry = self._entry, None
+            CHECKOUT_HOLD.observe(time.perf_counter() - self._checked_out)
+            self._pool.discard(entry)
+
+    def __enter__(self) -> PooledConnection:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class ConnectionPool:
+    """Thread-safe MySQL pool that grows on demand and queues callers fairly.
+
+    Callers beyond ``max_size`` wait in FIFO order for up to ``acquire_timeout``
+    seconds; released connections are handed straight to the oldest waiter.
+    Idle connections above ``min_size`` are closed once they have been idle for
+    ``idle_recycle`` seconds, and any connection idle that long is pinged
+    before it is handed out again.
+    """
+
+    def __init__(
+        self,
+        min_size: int,
+        max_size: int,
+        acquire_timeout: float,
+        idle_recycle: float,
+        statement_cache_size: int = 64,
+        **connect_kwargs,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.idle_recycle = idle_recycle
+        self.statement_cache_size = max(0, statement_cache_size)
+        self._connect_kwargs = connect_kwargs
+        self._lock = threading.Lock()
+        self._idle: deque[_Entry] = deque()
+        self._waiters: deque[_Waiter] = deque()
+        self._size = 0
+
+        for _ in range(self.min_size):
+            self._size += 1
+            self._idle.append(self._create_entry())
+
+    def _create_entry(self) -> _Entry:
+        try:
+            return _Entry(mysql.connector.connect(**self._connect_kwargs))
+        except mysql.connector.Error as exc:
+            self._discard_slot()
+            raise translate_mysql_error(exc) from exc
+        except Exception:
+            self._discard_slot()
+            raise
+
+    def _discard_slot(self) -> None:
+        """Give up one slot and let the oldest waiter (if any) open a replacement."""
+        with self._lock:
+            self._size -= 1
+            if self._waiters and self._size < self.max_size:
+                waiter = self._waiters.popleft()
+                self._size += 1
+                waiter.may_create = True
+                waiter.event.set()
+
+    def get_connection(self, timeout: float | None = None) -> PooledConnection:
+        started = time.perf_counter()
+        connection = self._checkout(self.acquire_timeout if timeout is None else timeout)
+        CHECKOUT_WAIT.observe(time.perf_counter() - started)
+        return connection
+
+    def _checkout(self, timeout: float) -> PooledConnection:
+        waiter = None
+        with self._lock:
+            if self._idle and not self._waiters:
+                entry = self._idle.pop()
+            elif self._size < self.max_size:
+                self._size += 1
+                entry = None
+            else:
+                waiter = _Waiter()
+                self._waiters.append(waiter)
 
-from backend.config.settings import settings
+        if waiter is None:
+            if entry is None:
+                entry = self._create_entry()
+            return PooledConnection(self, self._validate(entry))
 
+        if not waiter.event.wait(timeout):
+            with self._lock:
+                if not waiter.event.is_set():
+                    self._waiters.remove(waiter)
+                    CHECKOUT_TIMEOUTS.inc()
+                    raise PoolTimeoutError(f"No database connection available within {timeout:g}s")
 
-class Database:
-    _pool: pooling.MySQLConnectionPool | None = None
+        if waiter.may_create:
+            return PooledConnection(self, self._create_entry())
+        return PooledConnection(self, self._validate(waiter.entry))
 
-    @classmethod
-    def get_connection(cls) -> mysql.connector.MySQLConnection:
-        if cls._pool is None:
-            cls._pool = pooling.MySQLConnectionPool(
-                pool_name="sunbeam_pool",
-                pool_size=5,
-                pool_reset_session=True,
-                host=settings.mysql_host,
-                port=settings.mysql_port,
-                user=settings.mysql_user,
-                password=settings.mysql_password,
-                database=settings.mysql_database,
-            )
-        return cls._pool.get_connection()
+    def _validate(self, entry: _Entry) -> _Entry:
+        """Ping connections that sat idle long enough to have been dropped."""
+        if time.monotonic() - entry.idle_since < self.idle_recycle:
+            return entry
+        try:
+            if entry.raw.is_connected():
+                return entry
+        except Exception:
+            pass
+        # Keep the slot and open a fresh connection in place of the dead one.
+        self._close_raw(entry.raw)
+        return self._create_entry()
 
+    def release(self, entry: _Entry) -> None:
+        raw = entry.raw
+        try:
+            if raw.unread_result:
+                raw.consume_results()
+            if raw.in_transaction:
+                raw.rollback()
+        except Exception:
+            self.discard(entry)
+            return
 
-def execute_query(query: str, params: tuple | dict | None = None) -> list[dict]:
-    connection = Database.get_connection()
-    try:
-        with connection.cursor(dictionary=True) as cursor:
-            cursor.execute(query, params or {})
-            if cursor.with_rows:
-                return cursor.fetchall()
-            connection.commit()
-            return []
-    finally:
-        connection.close()
+        entry.idle_since = time.monotonic()
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.entry = entry
+                waiter.event.set()
+                return
+            self._idle.append(entry)
+            expired = self._collect_expired()
+        for stale in expired:
+            self._close_raw(stale.raw)
 
+    def discard(self, entry: _Entry) -> None:
+        self._close_raw(entry.raw)
+        self._discard_slot()
 
-def execute_single(query: str, params: tuple | dict | None = None) -> dict | None:
-    results = execute_query(query, params)
-    return results[0] if results else None
+    def _collect_expired(self) -> list[_Entry]:
+        """Pop idle connections above ``min_size`` past the recycle age (lock held)."""
+        expired: list[_Entry] = []
+        cutoff = time.monotonic() - self.idle_recycle
+        while self._idle and self._size > self.min_size and self._idle[0].idle_since < cutoff:
+            expired.append(self._idle.popleft())
+            self._size -= 1
+        return expired
 
+    def stats(self) -> dict:
+        with self._lock:
+            idle = len(self._idle)
+            return {
+                "size": self._size,
+                "idle": idle,
+                "in_use": self._size - idle,
+                "waiting": len(self._waiters),
+            }
 
-def execute_non_query(query: str, params: tuple | dict | None = None) -> None:
-    execute_query(query, params)
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+        for entry in idle:
+            self._close_raw(entry.raw)
 
+    @staticmethod
+    def _close_raw(raw) -> None:
+        try:
+            raw.close()
+        except Exception:
+            pass
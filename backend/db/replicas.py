@@ -0,0 +1,209 @@
+"""Read-replica routing for the MySQL driver.
+
+Reads marked ``replica=True`` go round-robin to the hosts in
+``DB_REPLICA_HOSTS``. A replica that fails to connect or falls more than
+``DB_REPLICA_MAX_LAG_SECONDS`` behind is skipped for
+``DB_REPLICA_RETRY_SECONDS``; with no usable replica, reads use the primary.
+
+Read-your-writes: a read stays on the primary when any table it touches was
+written by this process within ``DB_READ_YOUR_WRITES_SECONDS``, or when the
+current request is pinned to the primary (see
+``backend.middlewares.read_your_writes``).
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Callable, Dict, Iterable
+
+from backend.config.settings import settings
+from backend.db.errors import DatabaseError, PoolTimeoutError
+from backend.db.pool import ConnectionPool, PooledConnection
+from backend.utils.metrics import counter
+
+# MySQL before 8.0.22 and MariaDB only know SHOW SLAVE STATUS
+_ER_PARSE_ERROR = 1064
+
+REPLICA_READS = counter(
+    "db_replica_reads_total", "Replica-eligible reads by where they were served", ("target",)
+)
+REPLICA_FAILOVERS = counter(
+    "db_replica_failovers_total", "Replicas taken out of rotation, by reason", ("replica", "reason")
+)
+
+# Unix time until which the current request's reads must use the primary
+_primary_until: ContextVar[float] = ContextVar("primary_until", default=0.0)
+
+_WRITE_TARGET = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+IGNORE|\s+IGNORE)?\s+INTO|UPDATE|DELETE\s+FROM)\s+`?(\w+)",
+    re.IGNORECASE,
+)
+
+
+def pin_primary(until: float) -> None:
+    """Send this context's replica-eligible reads to the primary until ``until`` (Unix time)."""
+    _primary_until.set(until)
+
+
+def primary_pinned() -> bool:
+    return _primary_until.get() > time.time()
+
+
+class RecentWrites:
+    """When each table was last written by this process."""
+
+    def __init__(self) -> None:
+        self._written: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def note(self, *tables: str) -> None:
+        now = time.time()
+        with self._lock:
+            for table in tables:
+                self._written[table] = now
+
+    def within(self, tables: Iterable[str], seconds: float) -> bool:
+        cutoff = time.time() - seconds
+        with self._lock:
+            return any(self._written.get(table, 0.0) > cutoff for table in tables)
+
+
+recent_writes = RecentWrites()
+
+
+@lru_cache(maxsize=256)
+def written_table(query: str) -> str | None:
+    """Target table of an INSERT/UPDATE/DELETE statement."""
+    match = _WRITE_TARGET.match(query)
+    return match.group(1).lower() if match else None
+
+
+def note_write(query: str) -> None:
+    table = written_table(query)
+    if table is not None:
+        recent_writes.note(table)
+
+
+def replica_allowed(*tables: str) -> bool:
+    """Whether a read of ``tables`` may be served by a replica right now."""
+    if not settings.db_replica_hosts or primary_pinned():
+        return False
+    return not recent_writes.within(tables, settings.db_read_your_writes_seconds)
+
+
+def parse_hosts(value: str, default_port: int) -> list[tuple[str, int]]:
+    """``"db-r1:3306,db-r2"`` -> ``[("db-r1", 3306), ("db-r2", default_port)]``."""
+    hosts = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, port = item.partition(":")
+        hosts.append((host, int(port) if port else default_port))
+    return hosts
+
+
+class _Replica:
+    __slots__ = ("name", "host", "port", "pool", "down_until", "checked_at", "legacy_status")
+
+    def __init__(self, host: str, port: int) -> None:
+        self.name = f"{host}:{port}"
+        self.host = host
+        self.port = port
+        self.pool: ConnectionPool | None = None
+        self.down_until = 0.0
+        self.checked_at = 0.0
+        self.legacy_status = False
+
+
+class ReplicaSet:
+    """Round-robin over healthy replicas; ``connection()`` returns None when none is usable."""
+
+    def __init__(self, hosts: list[tuple[str, int]], pool_factory: Callable[[str, int], ConnectionPool]) -> None:
+        self._replicas = [_Replica(host, port) for host, port in hosts]
+        self._pool_factory = pool_factory
+        self._lock = threading.Lock()
+        self._next = 0
+
+    def connection(self) -> PooledConnection | None:
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % len(self._replicas)
+
+        now = time.monotonic()
+        for offset in range(len(self._replicas)):
+            replica = self._replicas[(start + offset) % len(self._replicas)]
+            if replica.down_until > now:
+                continue
+            connection = self._checkout(replica, now)
+            if connection is not None:
+                REPLICA_READS.inc(target="replica")
+                return connection
+
+        REPLICA_READS.inc(target="primary")
+        return None
+
+    def _checkout(self, replica: _Replica, now: float) -> PooledConnection | None:
+        try:
+            if replica.pool is None:
+                with self._lock:
+                    if replica.pool is None:
+                        replica.pool = self._pool_factory(replica.host, replica.port)
+            # A busy replica is not a broken one: fall through without marking it down.
+            connection = replica.pool.get_connection(timeout=settings.db_replica_acquire_timeout)
+        except PoolTimeoutError:
+            return None
+        except DatabaseError:
+            self._mark_down(replica, now, "unreachable")
+            return None
+
+        if now - replica.checked_at < settings.db_replica_health_interval:
+            return connection
+        replica.checked_at = now
+        try:
+            lag = self._lag(connection, replica)
+        except DatabaseError:
+            connection.discard()
+            self._mark_down(replica, now, "unreachable")
+            return None
+        if lag is None or lag > settings.db_replica_max_lag_seconds:
+            connection.close()
+            self._mark_down(replica, now, "lagging" if lag is not None else "replication_stopped")
+            return None
+        return connection
+
+    @staticmethod
+    def _replica_status(connection: PooledConnection, replica: _Replica) -> dict | None:
+        if not replica.legacy_status:
+            try:
+                with connection.cursor(dictionary=True) as cursor:
+                    cursor.execute("SHOW REPLICA STATUS")
+                    return cursor.fetchone()
+            except DatabaseError as exc:
+                if exc.errno != _ER_PARSE_ERROR:
+                    raise
+                replica.legacy_status = True
+        with connection.cursor(dictionary=True) as cursor:
+            cursor.execute("SHOW SLAVE STATUS")
+            return cursor.fetchone()
+
+    @classmethod
+    def _lag(cls, connection: PooledConnection, replica: _Replica) -> float | None:
+        """Seconds behind the source; 0 for a server that is not replicating, None if replication is broken."""
+        status = cls._replica_status(connection, replica)
+        if status is None:
+            return 0.0
+        sql_running = status.get("Replica_SQL_Running", status.get("Slave_SQL_Running"))
+        if sql_running is not None and sql_running != "Yes":
+            return None
+        lag = status.get("Seconds_Behind_Source", status.get("Seconds_Behind_Master"))
+        return None if lag is None else float(lag)
+
+    def _mark_down(self, replica: _Replica, now: float, reason: str) -> None:
+        replica.down_until = now + settings.db_replica_retry_seconds
+        # Force a lag check on the first checkout after it comes back
+        replica.checked_at = 0.0
+        REPLICA_FAILOVERS.inc(replica=replica.name, reason=reason)
@@ -0,0 +1,473 @@
+"""Data access for the course, video, student and auth routes.
+
+Every statement the routes run lives here. Fixed-shape statements go through
+``connection.prepared`` so each pooled connection parses them once; bulk
+writes keep plain cursors because the connector rewrites ``executemany``
+INSERTs into multi-row statements only for those, and the admin listings
+keep them because ``fields=`` gives every request its own select list, which
+would only churn the per-connection statement cache. Write functions take the
+caller's connection and leave commit/rollback to it. Catalog reads may be
+served by a read replica (``backend.db.replicas``); writes, and reads inside
+a write transaction, always use the primary.
+"""
+from __future__ import annotations
+
+import time
+from datetime import date
+from typing import Any, Iterable, Iterator, Sequence
+
+from backend.db.database import Database, execute_query, record_statement, stream_query
+from backend.db.drivers import get_driver
+from backend.db.replicas import note_write, replica_allowed
+from backend.utils.metrics import statement_shape
+
+COURSE_TABLE = "courses"
+VIDEO_TABLE = "videos"
+STUDENT_TABLE = "students"
+USER_TABLE = "users"
+REFRESH_TABLE = "refresh_tokens"
+COURSE_COLUMNS = (
+    "course_id", "course_name", "description", "fees", "start_date", "end_date", "video_expire_days",
+)
+VIDEO_COLUMNS = (
+    "video_id", "course_id", "title", "youtube_url", "description", "added_at", "expires_at",
+)
+
+dialect = get_driver()
+
+# expires_at for a video in a course whose expiry window is the %s parameter
+EXPIRES_FROM_ADDED_AT = dialect.date_add_days(f"COALESCE(added_at, {dialect.now()})")
+
+
+def _run(connection, query: str, params: Sequence | None = None) -> int:
+    """Execute a prepared write on ``connection``; returns the affected row count."""
+    shape = statement_shape(query)
+    started = time.perf_counter()
+    try:
+        with connection.prepared(query) as cursor:
+            cursor.execute(query, params)
+            rowcount = cursor.rowcount
+    except Exception as exc:
+        record_statement(shape, started, exc)
+        raise
+    note_write(query)
+    record_statement(shape, started)
+    return rowcount
+
+
+def _fetch(connection, query: str, params: Sequence | None = None) -> list[dict]:
+    """Prepared read inside the caller's transaction."""
+    shape = statement_shape(query)
+    started = time.perf_counter()
+    try:
+        with connection.prepared(query) as cursor:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+    except Exception as exc:
+        record_statement(shape, started, exc)
+        raise
+    record_statement(shape, started)
+    return rows
+
+
+def _fetch_in(connection, query: str, **lists: Sequence) -> list[dict]:
+    """Read with ``IN ({name})`` lists, passed in the order they appear in ``query``.
+
+    Every list length is a distinct statement, so these are not worth preparing.
+    """
+    shape = statement_shape(query)
+    started = time.perf_counter()
+    sql = query.format(**{name: ", ".join(["%s"] * len(values)) for name, values in lists.items()})
+    params = tuple(value for values in lists.values() for value in values)
+    try:
+        with connection.cursor(dictionary=True) as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+    except Exception as exc:
+        record_statement(shape, started, exc)
+        raise
+    record_statement(shape, started)
+    return rows
+
+
+def _write_many(connection, query: str, rows: Iterable[Sequence]) -> None:
+    shape = statement_shape(query)
+    started = time.perf_counter()
+    try:
+        with connection.cursor() as cursor:
+            cursor.executemany(query, list(rows))
+    except Exception as exc:
+        record_statement(shape, started, exc)
+        raise
+    note_write(query)
+    record_statement(shape, started)
+
+
+def _filtered_select(
+    table: str, select_list: str, key: str, conditions: list[str], params: list, limit: int | None
+) -> tuple[str, tuple]:
+    sql = f"SELECT {select_list} FROM {table}"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += f" ORDER BY {key}"
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(limit)
+    return sql, tuple(params)
+
+
+# ---------------------- COURSES ----------------------
+
+ACTIVE_COURSES_SQL = f"SELECT * FROM {COURSE_TABLE} WHERE end_date >= %s"
+
+INSERT_COURSE_SQL = f"""
+    INSERT INTO {COURSE_TABLE}
+    (course_name, description, fees, start_date, end_date, video_expire_days)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+UPDATE_COURSE_SQL = f"""
+    UPDATE {COURSE_TABLE}
+    SET course_name = %s, description = %s, fees = %s, start_date = %s, end_date = %s, video_expire_days = %s
+    WHERE course_id = %s
+"""
+
+# Keep videos.expires_at in step with the course's expiry window;
+# rows already matching the new value are left untouched.
+REFRESH_COURSE_VIDEO_EXPIRY_SQL = f"""
+    UPDATE {VIDEO_TABLE}
+    SET expires_at = {EXPIRES_FROM_ADDED_AT}
+    WHERE course_id = %s
+      AND NOT ({dialect.null_safe_eq("expires_at", EXPIRES_FROM_ADDED_AT)})
+"""
+
+DELETE_COURSE_SQL = f"DELETE FROM {COURSE_TABLE} WHERE course_id = %s"
+
+
+def list_active_courses(on: date) -> list[dict]:
+    """Courses whose end date is ``on`` or later."""
+    return execute_query(ACTIVE_COURSES_SQL, (on,), prepared=True, replica=replica_allowed(COURSE_TABLE))
+
+
+def courses_query(
+    select_list: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    after: Any = None,
+    limit: int | None = None,
+) -> tuple[str, tuple]:
+    """SQL and parameters for the admin course listing, ordered by course_id."""
+    conditions: list[str] = []
+    params: list = []
+    if start_date:
+        conditions.append("start_date >= %s")
+        params.append(start_date)
+    if end_date:
+        conditions.append("end_date <= %s")
+        params.append(end_date)
+    if after is not None:
+        conditions.append("course_id > %s")
+        params.append(after)
+    return _filtered_select(COURSE_TABLE, select_list, "course_id", conditions, params, limit)
+
+
+def list_courses(select_list: str, start_date=None, end_date=None, after=None, limit: int = 100) -> list[dict]:
+    sql, params = courses_query(select_list, start_date, end_date, after, limit)
+    return execute_query(sql, params, replica=replica_allowed(COURSE_TABLE))
+
+
+def stream_courses(select_list: str, start_date=None, end_date=None, after=None) -> Iterator[dict]:
+    sql, params = courses_query(select_list, start_date, end_date, after)
+    return stream_query(sql, params, replica=replica_allowed(COURSE_TABLE))
+
+
+def add_course(connection, course_name, description, fees, start_date, end_date, video_expire_days) -> None:
+    _run(connection, INSERT_COURSE_SQL, (course_name, description, fees, start_date, end_date, video_expire_days))
+
+
+def update_course(
+    connection, course_id: int, course_name, description, fees, start_date, end_date, video_expire_days
+) -> bool:
+    """Update the course and re-derive its videos' expires_at; False if there is no such course."""
+    found = _run(connection, UPDATE_COURSE_SQL, (
+        course_name, description, fees, start_date, end_date, video_expire_days, course_id
+    ))
+    if not found:
+        return False
+    expire_days = video_expire_days or 0
+    _run(connection, REFRESH_COURSE_VIDEO_EXPIRY_SQL, (expire_days, course_id, expire_days))
+    return True
+
+
+def delete_course(connection, course_id: int) -> bool:
+    return _run(connection, DELETE_COURSE_SQL, (course_id,)) > 0
+
+
+# ---------------------- VIDEOS ----------------------
+
+# expires_at is maintained on write, so this is a range read on
+# videos(course_id, expires_at) after the students(email, course_id) lookup.
+STUDENT_VIDEOS_SQL = f"""
+    SELECT v.video_id, v.course_id, v.title, v.youtube_url, v.description, v.added_at,
+           v.expires_at, c.video_expire_days
+    FROM {STUDENT_TABLE} AS s
+    INNER JOIN {COURSE_TABLE} AS c ON c.course_id = s.course_id
+    INNER JOIN {VIDEO_TABLE} AS v ON v.course_id = s.course_id
+    WHERE s.email = %s AND s.course_id = %s AND v.expires_at >= {dialect.now()}
+"""
+
+# Existence check, insert and expiry computation in one statement:
+# no row is inserted when the course does not exist.
+INSERT_VIDEO_SQL = f"""
+    INSERT INTO {VIDEO_TABLE} (course_id, title, youtube_url, description, added_at, expires_at)
+    SELECT course_id, %s, %s, %s, {dialect.now()},
+           {dialect.date_add_days(dialect.now(), "COALESCE(video_expire_days, 0)")}
+    FROM {COURSE_TABLE}
+    WHERE course_id = %s
+"""
+
+COURSE_EXPIRY_SQL = f"SELECT course_id, video_expire_days FROM {COURSE_TABLE} WHERE course_id = %s"
+
+# The video may move to a course with a different expiry window.
+UPDATE_VIDEO_SQL = f"""
+    UPDATE {VIDEO_TABLE}
+    SET course_id = %s, title = %s, youtube_url = %s, description = %s,
+        expires_at = {EXPIRES_FROM_ADDED_AT}
+    WHERE video_id = %s
+"""
+
+DELETE_VIDEO_SQL = f"DELETE FROM {VIDEO_TABLE} WHERE video_id = %s"
+
+# One round trip validates every course and fetches the DB clock, so bulk
+# added_at/expires_at match what the single-row path would store.
+COURSE_EXPIRY_WINDOWS_SQL = f"""
+    SELECT course_id, video_expire_days, {dialect.datetime_column(dialect.now(), "db_now")}
+    FROM {COURSE_TABLE}
+    WHERE course_id IN ({{course_ids}})
+"""
+
+EXISTING_VIDEO_IDS_SQL = f"SELECT video_id FROM {VIDEO_TABLE} WHERE video_id IN ({{video_ids}})"
+
+INSERT_VIDEOS_SQL = f"""
+    INSERT INTO {VIDEO_TABLE}
+    (course_id, title, youtube_url, description, added_at, expires_at)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+
+def videos_for_student(email: str, course_id: int) -> list[dict]:
+    """Unexpired videos of ``course_id``, provided ``email`` is enrolled in it."""
+    return execute_query(
+        STUDENT_VIDEOS_SQL, (email, course_id), prepared=True,
+        replica=replica_allowed(STUDENT_TABLE, COURSE_TABLE, VIDEO_TABLE),
+    )
+
+
+def videos_query(
+    select_list: str, course_id: Any = None, after: Any = None, limit: int | None = None
+) -> tuple[str, tuple]:
+    """SQL and parameters for the admin video listing, ordered by video_id."""
+    conditions: list[str] = []
+    params: list = []
+    if course_id:
+        conditions.append("course_id = %s")
+        params.append(course_id)
+    if after is not None:
+        conditions.append("video_id > %s")
+        params.append(after)
+    return _filtered_select(VIDEO_TABLE, select_list, "video_id", conditions, params, limit)
+
+
+def list_videos(select_list: str, course_id=None, after=None, limit: int = 100) -> list[dict]:
+    sql, params = videos_query(select_list, course_id, after, limit)
+    return execute_query(sql, params, replica=replica_allowed(VIDEO_TABLE))
+
+
+def stream_videos(select_list: str, course_id=None, after=None) -> Iterator[dict]:
+    sql, params = videos_query(select_list, course_id, after)
+    return stream_query(sql, params, replica=replica_allowed(VIDEO_TABLE))
+
+
+def add_video(connection, course_id, title, youtube_url, description) -> bool:
+    """Insert a video with its expiry; False if the course does not exist."""
+    return _run(connection, INSERT_VIDEO_SQL, (title, youtube_url, description, course_id)) > 0
+
+
+def get_course_expiry(course_id) -> dict | None:
+    rows = execute_query(COURSE_EXPIRY_SQL, (course_id,), prepared=True)
+    return rows[0] if rows else None
+
+
+def update_video(connection, video_id: int, course_id, title, youtube_url, description, expire_days: int) -> bool:
+    return _run(connection, UPDATE_VIDEO_SQL, (
+        course_id, title, youtube_url, description, expire_days, video_id
+    )) > 0
+
+
+def delete_video(connection, video_id: int) -> bool:
+    return _run(connection, DELETE_VIDEO_SQL, (video_id,)) > 0
+
+
+def course_expiry_windows(connection, course_ids: Sequence[int]) -> dict[int, dict]:
+    """course_id -> {video_expire_days, db_now} for the courses that exist."""
+    rows = _fetch_in(connection, COURSE_EXPIRY_WINDOWS_SQL, course_ids=course_ids)
+    return {row["course_id"]: row for row in rows}
+
+
+def existing_video_ids(connection, video_ids: Sequence[int]) -> set[int]:
+    if not video_ids:
+        return set()
+    return {row["video_id"] for row in _fetch_in(connection, EXISTING_VIDEO_IDS_SQL, video_ids=video_ids)}
+
+
+def insert_videos(connection, rows: Iterable[Sequence]) -> None:
+    """Rows of (course_id, title, youtube_url, description, added_at, expires_at)."""
+    _write_many(connection, INSERT_VIDEOS_SQL, rows)
+
+
+def update_videos(connection, rows: Iterable[Sequence]) -> None:
+    """Rows of (course_id, title, youtube_url, description, expire_days, video_id)."""
+    _write_many(connection, UPDATE_VIDEO_SQL, rows)
+
+
+# ---------------------- STUDENTS ----------------------
+
+# Callers look the user up first (USER_EXISTS_SQL) so the default password is
+# only hashed for new students; IGNORE covers a concurrent registration.
+USER_EXISTS_SQL = f"SELECT 1 FROM {USER_TABLE} WHERE email = %s"
+
+ENSURE_USER_SQL = f"{dialect.insert_ignore} INTO {USER_TABLE} (email, password) VALUES (%s, %s)"
+
+# UNIQUE(email, course_id) turns a repeat (or concurrent double-submit)
+# registration into a duplicate-key error instead of a second row.
+ENROLL_SQL = f"""
+    INSERT INTO {STUDENT_TABLE} (email, course_id, name, mobile_no)
+    VALUES (%s, %s, %s, %s)
+"""
+
+# IGNORE only covers the unique (email, course_id) key here: bulk callers
+# validate course ids and create the users rows first.
+ENROLL_MANY_SQL = f"""
+    {dialect.insert_ignore} INTO {STUDENT_TABLE} (email, course_id, name, mobile_no)
+    VALUES (%s, %s, %s, %s)
+"""
+
+EXISTING_COURSE_IDS_SQL = f"SELECT course_id FROM {COURSE_TABLE} WHERE course_id IN ({{course_ids}})"
+
+ENROLLED_PAIRS_SQL = f"""
+    SELECT email, course_id FROM {STUDENT_TABLE}
+    WHERE email IN ({{emails}}) AND course_id IN ({{course_ids}})
+"""
+
+SET_PASSWORD_SQL = f"UPDATE {USER_TABLE} SET password = %s WHERE email = %s"
+
+
+def user_exists(email: str) -> bool:
+    return bool(execute_query(USER_EXISTS_SQL, (email,), prepared=True))
+
+
+def ensure_user(connection, email: str, password_hash: str) -> None:
+    _run(connection, ENSURE_USER_SQL, (email, password_hash))
+
+
+def enroll(connection, email: str, course_id, name: str, mobile_no: str | None) -> None:
+    """Raises DuplicateKeyError if the student is already enrolled in the course."""
+    _run(connection, ENROLL_SQL, (email, course_id, name, mobile_no))
+
+
+def existing_course_ids(connection, course_ids: Sequence[int]) -> set[int]:
+    if not course_ids:
+        return set()
+    return {row["course_id"] for row in _fetch_in(connection, EXISTING_COURSE_IDS_SQL, course_ids=course_ids)}
+
+
+def ensure_users(connection, emails: Iterable[str], password_hash: str) -> None:
+    _write_many(connection, ENSURE_USER_SQL, [(email, password_hash) for email in emails])
+
+
+def enrolled_pairs(connection, emails: Sequence[str], course_ids: Sequence[int]) -> set[tuple[str, int]]:
+    """(email, course_id) pairs among ``emails`` x ``course_ids`` that are already enrolled."""
+    if not emails or not course_ids:
+        return set()
+    rows = _fetch_in(connection, ENROLLED_PAIRS_SQL, emails=emails, course_ids=course_ids)
+    return {(row["email"], row["course_id"]) for row in rows}
+
+
+def enroll_many(connection, rows: Iterable[Sequence]) -> None:
+    """Rows of (email, course_id, name, mobile_no); existing enrollments are skipped."""
+    _write_many(connection, ENROLL_MANY_SQL, rows)
+
+
+def set_password(connection, email: str, password_hash: str) -> bool:
+    return _run(connection, SET_PASSWORD_SQL, (password_hash, email)) > 0
+
+
+# ---------------------- AUTH ----------------------
+
+FIND_USER_SQL = f"SELECT email, password, role FROM {USER_TABLE} WHERE email = %s"
+
+USER_ROLE_SQL = f"SELECT role FROM {USER_TABLE} WHERE email = %s"
+
+# Only swap if the hash is unchanged since it was read.
+UPGRADE_PASSWORD_SQL = f"UPDATE {USER_TABLE} SET password = %s WHERE email = %s AND password = %s"
+
+# expires_at is computed by the database so it shares a clock with the checks below
+ISSUE_REFRESH_SQL = f"""
+    INSERT INTO {REFRESH_TABLE} (token_id, family_id, email, expires_at)
+    VALUES (%s, %s, %s, {dialect.date_add_days(dialect.now())})
+"""
+
+# Spend a live token; matches no row if it was already rotated, revoked or expired
+ROTATE_REFRESH_SQL = f"""
+    UPDATE {REFRESH_TABLE}
+    SET revoked_at = {dialect.now()}, replaced_by = %s
+    WHERE token_id = %s AND email = %s AND revoked_at IS NULL AND expires_at > {dialect.now()}
+"""
+
+REVOKE_FAMILY_SQL = f"""
+    UPDATE {REFRESH_TABLE} SET revoked_at = {dialect.now()}
+    WHERE family_id = %s AND revoked_at IS NULL
+"""
+
+
+def _autocommit(connection, query: str, params: Sequence) -> None:
+    """Run a single write on ``connection``, or on its own committed connection if None."""
+    if connection is not None:
+        _run(connection, query, params)
+        return
+    connection = Database.get_connection()
+    try:
+        _run(connection, query, params)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+
+def find_user(email: str) -> dict | None:
+    rows = execute_query(FIND_USER_SQL, (email,), prepared=True)
+    return rows[0] if rows else None
+
+
+def get_user_role(connection, email: str) -> dict | None:
+    rows = _fetch(connection, USER_ROLE_SQL, (email,))
+    return rows[0] if rows else None
+
+
+def upgrade_password_hash(email: str, new_hash: str, old_hash: str) -> None:
+    _autocommit(None, UPGRADE_PASSWORD_SQL, (new_hash, email, old_hash))
+
+
+def issue_refresh_token(token_id: str, family_id: str, email: str, expires_in_days: int, connection=None) -> None:
+    _autocommit(connection, ISSUE_REFRESH_SQL, (token_id, family_id, email, expires_in_days))
+
+
+def rotate_refresh_token(connection, token_id: str, email: str, replaced_by: str) -> bool:
+    """Revoke a live token in favour of ``replaced_by``; False if it was not live."""
+    return _run(connection, ROTATE_REFRESH_SQL, (replaced_by, token_id, email)) == 1
+
+
+def revoke_refresh_family(family_id: str, connection=None) -> None:
+    _autocommit(connection, REVOKE_FAMILY_SQL, (family_id,))
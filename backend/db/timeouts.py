@@ -0,0 +1,55 @@
+"""Statement timeouts and per-request database time budgets.
+
+Every connection handed out by ``Database.get_connection`` caps its SELECTs at
+``DB_QUERY_TIMEOUT`` seconds. Inside a request with a budget (see
+``backend.middlewares.query_budget``) the cap shrinks to whatever is left of
+the budget, and once the budget is spent no further connection is handed out.
+"""
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar, Token
+
+from backend.config.settings import settings
+from backend.db.errors import QueryTimeoutError
+
+# (monotonic deadline, budget in seconds) for the current request, if it has one
+_budget: ContextVar[tuple[float, float] | None] = ContextVar("db_budget", default=None)
+
+
+def start_budget(seconds: float) -> Token:
+    """Give the current context ``seconds`` of database time; pass the token to ``end_budget``."""
+    return _budget.set((time.monotonic() + seconds, seconds))
+
+
+def end_budget(token: Token) -> None:
+    _budget.reset(token)
+
+
+def statement_timeout(timeout: float | None = None, *, budgeted: bool = True) -> float:
+    """Seconds the next statement may run (0: no limit).
+
+    ``timeout`` defaults to ``DB_QUERY_TIMEOUT``; with ``budgeted`` it is cut
+    to what is left of the request's budget. Raises ``QueryTimeoutError``
+    when that budget is already spent.
+    """
+    if timeout is None:
+        timeout = settings.db_query_timeout
+    budget = _budget.get() if budgeted else None
+    if budget is None:
+        return timeout
+    deadline, seconds = budget
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise QueryTimeoutError(f"Request exceeded its {seconds:g}s database time budget")
+    return min(timeout, left) if timeout else left
+
+
+def parse_budgets(value: str) -> dict[str, float]:
+    """``"courses.get_all_courses=2,videos.get_all_videos=3"`` -> {endpoint: seconds}."""
+    budgets = {}
+    for item in value.split(","):
+        endpoint, _, seconds = item.strip().partition("=")
+        if endpoint and seconds:
+            budgets[endpoint.strip()] = float(seconds)
+    return budgets
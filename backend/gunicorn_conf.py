@@ -0,0 +1,12 @@
+"""gunicorn settings computed by backend.server, for launching gunicorn directly:
+
+    gunicorn -c python:backend.gunicorn_conf backend.app:app
+"""
+from backend.db import Database
+from backend.server import gunicorn_options, plan
+
+_plan = plan()
+# Runs in the master before the app is preloaded, so every worker inherits the sizing.
+Database.configure(min_size=_plan.db_pool_min_size, max_size=_plan.db_pool_max_size)
+
+globals().update(gunicorn_options(_plan))
@@ -1,6 +1,51 @@
-from .auth_middleware import check_admin_role
+from .auth_middleware import (
+    AuthError,
+    authenticate,
+    authenticate_request,
+    check_admin_role,
+    current_claims,
+    require_owner_or_admin,
+    require_roles,
+)
+from .load_shedding import (
+    UNAVAILABLE_ERRORS,
+    release_breaker_probe,
+    serves_when_degraded,
+    shed_load,
+    stale_response,
+    unavailable_response,
+)
+from .query_budget import budget_exceeded_response, query_budget
+from .read_your_writes import mark_primary_after_write, pin_primary_reads
+from .rate_limiter import (
+    RateLimitStore,
+    enforce_auth_rate_limits,
+    record_login_failure,
+    register_store,
+    reset_login_failures,
+)
 
 __all__ = [
+    "UNAVAILABLE_ERRORS",
+    "AuthError",
+    "RateLimitStore",
+    "authenticate",
+    "authenticate_request",
+    "budget_exceeded_response",
     "check_admin_role",
+    "current_claims",
+    "enforce_auth_rate_limits",
+    "mark_primary_after_write",
+    "pin_primary_reads",
+    "query_budget",
+    "record_login_failure",
+    "register_store",
+    "release_breaker_probe",
+    "require_owner_or_admin",
+    "require_roles",
+    "reset_login_failures",
+    "serves_when_degraded",
+    "shed_load",
+    "stale_response",
+    "unavailable_response",
 ]
-
@@ -3,58 +3,128 @@ from __future__ import annotations
 from functools import wraps
 
 import jwt
-from flask import jsonify, request
+from flask import g, jsonify, request
 
-from backend.utils.jwt_helper import decode_token
+from backend.utils.jwt_helper import decode_token_cached
+
+
+class AuthError(Exception):
+    """Raised when an Authorization header is missing, malformed or not valid."""
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+        self.message = message
+
+
+def authenticate(auth_header: str | None) -> dict:
+    """Verify an Authorization header value and return its token claims."""
+    if not auth_header:
+        raise AuthError("Authorization header is missing")
+
+    # Extract token from "Bearer <token>" format
+    try:
+        token = auth_header.split(" ")[1] if " " in auth_header else auth_header
+    except IndexError:
+        raise AuthError("Invalid authorization header format")
+
+    try:
+        claims = decode_token_cached(token)
+    except jwt.ExpiredSignatureError:
+        raise AuthError("Token has expired")
+    except jwt.InvalidTokenError as e:
+        raise AuthError(f"Invalid token: {str(e)}")
+    except Exception as e:
+        raise AuthError(f"Authentication error: {str(e)}")
+
+    # Refresh tokens are only accepted by /api/auth/refresh and /logout
+    if claims.get("type") == "refresh":
+        raise AuthError("Invalid token: refresh tokens cannot be used as access tokens")
+
+    return claims
+
+
+def authenticate_request() -> None:
+    """before_request stage: verify the bearer token once and keep the result on ``g``.
+
+    Requests without a token are let through; decorators below decide whether
+    the endpoint needs one.
+    """
+    g.auth_claims = None
+    g.auth_error = None
+    try:
+        g.auth_claims = authenticate(request.headers.get("Authorization"))
+    except AuthError as e:
+        g.auth_error = e.message
+
+
+def current_claims() -> dict | None:
+    if "auth_error" not in g:
+        authenticate_request()
+    return g.auth_claims
+
+
+def role_denial(claims: dict, roles: tuple[str, ...]) -> str | None:
+    """Why ``claims`` may not use an endpoint limited to ``roles`` (None if allowed)."""
+    if claims.get("role") not in roles:
+        allowed = " or ".join(role.capitalize() for role in roles)
+        return f"Access denied. {allowed} role required."
+    return None
+
+
+def owner_denial(claims: dict, owner: str) -> str | None:
+    """Why ``claims`` may not act on ``owner``'s account (None if allowed)."""
+    if claims.get("role") != "admin" and claims.get("sub") != owner.strip().lower():
+        return "Access denied. You can only access your own account."
+    return None
+
+
+def _unauthorized(message: str, status: int = 401):
+    return jsonify({
+        "success": False,
+        "message": message
+    }), status
+
+
+def require_roles(*roles: str):
+    """Decorator allowing only tokens whose ``role`` claim is one of ``roles``."""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            claims = current_claims()
+            if claims is None:
+                return _unauthorized(g.auth_error)
+
+            denial = role_denial(claims, roles)
+            if denial:
+                return _unauthorized(denial, 403)
+
+            return f(*args, **kwargs)
+
+        return decorated_function
+
+    return decorator
+
+
+def require_owner_or_admin(param: str = "email"):
+    """Decorator allowing admins, or the user whose email is the ``param`` URL argument."""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            claims = current_claims()
+            if claims is None:
+                return _unauthorized(g.auth_error)
+
+            denial = owner_denial(claims, kwargs.get(param) or "")
+            if denial:
+                return _unauthorized(denial, 403)
+
+            return f(*args, **kwargs)
+
+        return decorated_function
+
+    return decorator
 
 
 def check_admin_role(f):
     """Decorator to check if the user has admin role."""
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        auth_header = request.headers.get("Authorization")
-        
-        if not auth_header:
-            return jsonify({
-                "success": False,
-                "message": "Authorization header is missing"
-            }), 401
-        
-        # Extract token from "Bearer <token>" format
-        try:
-            token = auth_header.split(" ")[1] if " " in auth_header else auth_header
-        except IndexError:
-            return jsonify({
-                "success": False,
-                "message": "Invalid authorization header format"
-            }), 401
-        
-        try:
-            decoded = decode_token(token)
-            role = decoded.get("role")
-            
-            if role != "admin":
-                return jsonify({
-                    "success": False,
-                    "message": "Access denied. Admin role required."
-                }), 403
-        except jwt.ExpiredSignatureError:
-            return jsonify({
-                "success": False,
-                "message": "Token has expired"
-            }), 401
-        except jwt.InvalidTokenError as e:
-            return jsonify({
-                "success": False,
-                "message": f"Invalid token: {str(e)}"
-            }), 401
-        except Exception as e:
-            return jsonify({
-                "success": False,
-                "message": f"Authentication error: {str(e)}"
-            }), 401
-        
-        return f(*args, **kwargs)
-    
-    return decorated_function
-
+    return require_roles("admin")(f)
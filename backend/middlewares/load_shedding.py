@@ -0,0 +1,90 @@
+"""Turn requests away early while the database is down or overloaded.
+
+``shed_load`` runs before authentication and answers 503 with Retry-After
+when the database circuit breaker is open, or when more than
+``DB_ADMISSION_MAX_WAITING`` callers are already queued for a pooled
+connection, so excess requests fail in microseconds instead of adding to the
+queue. Views that can answer without the database (from cache) opt out with
+``serves_when_degraded``.
+"""
+from __future__ import annotations
+
+from flask import Response, current_app, jsonify, request
+
+from backend.config.settings import settings
+from backend.db.breaker import breaker
+from backend.db.drivers import get_driver
+from backend.db.errors import DatabaseError, DatabaseUnavailableError, PoolTimeoutError
+from backend.utils.metrics import counter
+
+LOAD_SHED = counter("load_shed_total", "Requests rejected with 503 before reaching the database", ("reason",))
+
+# Answered app-wide by ``unavailable_response``; a route whose ``try`` wraps a
+# checkout re-raises these ahead of its generic ``DatabaseError`` branch.
+UNAVAILABLE_ERRORS = (DatabaseUnavailableError, PoolTimeoutError)
+
+# Endpoints that never touch the database
+_EXEMPT_ENDPOINTS = {"health_check", "metrics", "static"}
+
+
+def serves_when_degraded(view):
+    """Let ``view`` through load shedding; it must cope with ``DatabaseError`` itself."""
+    view.serves_when_degraded = True
+    return view
+
+
+def _shed(message: str, retry_after: int, reason: str):
+    LOAD_SHED.inc(reason=reason)
+    response = jsonify({
+        "success": False,
+        "message": message
+    })
+    response.headers["Retry-After"] = str(retry_after)
+    return response, 503
+
+
+def shed_load():
+    """before_request stage: 503 early when the database cannot take more work."""
+    endpoint = request.endpoint
+    if endpoint is None or endpoint in _EXEMPT_ENDPOINTS:
+        return None
+    view = current_app.view_functions.get(endpoint)
+    if getattr(view, "serves_when_degraded", False):
+        return None
+
+    # Only read the state here: the half-open probe goes to a request that
+    # actually reaches the database (Database.get_connection).
+    if breaker.is_open():
+        return _shed("Database is unavailable; please retry shortly", breaker.retry_after(), "circuit_open")
+
+    limit = settings.db_admission_max_waiting
+    if limit:
+        stats = get_driver().stats()
+        if stats is not None and stats["waiting"] >= limit:
+            return _shed("Server is busy; please retry shortly", 1, "pool_queue")
+    return None
+
+
+def release_breaker_probe(exc: BaseException | None = None) -> None:
+    """teardown_request stage: free the breaker probe if this request held it."""
+    breaker.release_probe()
+
+
+def unavailable_response(exc: DatabaseError):
+    """503 for ``DatabaseUnavailableError`` (breaker open) or ``PoolTimeoutError`` (pool exhausted).
+
+    Registered as the app's handler for both, so every route answers them alike.
+    """
+    response = jsonify({
+        "success": False,
+        "message": str(exc)
+    })
+    response.headers["Retry-After"] = str(getattr(exc, "retry_after", 1))
+    return response, 503
+
+
+def stale_response(response: Response) -> Response:
+    """Mark ``response`` as served from a stale cache entry."""
+    response.headers["Warning"] = '110 - "Response is Stale"'
+    response.headers["Cache-Control"] = "no-store"
+    return response
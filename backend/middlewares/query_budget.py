@@ -0,0 +1,53 @@
+"""Per-endpoint database time budgets.
+
+A view wrapped in ``query_budget`` may spend ``DB_REQUEST_BUDGET`` seconds in
+the database (or its entry in ``DB_ENDPOINT_BUDGETS``, keyed by Flask
+endpoint name); statements are cancelled when the budget runs out and the
+view answers 503 via ``budget_exceeded_response``.
+"""
+from __future__ import annotations
+
+from functools import wraps
+
+from flask import jsonify, request
+
+from backend.config.settings import settings
+from backend.db.errors import QueryTimeoutError
+from backend.db.timeouts import end_budget, parse_budgets, start_budget
+from backend.utils.metrics import counter
+
+BUDGET_EXCEEDED = counter(
+    "db_budget_exceeded_total", "Requests answered 503 after running out of database time", ("endpoint",)
+)
+
+_budgets = parse_budgets(settings.db_endpoint_budgets)
+
+
+def endpoint_budget(endpoint: str | None) -> float:
+    """Database seconds allowed to ``endpoint`` (0: no budget)."""
+    return _budgets.get(endpoint, settings.db_request_budget)
+
+
+def query_budget(view):
+    """Hold ``view``'s database work to its endpoint's budget (0 disables it)."""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        seconds = endpoint_budget(request.endpoint)
+        if not seconds:
+            return view(*args, **kwargs)
+        token = start_budget(seconds)
+        try:
+            return view(*args, **kwargs)
+        finally:
+            end_budget(token)
+
+    return wrapper
+
+
+def budget_exceeded_response(exc: QueryTimeoutError):
+    BUDGET_EXCEEDED.inc(endpoint=request.endpoint or "")
+    return jsonify({
+        "success": False,
+        "message": f"{exc}. Narrow the filters or page size and try again."
+    }), 503
@@ -0,0 +1,230 @@
+"""Sliding-window rate limiting for the auth endpoints.
+
+Counts are kept per key (client IP, login email) using the sliding-window
+counter approximation: the previous fixed window's count is weighted by how
+much of it still overlaps the sliding window. That needs only two integers per
+key, so the in-process store stays small under a credential-stuffing burst.
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import Callable, Dict, List
+
+from flask import jsonify, request
+
+from backend.config.settings import settings
+from backend.utils.metrics import counter
+
+RATE_LIMITED = counter("rate_limit_rejections_total", "Requests rejected with 429, per limit", ("limit",))
+
+
+class RateLimitStore:
+    """Counter storage behind :class:`RateLimiter`.
+
+    Subclass and register with :func:`register_store` to share counts between
+    processes. ``window_counts`` returns ``(previous, current)`` counts for the
+    fixed windows starting at ``window_start - window`` and ``window_start``.
+    """
+
+    def window_counts(self, key: str, window_start: float, window: float) -> tuple[int, int]:
+        raise NotImplementedError
+
+    def increment(self, key: str, window_start: float, window: float) -> None:
+        raise NotImplementedError
+
+    def increment_if_below(
+        self, key: str, window_start: float, window: float, previous_weight: float, limit: int
+    ) -> tuple[bool, int, int]:
+        """Count a hit unless ``previous * previous_weight + current`` has reached ``limit``.
+
+        Returns ``(counted, previous, current)`` as seen before the hit. Stores
+        shared between processes should override this with a single atomic
+        operation; the default checks and increments separately.
+        """
+        previous, current = self.window_counts(key, window_start, window)
+        if previous * previous_weight + current >= limit:
+            return False, previous, current
+        self.increment(key, window_start, window)
+        return True, previous, current
+
+    def reset(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        # key -> [window_start, current_count, previous_count]
+        self._counters: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def _roll(self, key: str, window_start: float, window: float) -> List[float]:
+        entry = self._counters.get(key)
+        if entry is None or entry[0] < window_start - window:
+            entry = [window_start, 0, 0]
+        elif entry[0] < window_start:
+            entry = [window_start, 0, entry[1]]
+        return entry
+
+    def window_counts(self, key: str, window_start: float, window: float) -> tuple[int, int]:
+        with self._lock:
+            entry = self._roll(key, window_start, window)
+            return int(entry[2]), int(entry[1])
+
+    def increment(self, key: str, window_start: float, window: float) -> None:
+        with self._lock:
+            self._increment(key, self._roll(key, window_start, window), window_start, window)
+
+    def increment_if_below(
+        self, key: str, window_start: float, window: float, previous_weight: float, limit: int
+    ) -> tuple[bool, int, int]:
+        with self._lock:
+            entry = self._roll(key, window_start, window)
+            previous, current = int(entry[2]), int(entry[1])
+            if previous * previous_weight + current >= limit:
+                return False, previous, current
+            self._increment(key, entry, window_start, window)
+            return True, previous, current
+
+    def _increment(self, key: str, entry: List[float], window_start: float, window: float) -> None:
+        entry[1] += 1
+        self._counters[key] = entry
+        if len(self._counters) > self.max_keys:
+            self._evict(window_start, window)
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._counters.pop(key, None)
+
+    def _evict(self, window_start: float, window: float) -> None:
+        """Drop keys with no recent hits, then the oldest keys if still over budget."""
+        stale = [key for key, entry in self._counters.items() if entry[0] < window_start - window]
+        for key in stale:
+            del self._counters[key]
+        while len(self._counters) > self.max_keys:
+            del self._counters[next(iter(self._counters))]
+
+
+StoreFactory = Callable[[], RateLimitStore]
+
+_stores: Dict[str, StoreFactory] = {
+    "memory": lambda: MemoryRateLimitStore(settings.rate_limit_max_keys),
+}
+
+
+def register_store(name: str, factory: StoreFactory) -> None:
+    """Make ``factory()`` selectable via ``RATE_LIMIT_BACKEND``."""
+    _stores[name] = factory
+
+
+class RateLimiter:
+    def __init__(self) -> None:
+        self._store: RateLimitStore | None = None
+
+    @property
+    def store(self) -> RateLimitStore:
+        if self._store is None:
+            factory = _stores.get(settings.rate_limit_backend)
+            if factory is None:
+                raise ValueError(f"Unknown rate limit backend: {settings.rate_limit_backend}")
+            self._store = factory()
+        return self._store
+
+    def retry_after(self, key: str, limit: int, window: float) -> int:
+        """Seconds until ``key`` may make another attempt (0 if allowed now)."""
+        now = time.time()
+        window_start = now - now % window
+        previous, current = self.store.window_counts(key, window_start, window)
+        elapsed = now - window_start
+        if previous * (1 - elapsed / window) + current < limit:
+            return 0
+        return self._blocked_for(previous, current, limit, window, elapsed)
+
+    def acquire(self, key: str, limit: int, window: float) -> int:
+        """Count an attempt by ``key`` if it is under ``limit``; else seconds until it may retry.
+
+        The check and the hit are one store operation, so concurrent requests
+        cannot all slip under the limit together.
+        """
+        now = time.time()
+        window_start = now - now % window
+        elapsed = now - window_start
+        counted, previous, current = self.store.increment_if_below(
+            key, window_start, window, 1 - elapsed / window, limit
+        )
+        if counted:
+            return 0
+        return self._blocked_for(previous, current, limit, window, elapsed)
+
+    @staticmethod
+    def _blocked_for(previous: int, current: int, limit: int, window: float, elapsed: float) -> int:
+        if current >= limit or previous == 0:
+            # Blocked until the current window becomes the (decaying) previous one.
+            return max(1, math.ceil(window - elapsed))
+        # Wait for the previous window's weight to decay below the remaining budget.
+        unblock_at = window * (1 - (limit - current) / previous)
+        return max(1, math.ceil(unblock_at - elapsed))
+
+    def hit(self, key: str, window: float) -> None:
+        now = time.time()
+        self.store.increment(key, now - now % window, window)
+
+    def reset(self, key: str) -> None:
+        self.store.reset(key)
+
+
+limiter = RateLimiter()
+
+
+def _too_many_requests(limit_name: str, retry_after: int):
+    RATE_LIMITED.inc(limit=limit_name)
+    response = jsonify({
+        "success": False,
+        "message": "Too many attempts. Please try again later."
+    })
+    response.headers["Retry-After"] = str(retry_after)
+    return response, 429
+
+
+def _email_key(email: str) -> str:
+    return f"login:email:{email}"
+
+
+def enforce_auth_rate_limits():
+    """before_request hook for the auth blueprint; runs before any DB or hashing work.
+
+    Login attempts count against the client IP's LOGIN_IP_* budget; token
+    refresh and logout draw from a separate, larger TOKEN_IP_* budget so a
+    busy client's refreshes cannot lock it out of logging in. Login
+    additionally refuses emails that have collected too many recent failures
+    (lockout). The client IP is ``request.remote_addr``, which reflects
+    X-Forwarded-For when ``TRUSTED_PROXY_HOPS`` is set.
+    """
+    if request.endpoint == "auth.login":
+        limit_name, limit, window = "auth_ip", settings.login_ip_max_attempts, settings.login_ip_window_seconds
+    else:
+        limit_name, limit, window = "token_ip", settings.token_ip_max_attempts, settings.token_ip_window_seconds
+    retry_after = limiter.acquire(f"{limit_name}:{request.remote_addr}", limit, window)
+    if retry_after:
+        return _too_many_requests(limit_name, retry_after)
+
+    if request.endpoint == "auth.login":
+        payload = request.get_json(silent=True) or {}
+        email = (payload.get("email") or "").strip().lower() if isinstance(payload, dict) else ""
+        if email:
+            retry_after = limiter.retry_after(
+                _email_key(email), settings.login_email_max_failures, settings.login_email_window_seconds
+            )
+            if retry_after:
+                return _too_many_requests("login_email", retry_after)
+    return None
+
+
+def record_login_failure(email: str) -> None:
+    limiter.hit(_email_key(email), settings.login_email_window_seconds)
+
+
+def reset_login_failures(email: str) -> None:
+    limiter.reset(_email_key(email))
@@ -0,0 +1,39 @@
+"""Keep a client's reads on the primary right after it writes.
+
+A successful write sets a short-lived cookie holding the time until which the
+client's reads must skip the replicas; ``pin_primary_reads`` applies it to
+every later request, whichever worker serves it.
+"""
+from __future__ import annotations
+
+import time
+
+from flask import Response, request
+
+from backend.config.settings import settings
+from backend.db.replicas import pin_primary
+
+PRIMARY_COOKIE = "db_primary_until"
+_READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def pin_primary_reads() -> None:
+    """before_request stage: honour the client's read-your-writes cookie."""
+    try:
+        until = float(request.cookies.get(PRIMARY_COOKIE, 0))
+    except ValueError:
+        until = 0.0
+    pin_primary(until)
+
+
+def mark_primary_after_write(response: Response) -> Response:
+    """after_request stage: pin the client to the primary after a successful write."""
+    if request.method in _READ_METHODS or response.status_code >= 400:
+        return response
+    window = settings.db_read_your_writes_seconds
+    until = time.time() + window
+    pin_primary(until)
+    response.set_cookie(
+        PRIMARY_COOKIE, f"{until:.3f}", max_age=max(1, int(window)), httponly=True, samesite="Lax"
+    )
+    return response
@@ -1,13 +1,30 @@
 from __future__ import annotations
 
+from functools import lru_cache
+
+import jwt
 from flask import Blueprint, jsonify, request
 
-from backend.db import execute_query
-from backend.utils.jwt_helper import create_access_token
-from backend.utils.password import hash_password_sha256
+from backend.config.settings import settings
+from backend.db import Database, DatabaseError, repository
+from backend.middlewares.load_shedding import UNAVAILABLE_ERRORS
+from backend.middlewares.rate_limiter import (
+    enforce_auth_rate_limits,
+    record_login_failure,
+    reset_login_failures,
+)
+from backend.utils.jwt_helper import create_access_token, create_refresh_token, decode_refresh_token
+from backend.utils.password import PasswordHasherBusy, hash_password, needs_rehash, verify_password
 
 
 auth_bp = Blueprint("auth", __name__)
+# Throttle by client IP and locked-out email before any DB or hashing work
+auth_bp.before_request(enforce_auth_rate_limits)
+
+
+@lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    return hash_password("not-a-real-password")
 
 
 @auth_bp.post("/login")
@@ -20,26 +37,116 @@ def login():
     if not email or not password:
         return jsonify({"success": False, "message": "Email and password are required"}), 400
 
-    # Hash password using SHA256 (matches crypto-js.SHA256)
-    hash_password = hash_password_sha256(password)
+    # Query user by email; the stored hash carries its own algorithm and salt
+    user = repository.find_user(email)
 
-    # Query user with email and hashed password
-    sql = "SELECT * FROM users WHERE email = %s AND password = %s"
-    results = execute_query(sql, (email, hash_password))
+    try:
+        # Unknown emails are checked against a throwaway hash so both paths cost the same
+        valid = verify_password(password, user["password"] if user else _dummy_hash())
+    except PasswordHasherBusy:
+        response = jsonify({"success": False, "message": "Server is busy, please retry shortly."})
+        response.headers["Retry-After"] = "1"
+        return response, 503
 
-    # If user does not exist
-    if not results or len(results) == 0:
+    # If user does not exist or the password is wrong
+    if not user or not valid:
+        record_login_failure(email)
         return jsonify({"success": False, "message": "Invalid email or password!"}), 401
 
-    # If user exists
-    user = results[0]
+    reset_login_failures(email)
 
-    # Create token
+    # Upgrade legacy SHA-256 / outdated KDF hashes now that we know the password.
+    # Only swap if the hash is unchanged, and never fail the login over it.
+    if needs_rehash(user["password"]):
+        try:
+            repository.upgrade_password_hash(email, hash_password(password), user["password"])
+        except (DatabaseError, PasswordHasherBusy):
+            pass
+
+    # Create tokens; the refresh token starts a new session family
     token = create_access_token(user["email"], {"role": user.get("role", "student")})
+    refresh_token, refresh_claims = create_refresh_token(user["email"])
+    repository.issue_refresh_token(
+        refresh_claims["jti"], refresh_claims["fam"], user["email"], settings.refresh_token_expiration_days
+    )
 
     return jsonify({
         "success": True,
         "message": "login successful",
-        "data": {"token": token}
+        "data": {"token": token, "refreshToken": refresh_token}
     }), 200
 
+
+def _read_refresh_token():
+    """Decoded claims of the request's refresh token, or an error response."""
+    payload = request.get_json(silent=True) or {}
+    refresh_token = payload.get("refreshToken") or payload.get("refresh_token")
+    if not refresh_token:
+        return None, (jsonify({"success": False, "message": "refreshToken is required"}), 400)
+    try:
+        return decode_refresh_token(refresh_token), None
+    except jwt.ExpiredSignatureError:
+        return None, (jsonify({"success": False, "message": "Refresh token has expired"}), 401)
+    except jwt.InvalidTokenError:
+        return None, (jsonify({"success": False, "message": "Invalid refresh token"}), 401)
+
+
+@auth_bp.post("/refresh")
+def refresh():
+    """POST: exchange a refresh token for a new access token and a rotated refresh token"""
+    claims, error = _read_refresh_token()
+    if error:
+        return error
+
+    email = claims["sub"]
+    new_refresh_token, new_claims = create_refresh_token(email, claims["fam"])
+
+    connection = Database.get_connection()
+    try:
+        if not repository.rotate_refresh_token(connection, claims["jti"], email, new_claims["jti"]):
+            # A validly signed token that is no longer live was either
+            # revoked or already rotated; replaying a rotated token means it
+            # leaked, so end every session descended from the same login.
+            repository.revoke_refresh_family(claims["fam"], connection)
+            connection.commit()
+            return jsonify({"success": False, "message": "Refresh token has been revoked"}), 401
+
+        repository.issue_refresh_token(
+            new_claims["jti"], claims["fam"], email, settings.refresh_token_expiration_days, connection
+        )
+        user = repository.get_user_role(connection, email)
+        if user is None:
+            connection.rollback()
+            return jsonify({"success": False, "message": "Invalid refresh token"}), 401
+
+        connection.commit()
+    except DatabaseError as exc:
+        connection.rollback()
+        return jsonify({"success": False, "message": str(exc)}), 400
+    finally:
+        connection.close()
+
+    token = create_access_token(email, {"role": user.get("role") or "student"})
+    return jsonify({
+        "success": True,
+        "message": "token refreshed",
+        "data": {"token": token, "refreshToken": new_refresh_token}
+    }), 200
+
+
+@auth_bp.post("/logout")
+def logout():
+    """POST: revoke the refresh token and every token rotated from the same login"""
+    claims, error = _read_refresh_token()
+    if error:
+        return error
+
+    try:
+        repository.revoke_refresh_family(claims["fam"])
+    except UNAVAILABLE_ERRORS:
+        raise
+    except DatabaseError as exc:
+        return jsonify({"success": False, "message": str(exc)}), 400
+
+    return jsonify({"success": True, "message": "logout successful"}), 200
+
@@ -2,39 +2,67 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
-import mysql.connector
 from flask import Blueprint, jsonify, request
 
-from backend.db import Database, execute_query
+from backend.db import Database, DatabaseError, QueryTimeoutError, repository
+from backend.db.repository import COURSE_COLUMNS, COURSE_TABLE
 from backend.middlewares.auth_middleware import check_admin_role
-
-COURSE_TABLE = "courses"
+from backend.middlewares.load_shedding import UNAVAILABLE_ERRORS, serves_when_degraded, stale_response
+from backend.middlewares.query_budget import budget_exceeded_response, query_budget
+from backend.utils.cache import MISSING, Cache
+from backend.utils.conditional import make_validator, table_versions
+from backend.utils.pagination import PaginationError, parse_page_request, split_page
+from backend.utils.streaming import stream_json_response, wants_stream
 
 courses_bp = Blueprint("courses", __name__)
 
+# Active-course listings keyed by date; cleared whenever a course write commits.
+# The last listing per date is kept to answer from while the database is unavailable.
+catalog_cache = Cache("active_courses", keep_stale=True)
+
 
 @courses_bp.get("/all-active-courses")
+@serves_when_degraded
+@query_budget
 def get_all_active_courses():
     """GET: get all active courses"""
     current_date = date.today()
 
-    sql = f"SELECT * FROM {COURSE_TABLE} WHERE end_date >= %s"
+    validator = make_validator((COURSE_TABLE,), current_date)
+    if validator.is_fresh(request):
+        return validator.not_modified()
 
     try:
-        results = execute_query(sql, (current_date,))
+        try:
+            results = catalog_cache.get_or_load(
+                current_date.isoformat(), lambda: repository.list_active_courses(current_date)
+            )
+        except DatabaseError:
+            # Answer from the last listing we had while the database is struggling
+            results = catalog_cache.get_stale(current_date.isoformat())
+            if results is MISSING:
+                raise
+            return stale_response(jsonify({
+                "success": True,
+                "data": results
+            })), 200
 
         if not results or len(results) == 0:
-            return jsonify({
+            return validator.apply(jsonify({
                 "success": True,
                 "message": "No Courses Found."
-            }), 200
+            })), 200
 
-        return jsonify({
+        return validator.apply(jsonify({
             "success": True,
             "data": results
-        }), 200
+        })), 200
 
-    except mysql.connector.Error as e:
+    except UNAVAILABLE_ERRORS:
+        raise
+    except QueryTimeoutError as e:
+        return budget_exceeded_response(e)
+    except DatabaseError as e:
         return jsonify({
             "success": False,
             "message": str(e)
@@ -48,27 +76,26 @@ def get_all_active_courses():
 
 @courses_bp.get("/all-courses")
 @check_admin_role
+@query_budget
 def get_all_courses():
-    """GET: get all courses (filter datewise)"""
+    """GET: get all courses (filter datewise), paginated by course_id"""
     start_date = request.args.get("startDate")
     end_date = request.args.get("endDate")
 
-    sql = f"SELECT * FROM {COURSE_TABLE}"
-    params = []
-
-    # Add filters
-    if start_date and end_date:
-        sql += " WHERE start_date >= %s AND end_date <= %s"
-        params.extend([start_date, end_date])
-    elif start_date:
-        sql += " WHERE start_date >= %s"
-        params.append(start_date)
-    elif end_date:
-        sql += " WHERE end_date <= %s"
-        params.append(end_date)
+    try:
+        page = parse_page_request(request.args, "course_id", COURSE_COLUMNS)
+    except PaginationError as e:
+        return jsonify({
+            "success": False,
+            "message": str(e)
+        }), 400
 
     try:
-        results = execute_query(sql, tuple(params) if params else None)
+        if wants_stream(request.args):
+            rows = repository.stream_courses(page.select_list, start_date, end_date, page.after)
+            return stream_json_response(rows), 200
+
+        results = repository.list_courses(page.select_list, start_date, end_date, page.after, page.limit + 1)
 
         if not results or len(results) == 0:
             return jsonify({
@@ -76,12 +103,18 @@ def get_all_courses():
                 "message": "No Records Found."
             }), 200
 
+        results, next_cursor = split_page(results, page)
         return jsonify({
             "success": True,
-            "data": results
+            "data": results,
+            "next_cursor": next_cursor
         }), 200
 
-    except mysql.connector.Error as e:
+    except UNAVAILABLE_ERRORS:
+        raise
+    except QueryTimeoutError as e:
+        return budget_exceeded_response(e)
+    except DatabaseError as e:
         return jsonify({
             "success": False,
             "message": str(e)
@@ -105,25 +138,20 @@ def add_course():
     end_date = payload.get("endDate") or payload.get("end_date")
     video_expire_days = payload.get("videoExpireDays") or payload.get("video_expire_days")
 
-    sql = f"""INSERT INTO {COURSE_TABLE} 
-            (course_name, description, fees, start_date, end_date, video_expire_days) 
-            VALUES (%s, %s, %s, %s, %s, %s)"""
-
     connection = Database.get_connection()
     try:
-        cursor = connection.cursor()
-        cursor.execute(
-            sql,
-            (course_name, description, fees, start_date, end_date, video_expire_days)
+        repository.add_course(
+            connection, course_name, description, fees, start_date, end_date, video_expire_days
         )
         connection.commit()
-        cursor.close()
+        catalog_cache.invalidate()
+        table_versions.bump(COURSE_TABLE)
         return jsonify({
             "success": True,
             "message": "Course added successfully."
         }), 200
 
-    except mysql.connector.Error as e:
+    except DatabaseError as e:
         connection.rollback()
         return jsonify({
             "success": False,
@@ -151,33 +179,28 @@ def update_course(course_id: int):
     end_date = payload.get("endDate") or payload.get("end_date")
     video_expire_days = payload.get("videoExpireDays") or payload.get("video_expire_days")
 
-    sql = f"""UPDATE {COURSE_TABLE} 
-        SET course_name = %s, description = %s, fees = %s, start_date = %s, end_date = %s, video_expire_days = %s 
-        WHERE course_id = %s"""
-
     connection = Database.get_connection()
     try:
-        cursor = connection.cursor()
-        cursor.execute(
-            sql,
-            (course_name, description, fees, start_date, end_date, video_expire_days, course_id)
+        # Also re-derives expires_at for the course's videos
+        found = repository.update_course(
+            connection, course_id, course_name, description, fees, start_date, end_date, video_expire_days
         )
-        
-        if cursor.rowcount == 0:
-            cursor.close()
+        if not found:
+            connection.rollback()
             return jsonify({
                 "success": False,
                 "message": f"No course found with Id: {course_id}"
             }), 404
 
         connection.commit()
-        cursor.close()
+        catalog_cache.invalidate()
+        table_versions.bump(COURSE_TABLE)
         return jsonify({
             "success": True,
             "message": "Course updated successfully."
         }), 200
 
-    except mysql.connector.Error as e:
+    except DatabaseError as e:
         connection.rollback()
         return jsonify({
             "success": False,
@@ -197,28 +220,24 @@ def update_course(course_id: int):
 @check_admin_role
 def delete_course(course_id: int):
     """DELETE: delete a course by courseId"""
-    sql = f"DELETE FROM {COURSE_TABLE} WHERE course_id = %s"
-
     connection = Database.get_connection()
     try:
-        cursor = connection.cursor()
-        cursor.execute(sql, (course_id,))
-
-        if cursor.rowcount == 0:
-            cursor.close()
+        if not repository.delete_course(connection, course_id):
+            connection.rollback()
             return jsonify({
                 "success": False,
                 "message": f"No course found with Id: {course_id}"
             }), 404
 
         connection.commit()
-        cursor.close()
+        catalog_cache.invalidate()
+        table_versions.bump(COURSE_TABLE)
         return jsonify({
             "success": True,
             "message": "Course deleted successfully."
         }), 200
 
-    except mysql.connector.Error as e:
+    except DatabaseError as e:
         connection.rollback()
         return jsonify({
             "success": False,
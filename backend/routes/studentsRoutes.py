@@ -1,14 +1,31 @@
 from __future__ import annotations
 
-import mysql.connector
+import csv
+import io
+
 from flask import Blueprint, jsonify, request
 
-from backend.db import Database
-from backend.utils.password import hash_password_sha256
+from backend.db import Database, DatabaseError, DuplicateKeyError, repository
+from backend.config.settings import settings
+from backend.middlewares.auth_middleware import check_admin_role, require_owner_or_admin
+from backend.utils.conditional import table_versions
+from backend.utils.password import PasswordHasherBusy, hash_password
+from backend.utils.validators import require_fields
 
 
 students_bp = Blueprint("students", __name__)
 
+DEFAULT_PASSWORD = "sunbeam"
+
+
+def _busy_response(exc: PasswordHasherBusy):
+    response = jsonify({
+        "success": False,
+        "message": str(exc)
+    })
+    response.headers["Retry-After"] = "1"
+    return response, 503
+
 
 @students_bp.post("/register-to-course")
 def register_to_course():
@@ -25,68 +42,37 @@ def register_to_course():
             "message": "Name, email, and courseId are required"
         }), 400
 
+    # Only new students need the default password hashed (re-enrolments are
+    # the common case), and it is hashed before checking out a connection so
+    # the KDF never holds one.
+    default_hash = None
+    if not repository.user_exists(email):
+        try:
+            default_hash = hash_password(DEFAULT_PASSWORD)
+        except PasswordHasherBusy as exc:
+            return _busy_response(exc)
+
     connection = Database.get_connection()
     try:
-        connection.start_transaction()
-        cursor = connection.cursor(dictionary=True)
-
-        # 1. Check if student exists
-        check_email_sql = "SELECT * FROM users WHERE email = %s"
-        cursor.execute(check_email_sql, (email,))
-        check_email_result = cursor.fetchall()
-
-        # 2. If student does not exist (then add it into users table)
-        if not check_email_result or len(check_email_result) == 0:
-            # New student data to be added into users table with default password
-            default_password = "sunbeam"
-            hash_password = hash_password_sha256(default_password)
-
-            insert_sql = "INSERT INTO users (email, password) VALUES (%s, %s)"
-            cursor.execute(insert_sql, (email, hash_password))
-            if cursor.rowcount == 0:
-                connection.rollback()
-                cursor.close()
-                return jsonify({
-                    "success": False,
-                    "message": "something went wrong"
-                }), 400
-            # Student added successfully into users table
-
-        # 3. If student exists, check if he already registered to the course
-        check_sql = "SELECT * FROM students WHERE email = %s AND course_id = %s"
-        cursor.execute(check_sql, (email, course_id))
-        check_result = cursor.fetchall()
-
-        if check_result and len(check_result) > 0:
+        if default_hash is not None:
+            repository.ensure_user(connection, email, default_hash)
+        try:
+            repository.enroll(connection, email, course_id, name, mobile_no)
+        except DuplicateKeyError:
             connection.rollback()
-            cursor.close()
             return jsonify({
                 "success": False,
                 "message": "You're already enrolled in this course."
             }), 400
 
-        # 4. If record not found, then add the data into students table (ie, registers for course)
-        register_sql = """
-            INSERT INTO students (email, course_id, name, mobile_no)
-            VALUES (%s, %s, %s, %s)
-        """
-        cursor.execute(register_sql, (email, course_id, name, mobile_no))
-        if cursor.rowcount == 0:
-            connection.rollback()
-            cursor.close()
-            return jsonify({
-                "success": False,
-                "message": "something went wrong"
-            }), 400
-
         connection.commit()
-        cursor.close()
+        table_versions.bump("students")
         return jsonify({
             "success": True,
             "message": "Registration to course successful."
         }), 200
 
-    except mysql.connector.Error as exc:
+    except DatabaseError as exc:
         connection.rollback()
         return jsonify({
             "success": False,
@@ -96,9 +82,164 @@ def register_to_course():
         connection.close()
 
 
+def _read_bulk_rows() -> list[dict]:
+    """Rows from a JSON array (or {"students": [...]}), a text/csv body, or a CSV upload."""
+    upload = request.files.get("file")
+    if upload is not None:
+        return list(csv.DictReader(io.StringIO(upload.read().decode("utf-8-sig"))))
+    if request.mimetype == "text/csv":
+        return list(csv.DictReader(io.StringIO(request.get_data(as_text=True))))
+
+    payload = request.get_json(silent=True)
+    if isinstance(payload, dict):
+        payload = payload.get("students")
+    if not isinstance(payload, list):
+        raise ValueError("Expected a JSON array of students or a CSV file")
+    return payload
+
+
+def _text(value) -> str:
+    """A JSON or CSV field as stripped text; JSON numbers (e.g. a mobileNo) are accepted."""
+    return str(value).strip() if value is not None else ""
+
+
+def _normalize_bulk_row(raw) -> dict:
+    if not isinstance(raw, dict):
+        raw = {}
+    course_id = raw.get("courseId") or raw.get("course_id")
+    return {
+        "name": _text(raw.get("name")),
+        "email": _text(raw.get("email")).lower(),
+        "course_id": _text(course_id),
+        "mobile_no": _text(raw.get("mobileNo") or raw.get("mobile_no")) or None,
+    }
+
+
+def _enroll_chunk(connection, chunk: list[tuple[dict, dict]], default_hash: str) -> bool:
+    """Create missing users and enrollments for one chunk in a single transaction."""
+    emails = sorted({row["email"] for row, _ in chunk})
+    course_ids = sorted({row["course_id"] for row, _ in chunk})
+
+    repository.ensure_users(connection, emails, default_hash)
+    already = repository.enrolled_pairs(connection, emails, course_ids)
+
+    new_rows = []
+    for row, result in chunk:
+        if (row["email"], row["course_id"]) in already:
+            result.update(status="already_enrolled", message="Already enrolled in this course.")
+        else:
+            new_rows.append((row["email"], row["course_id"], row["name"], row["mobile_no"]))
+            result.update(status="enrolled")
+
+    if new_rows:
+        repository.enroll_many(connection, new_rows)
+
+    connection.commit()
+    return bool(new_rows)
+
+
+@students_bp.post("/bulk-register")
+@check_admin_role
+def bulk_register_to_courses():
+    """POST: registers many students into courses (JSON array or CSV), admin only"""
+    try:
+        raw_rows = _read_bulk_rows()
+    except (ValueError, UnicodeDecodeError, csv.Error) as exc:
+        return jsonify({
+            "success": False,
+            "message": str(exc)
+        }), 400
+
+    if len(raw_rows) > settings.bulk_max_rows:
+        return jsonify({
+            "success": False,
+            "message": f"At most {settings.bulk_max_rows} rows can be imported per request"
+        }), 400
+
+    # Per-row report, in input order (row numbers are 1-based).
+    report: list[dict] = []
+    pending: list[tuple[dict, dict]] = []
+    seen: set[tuple[str, int]] = set()
+
+    for number, raw in enumerate(raw_rows, start=1):
+        row = _normalize_bulk_row(raw)
+        result = {"row": number, "email": row["email"], "courseId": row["course_id"] or None}
+        report.append(result)
+
+        ok, missing = require_fields(row, ["name", "email", "course_id"])
+        if not ok:
+            result.update(status="invalid", message=f"Missing fields: {', '.join(missing)}")
+            continue
+        if not row["course_id"].isdigit():
+            result.update(status="invalid", message="courseId must be an integer")
+            continue
+
+        row["course_id"] = result["courseId"] = int(row["course_id"])
+        key = (row["email"], row["course_id"])
+        if key in seen:
+            result.update(status="duplicate", message="Repeated earlier in this import")
+            continue
+        seen.add(key)
+        pending.append((row, result))
+
+    # Every new account gets the same default password, so hash it once,
+    # before a connection is checked out.
+    try:
+        default_hash = hash_password(DEFAULT_PASSWORD)
+    except PasswordHasherBusy as exc:
+        return _busy_response(exc)
+
+    connection = Database.get_connection()
+    try:
+        course_ids = sorted({row["course_id"] for row, _ in pending})
+        existing_courses = repository.existing_course_ids(connection, course_ids)
+        connection.commit()
+
+        valid = []
+        for row, result in pending:
+            if row["course_id"] in existing_courses:
+                valid.append((row, result))
+            else:
+                result.update(status="invalid", message=f"No course found with Id: {row['course_id']}")
+
+        enrolled_any = False
+        for start in range(0, len(valid), settings.bulk_chunk_size):
+            chunk = valid[start:start + settings.bulk_chunk_size]
+            try:
+                enrolled_any |= _enroll_chunk(connection, chunk, default_hash)
+            except DatabaseError as exc:
+                connection.rollback()
+                for _, result in chunk:
+                    result.update(status="error", message=str(exc))
+
+        if enrolled_any:
+            table_versions.bump("students")
+
+    except DatabaseError as exc:
+        connection.rollback()
+        return jsonify({
+            "success": False,
+            "message": str(exc)
+        }), 400
+    finally:
+        connection.close()
+
+    summary: dict[str, int] = {}
+    for result in report:
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+
+    return jsonify({
+        "success": True,
+        "message": f"Processed {len(report)} rows.",
+        "data": {"summary": summary, "results": report}
+    }), 200
+
+
 @students_bp.put("/change-password/<email>")
+@require_owner_or_admin("email")
 def change_password(email: str):
-    """PUT: change password"""
+    """PUT: change password (own account or admin)"""
+    email = email.strip().lower()
     payload = request.get_json(silent=True) or {}
     new_password = payload.get("newPassword") or payload.get("new_password")
     confirm_password = payload.get("confirmPassword") or payload.get("confirm_password")
@@ -115,18 +256,18 @@ def change_password(email: str):
             "message": "New password and confirmation do not match!"
         }), 400
 
-    hash_password = hash_password_sha256(new_password)
-    sql = "UPDATE users SET password = %s WHERE email = %s"
+    try:
+        hashed_password = hash_password(new_password)
+    except PasswordHasherBusy as exc:
+        return _busy_response(exc)
 
     connection = Database.get_connection()
     try:
-        with connection.cursor() as cursor:
-            cursor.execute(sql, (hash_password, email))
-            if cursor.rowcount == 0:
-                return jsonify({
-                    "success": True,
-                    "message": "Incorrect email."
-                }), 200
+        if not repository.set_password(connection, email, hashed_password):
+            return jsonify({
+                "success": True,
+                "message": "Incorrect email."
+            }), 200
 
         connection.commit()
         return jsonify({
@@ -134,7 +275,7 @@ def change_password(email: str):
             "message": "Password updated successfully."
         }), 200
 
-    except mysql.connector.Error as exc:
+    except DatabaseError as exc:
         connection.rollback()
         return jsonify({
             "success": False,
@@ -1,67 +1,54 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from datetime import timedelta
 
-import mysql.connector
 from flask import Blueprint, jsonify, request
 
-from backend.db import Database, execute_query
-from backend.middlewares.auth_middleware import check_admin_role
-
-VIDEO_TABLE = "videos"
-COURSE_TABLE = "courses"
-STUDENT_TABLE = "students"
+from backend.config.settings import settings
+from backend.db import Database, DatabaseError, QueryTimeoutError, repository
+from backend.db.repository import COURSE_TABLE, STUDENT_TABLE, VIDEO_COLUMNS, VIDEO_TABLE
+from backend.middlewares.auth_middleware import check_admin_role, require_owner_or_admin
+from backend.middlewares.load_shedding import UNAVAILABLE_ERRORS
+from backend.middlewares.query_budget import budget_exceeded_response, query_budget
+from backend.utils.conditional import make_validator, table_versions
+from backend.utils.pagination import PaginationError, parse_page_request, split_page
+from backend.utils.streaming import stream_json_response, wants_stream
+from backend.utils.validators import require_fields
 
 videos_bp = Blueprint("videos", __name__)
 
 
 @videos_bp.get("/all/<string:email>/<int:course_id>")
+@require_owner_or_admin("email")
+@query_budget
 def get_videos_for_student(email: str, course_id: int):
-    """GET: get all videos of a course registered by a student."""
-    sql = f"""
-        SELECT v.video_id, v.course_id, v.title, v.youtube_url, v.description, v.added_at,
-               c.video_expire_days
-        FROM {VIDEO_TABLE} AS v
-        INNER JOIN {STUDENT_TABLE} AS s ON s.course_id = v.course_id
-        INNER JOIN {COURSE_TABLE} AS c ON c.course_id = v.course_id
-        WHERE s.email = %s AND s.course_id = %s
-    """
+    """GET: get all videos of a course registered by a student (own account or admin)."""
+    email = email.strip().lower()
+    validator = make_validator(
+        (VIDEO_TABLE, COURSE_TABLE, STUDENT_TABLE), email, course_id, private=True
+    )
+    if validator.is_fresh(request):
+        return validator.not_modified()
 
     try:
-        results = execute_query(sql, (email, course_id))
+        results = repository.videos_for_student(email, course_id)
 
         if not results:
-            return jsonify({
-                "success": True,
-                "message": "No videos available for this course."
-            }), 200
-
-        now = datetime.now()
-        filtered_videos: list[dict] = []
-        for video in results:
-            added_at = video.get("added_at")
-            expire_days = video.get("video_expire_days") or 0
-
-            if added_at is None:
-                filtered_videos.append(video)
-                continue
-
-            expiry_date = added_at + timedelta(days=expire_days)
-            if expiry_date >= now:
-                filtered_videos.append(video)
-
-        if not filtered_videos:
-            return jsonify({
+            return validator.apply(jsonify({
                 "success": True,
                 "message": "No active videos available for this course."
-            }), 200
+            })), 200
 
-        return jsonify({
+        return validator.apply(jsonify({
             "success": True,
-            "data": filtered_videos
-        }), 200
+            "data": results
+        })), 200
 
-    except mysql.connector.Error as exc:
+    except UNAVAILABLE_ERRORS:
+        raise
+    except QueryTimeoutError as exc:
+        return budget_exceeded_response(exc)
+    except DatabaseError as exc:
         return jsonify({
             "success": False,
             "message": str(exc)
@@ -75,19 +62,25 @@ def get_videos_for_student(email: str, course_id: int):
 
 @videos_bp.get("/all-videos")
 @check_admin_role
+@query_budget
 def get_all_videos():
-    """GET: get all videos (admin) with optional courseId filter."""
+    """GET: get all videos (admin) with optional courseId filter, paginated by video_id."""
     course_id = request.args.get("courseId")
 
-    sql = f"SELECT * FROM {VIDEO_TABLE}"
-    params: list = []
-
-    if course_id:
-        sql += " WHERE course_id = %s"
-        params.append(course_id)
+    try:
+        page = parse_page_request(request.args, "video_id", VIDEO_COLUMNS)
+    except PaginationError as exc:
+        return jsonify({
+            "success": False,
+            "message": str(exc)
+        }), 400
 
     try:
-        results = execute_query(sql, tuple(params) if params else None)
+        if wants_stream(request.args):
+            rows = repository.stream_videos(page.select_list, course_id, page.after)
+            return stream_json_response(rows), 200
+
+        results = repository.list_videos(page.select_list, course_id, page.after, page.limit + 1)
 
         if not results:
             return jsonify({
@@ -95,12 +88,18 @@ def get_all_videos():
                 "message": "No videos found."
             }), 200
 
+        results, next_cursor = split_page(results, page)
         return jsonify({
             "success": True,
-            "data": results
+            "data": results,
+            "next_cursor": next_cursor
         }), 200
 
-    except mysql.connector.Error as exc:
+    except UNAVAILABLE_ERRORS:
+        raise
+    except QueryTimeoutError as exc:
+        return budget_exceeded_response(exc)
+    except DatabaseError as exc:
         return jsonify({
             "success": False,
             "message": str(exc)
@@ -128,57 +127,159 @@ def add_video():
             "message": "courseId, title, and youtubeURL are required"
         }), 400
 
-    sql_course = f"SELECT course_id FROM {COURSE_TABLE} WHERE course_id = %s"
-
+    connection = Database.get_connection()
     try:
-        course_results = execute_query(sql_course, (course_id,))
-        if not course_results:
+        # Inserts nothing when the course does not exist
+        if not repository.add_video(connection, course_id, title, youtube_url, description):
+            connection.rollback()
             return jsonify({
                 "success": False,
                 "message": f"No course found with Id: {course_id}"
             }), 404
 
-        insert_video_sql = f"""
-            INSERT INTO {VIDEO_TABLE} (course_id, title, youtube_url, description)
-            VALUES (%s, %s, %s, %s)
-        """
+        connection.commit()
+        table_versions.bump(VIDEO_TABLE)
+        return jsonify({
+            "success": True,
+            "message": "Video added successfully."
+        }), 200
 
-        connection = Database.get_connection()
+    except DatabaseError as exc:
+        connection.rollback()
+        return jsonify({
+            "success": False,
+            "message": str(exc)
+        }), 400
+    except Exception as exc:
+        connection.rollback()
+        return jsonify({
+            "success": False,
+            "message": str(exc)
+        }), 500
+    finally:
+        connection.close()
+
+
+def _normalize_bulk_video(raw) -> dict:
+    if not isinstance(raw, dict):
+        raw = {}
+    course_id = raw.get("courseId") or raw.get("course_id")
+    video_id = raw.get("videoId") or raw.get("video_id")
+    return {
+        "video_id": video_id,
+        "course_id": course_id,
+        "title": raw.get("title"),
+        "description": raw.get("description"),
+        "youtube_url": raw.get("youtubeURL") or raw.get("youtube_url"),
+    }
+
+
+@videos_bp.post("/bulk")
+@check_admin_role
+def bulk_upsert_videos():
+    """POST: add or update many videos in one transaction (items with videoId are updates)."""
+    payload = request.get_json(silent=True)
+    if isinstance(payload, dict):
+        payload = payload.get("videos")
+    if not isinstance(payload, list) or not payload:
+        return jsonify({
+            "success": False,
+            "message": "Expected a non-empty JSON array of videos"
+        }), 400
+
+    if len(payload) > settings.bulk_max_rows:
+        return jsonify({
+            "success": False,
+            "message": f"At most {settings.bulk_max_rows} videos can be uploaded per request"
+        }), 400
+
+    videos = [_normalize_bulk_video(raw) for raw in payload]
+    errors: list[dict] = []
+    for number, video in enumerate(videos, start=1):
+        ok, missing = require_fields(video, ["course_id", "title", "youtube_url"])
+        if not ok:
+            errors.append({"row": number, "message": f"Missing fields: {', '.join(missing)}"})
+            continue
         try:
-            with connection.cursor() as cursor:
-                cursor.execute(insert_video_sql, (course_id, title, youtube_url, description))
-                if cursor.rowcount == 0:
-                    connection.rollback()
-                    return jsonify({
-                        "success": False,
-                        "message": "Something went wrong while adding the video."
-                    }), 400
+            video["course_id"] = int(video["course_id"])
+            if video["video_id"] is not None:
+                video["video_id"] = int(video["video_id"])
+        except (TypeError, ValueError):
+            errors.append({"row": number, "message": "courseId and videoId must be integers"})
 
-            connection.commit()
-            return jsonify({
-                "success": True,
-                "message": "Video added successfully."
-            }), 200
+    if errors:
+        return jsonify({
+            "success": False,
+            "message": "Validation failed; no videos were saved.",
+            "data": {"errors": errors}
+        }), 400
 
-        except mysql.connector.Error as exc:
+    course_ids = sorted({video["course_id"] for video in videos})
+    video_ids = sorted({video["video_id"] for video in videos if video["video_id"] is not None})
+
+    connection = Database.get_connection()
+    try:
+        # One round trip validates every course and fetches the DB clock
+        courses = repository.course_expiry_windows(connection, course_ids)
+        existing_videos = repository.existing_video_ids(connection, video_ids)
+
+        for number, video in enumerate(videos, start=1):
+            if video["course_id"] not in courses:
+                errors.append({"row": number, "message": f"No course found with Id: {video['course_id']}"})
+            elif video["video_id"] is not None and video["video_id"] not in existing_videos:
+                errors.append({"row": number, "message": f"No video found with Id: {video['video_id']}"})
+
+        if errors:
             connection.rollback()
             return jsonify({
                 "success": False,
-                "message": str(exc)
-            }), 400
-        finally:
-            connection.close()
+                "message": "Validation failed; no videos were saved.",
+                "data": {"errors": errors}
+            }), 404
+
+        inserts = []
+        updates = []
+        for video in videos:
+            course = courses[video["course_id"]]
+            expire_days = course["video_expire_days"] or 0
+            if video["video_id"] is None:
+                added_at = course["db_now"]
+                inserts.append((
+                    video["course_id"], video["title"], video["youtube_url"], video["description"],
+                    added_at, added_at + timedelta(days=expire_days)
+                ))
+            else:
+                updates.append((
+                    video["course_id"], video["title"], video["youtube_url"], video["description"],
+                    expire_days, video["video_id"]
+                ))
+
+        if inserts:
+            repository.insert_videos(connection, inserts)
+        if updates:
+            repository.update_videos(connection, updates)
 
-    except mysql.connector.Error as exc:
+        connection.commit()
+        table_versions.bump(VIDEO_TABLE)
+        return jsonify({
+            "success": True,
+            "message": f"{len(inserts)} videos added, {len(updates)} videos updated."
+        }), 200
+
+    except DatabaseError as exc:
+        connection.rollback()
         return jsonify({
             "success": False,
             "message": str(exc)
         }), 400
     except Exception as exc:
+        connection.rollback()
         return jsonify({
             "success": False,
             "message": str(exc)
         }), 500
+    finally:
+        connection.close()
 
 
 @videos_bp.put("/update/<int:video_id>")
@@ -197,40 +298,37 @@ def update_video(video_id: int):
             "message": "courseId, title, and youtubeURL are required"
         }), 400
 
-    sql_course = f"SELECT course_id FROM {COURSE_TABLE} WHERE course_id = %s"
-
     try:
-        course_results = execute_query(sql_course, (course_id,))
-        if not course_results:
+        course = repository.get_course_expiry(course_id)
+        if not course:
             return jsonify({
                 "success": False,
                 "message": f"No course found with Id: {course_id}"
             }), 404
 
-        update_video_sql = f"""
-            UPDATE {VIDEO_TABLE}
-            SET course_id = %s, title = %s, youtube_url = %s, description = %s
-            WHERE video_id = %s
-        """
+        # The video may move to a course with a different expiry window.
+        expire_days = course.get("video_expire_days") or 0
 
         connection = Database.get_connection()
         try:
-            with connection.cursor() as cursor:
-                cursor.execute(update_video_sql, (course_id, title, youtube_url, description, video_id))
-                if cursor.rowcount == 0:
-                    connection.rollback()
-                    return jsonify({
-                        "success": False,
-                        "message": f"No video found with Id: {video_id}"
-                    }), 404
+            found = repository.update_video(
+                connection, video_id, course_id, title, youtube_url, description, expire_days
+            )
+            if not found:
+                connection.rollback()
+                return jsonify({
+                    "success": False,
+                    "message": f"No video found with Id: {video_id}"
+                }), 404
 
             connection.commit()
+            table_versions.bump(VIDEO_TABLE)
             return jsonify({
                 "success": True,
                 "message": "Video updated successfully."
             }), 200
 
-        except mysql.connector.Error as exc:
+        except DatabaseError as exc:
             connection.rollback()
             return jsonify({
                 "success": False,
@@ -239,7 +337,9 @@ def update_video(video_id: int):
         finally:
             connection.close()
 
-    except mysql.connector.Error as exc:
+    except UNAVAILABLE_ERRORS:
+        raise
+    except DatabaseError as exc:
         return jsonify({
             "success": False,
             "message": str(exc)
@@ -255,26 +355,23 @@ def update_video(video_id: int):
 @check_admin_role
 def delete_video(video_id: int):
     """DELETE: delete a video of a course by videoId."""
-    delete_video_sql = f"DELETE FROM {VIDEO_TABLE} WHERE video_id = %s"
-
     connection = Database.get_connection()
     try:
-        with connection.cursor() as cursor:
-            cursor.execute(delete_video_sql, (video_id,))
-            if cursor.rowcount == 0:
-                connection.rollback()
-                return jsonify({
-                    "success": False,
-                    "message": f"No video found with Id: {video_id}"
-                }), 404
+        if not repository.delete_video(connection, video_id):
+            connection.rollback()
+            return jsonify({
+                "success": False,
+                "message": f"No video found with Id: {video_id}"
+            }), 404
 
         connection.commit()
+        table_versions.bump(VIDEO_TABLE)
         return jsonify({
             "success": True,
             "message": "Video deleted successfully."
         }), 200
 
-    except mysql.connector.Error as exc:
+    except DatabaseError as exc:
         connection.rollback()
         return jsonify({
             "success": False,
@@ -0,0 +1,199 @@
+"""Production launcher: gunicorn (POSIX) or waitress (Windows) sized from Settings.
+
+Each server thread holds at most one DB connection at a time, so every worker
+gets a pool exactly as large as its thread count, and workers x threads is
+kept within ``SERVER_DB_CONNECTION_BUDGET`` so the fleet cannot open more
+connections than MySQL is provisioned for.
+
+    python -m backend.server            # serve
+    python -m backend.server plan       # print the computed sizing as JSON
+    python -m backend.server reload     # graceful reload (gunicorn, needs SERVER_PIDFILE)
+
+The app is preloaded in the gunicorn master, so a plain SIGHUP would fork new
+workers from the old code. ``reload`` instead has the master re-exec itself
+(USR2), then gracefully stops the old master once the new one is up.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from dataclasses import asdict, dataclass
+
+from backend.config.settings import settings
+from backend.db import Database
+
+DEFAULT_THREADS_PER_WORKER = 8
+
+
+@dataclass(frozen=True)
+class ServerPlan:
+    backend: str
+    workers: int
+    threads: int
+    db_pool_min_size: int
+    db_pool_max_size: int
+
+    @property
+    def db_connections(self) -> int:
+        return self.workers * self.db_pool_max_size
+
+
+def _resolve_backend() -> str:
+    if settings.server_backend != "auto":
+        return settings.server_backend
+    if os.name == "nt":
+        return "waitress"
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        return "waitress"
+    return "gunicorn"
+
+
+def plan(cpu_count: int | None = None) -> ServerPlan:
+    """Work out workers, threads and per-worker pool size for this machine."""
+    backend = _resolve_backend()
+    cpus = cpu_count or os.cpu_count() or 1
+    budget = max(1, settings.server_db_connection_budget)
+
+    # One process per CPU sidesteps the GIL; waitress is single-process.
+    workers = 1 if backend == "waitress" else settings.server_workers or cpus
+    workers = min(workers, budget)
+    threads = settings.server_threads or DEFAULT_THREADS_PER_WORKER
+    threads = max(1, min(threads, budget // workers))
+
+    return ServerPlan(
+        backend=backend,
+        workers=workers,
+        threads=threads,
+        db_pool_min_size=min(settings.db_pool_min_size, threads),
+        db_pool_max_size=threads,
+    )
+
+
+def _post_fork(server, worker) -> None:
+    # The preloaded app may have opened connections in the master; never share them.
+    Database.reset()
+
+
+def gunicorn_options(server_plan: ServerPlan) -> dict:
+    options = {
+        "bind": f"{settings.server_host}:{settings.server_port}",
+        "workers": server_plan.workers,
+        "threads": server_plan.threads,
+        "worker_class": "gthread",
+        # Import the app once in the master; workers share it copy-on-write.
+        "preload_app": True,
+        "timeout": settings.server_timeout,
+        "graceful_timeout": settings.server_graceful_timeout,
+        "keepalive": 5,
+        "accesslog": "-",
+        "post_fork": _post_fork,
+    }
+    if settings.server_pidfile:
+        options["pidfile"] = settings.server_pidfile
+    return options
+
+
+def _load_app(server_plan: ServerPlan):
+    Database.configure(min_size=server_plan.db_pool_min_size, max_size=server_plan.db_pool_max_size)
+    from backend.app import app
+    return app
+
+
+def run_gunicorn(server_plan: ServerPlan) -> None:
+    from gunicorn.app.base import BaseApplication
+    from gunicorn.arbiter import Arbiter
+
+    class Application(BaseApplication):
+        def load_config(self):
+            for key, value in gunicorn_options(server_plan).items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return _load_app(server_plan)
+
+    arbiter = Arbiter(Application())
+    # USR2 re-execs the master from START_CTX; sys.argv[0] is this file's path
+    # under ``python -m``, so restart it as a module to keep ``backend`` importable.
+    arbiter.START_CTX["args"] = [sys.executable, "-m", "backend.server", *sys.argv[1:]]
+    arbiter.run()
+
+
+def run_waitress(server_plan: ServerPlan) -> None:
+    from waitress import serve
+
+    serve(
+        _load_app(server_plan),
+        host=settings.server_host,
+        port=settings.server_port,
+        threads=server_plan.threads,
+        channel_timeout=settings.server_timeout,
+    )
+
+
+def _read_pid(path: str) -> int | None:
+    try:
+        with open(path) as pidfile:
+            return int(pidfile.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def reload() -> None:
+    """Start a new gunicorn master on the current code, then retire the old one gracefully.
+
+    USR2 makes the master re-exec itself: the old master moves its pidfile to
+    ``<pidfile>.oldbin`` and the new one, sharing the listening sockets,
+    writes ``<pidfile>.2`` until it takes over the pidfile once the old master
+    is gone. TERM then lets the old workers finish their in-flight requests
+    within ``SERVER_GRACEFUL_TIMEOUT``.
+    """
+    if not settings.server_pidfile:
+        raise SystemExit("Set SERVER_PIDFILE to use reload")
+    old_pid = _read_pid(settings.server_pidfile)
+    if old_pid is None:
+        raise SystemExit(f"No gunicorn master pid in {settings.server_pidfile}")
+    os.kill(old_pid, signal.SIGUSR2)
+
+    deadline = time.monotonic() + settings.server_timeout
+    while time.monotonic() < deadline:
+        new_pid = _read_pid(f"{settings.server_pidfile}.2") or _read_pid(settings.server_pidfile)
+        if new_pid is not None and new_pid != old_pid:
+            os.kill(old_pid, signal.SIGTERM)
+            return
+        time.sleep(0.2)
+    raise SystemExit(
+        f"The new master did not start within {settings.server_timeout}s; "
+        f"the old master (pid {old_pid}) is still serving"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the Sunbeam API with a production server")
+    parser.add_argument("command", nargs="?", default="serve", choices=("serve", "plan", "reload"))
+    args = parser.parse_args()
+
+    if args.command == "reload":
+        reload()
+        return
+
+    server_plan = plan()
+    if args.command == "plan":
+        print(json.dumps({**asdict(server_plan), "db_connections": server_plan.db_connections}, indent=2))
+        return
+
+    if server_plan.backend == "gunicorn":
+        run_gunicorn(server_plan)
+    elif server_plan.backend == "waitress":
+        run_waitress(server_plan)
+    else:
+        raise SystemExit(f"Unknown server backend: {server_plan.backend}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,30 @@
-from .password import hash_password_sha256, verify_password_sha256
-from .jwt_helper import create_access_token, decode_token
+from .password import (
+    PasswordHasherBusy,
+    hash_password,
+    hash_password_sha256,
+    needs_rehash,
+    verify_password,
+    verify_password_sha256,
+)
+from .jwt_helper import (
+    create_access_token,
+    create_refresh_token,
+    decode_refresh_token,
+    decode_token,
+    decode_token_cached,
+)
 
 __all__ = [
+    "PasswordHasherBusy",
+    "hash_password",
     "hash_password_sha256",
+    "needs_rehash",
+    "verify_password",
     "verify_password_sha256",
     "create_access_token",
+    "create_refresh_token",
+    "decode_refresh_token",
     "decode_token",
+    "decode_token_cached",
 ]
 
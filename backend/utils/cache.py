@@ -0,0 +1,183 @@
+"""Read-through caching with an in-process LRU/TTL store and pluggable backends."""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from backend.config.settings import settings
+from backend.utils.metrics import counter
+
+MISSING = object()
+
+CACHE_HITS = counter("cache_hits_total", "Cache lookups served from the cache", ("cache",))
+CACHE_MISSES = counter("cache_misses_total", "Cache lookups that fell through to the loader", ("cache",))
+CACHE_STALE = counter("cache_stale_served_total", "Stale entries served because the loader was unavailable", ("cache",))
+
+
+class CacheBackend:
+    """Storage interface behind :class:`Cache`.
+
+    Subclass and register with :func:`register_backend` to share entries
+    between processes (e.g. Redis or memcached). ``get`` returns ``MISSING``
+    when the key is absent or expired.
+    """
+
+    def get(self, key: str) -> Any:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """Thread-safe LRU store whose entries also expire after their TTL."""
+
+    def __init__(self, namespace: str, max_entries: int) -> None:
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+BackendFactory = Callable[[str, int], CacheBackend]
+
+_backends: Dict[str, BackendFactory] = {"memory": MemoryCache}
+
+
+def register_backend(name: str, factory: BackendFactory) -> None:
+    """Make ``factory(namespace, max_entries)`` selectable via ``CACHE_BACKEND``."""
+    _backends[name] = factory
+
+
+class Cache:
+    """A named cache namespace with read-through helpers and hit/miss counters.
+
+    Unless ``backend`` is given, it is resolved from ``CACHE_BACKEND`` on first
+    use, so backends registered after import (but before the first request)
+    are honoured.
+
+    With ``keep_stale``, every stored value is also kept for
+    ``CACHE_STALE_SECONDS`` in a ``<namespace>:stale`` store that survives
+    expiry and invalidation; ``get_stale`` reads it when the loader cannot run.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: float | None = None,
+        backend: CacheBackend | None = None,
+        keep_stale: bool = False,
+    ) -> None:
+        self.namespace = namespace
+        self.ttl = settings.cache_ttl_seconds if ttl is None else ttl
+        self._backend = backend
+        self.keep_stale = keep_stale
+        self._stale_backend: CacheBackend | None = None
+        # Bumped on every invalidation so loads that raced a write are not stored.
+        self._generation = 0
+
+    @staticmethod
+    def _create_backend(namespace: str) -> CacheBackend:
+        factory = _backends.get(settings.cache_backend)
+        if factory is None:
+            raise ValueError(f"Unknown cache backend: {settings.cache_backend}")
+        return factory(namespace, settings.cache_max_entries)
+
+    @property
+    def backend(self) -> CacheBackend:
+        if self._backend is None:
+            self._backend = self._create_backend(self.namespace)
+        return self._backend
+
+    @property
+    def stale_backend(self) -> CacheBackend:
+        if self._stale_backend is None:
+            self._stale_backend = self._create_backend(f"{self.namespace}:stale")
+        return self._stale_backend
+
+    def get(self, key: str) -> Any:
+        value = self.backend.get(key)
+        if value is MISSING:
+            CACHE_MISSES.inc(cache=self.namespace)
+        else:
+            CACHE_HITS.inc(cache=self.namespace)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        self.backend.set(key, value, self.ttl if ttl is None else ttl)
+        if self.keep_stale:
+            self.stale_backend.set(key, value, settings.cache_stale_seconds)
+
+    def get_stale(self, key: str) -> Any:
+        """The last value stored under ``key``, even if expired or invalidated (``MISSING`` if none)."""
+        if not self.keep_stale:
+            return MISSING
+        value = self.stale_backend.get(key)
+        if value is not MISSING:
+            CACHE_STALE.inc(cache=self.namespace)
+        return value
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is MISSING:
+            generation = self._generation
+            value = loader()
+            if generation == self._generation:
+                self.set(key, value)
+        return value
+
+    async def get_or_load_async(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """``get_or_load`` for coroutine loaders (async serving mode)."""
+        value = self.get(key)
+        if value is MISSING:
+            generation = self._generation
+            value = await loader()
+            if generation == self._generation:
+                self.set(key, value)
+        return value
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Drop ``key``, or the whole namespace when no key is given."""
+        self._generation += 1
+        if key is None:
+            self.backend.clear()
+        else:
+            self.backend.delete(key)
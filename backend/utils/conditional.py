@@ -0,0 +1,84 @@
+"""Conditional GET support (ETag / Last-Modified / 304) driven by table versions."""
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable
+
+from flask import Response
+
+from backend.config.settings import settings
+
+
+class TableVersions:
+    """Per-table write counters bumped by the handlers that modify each table."""
+
+    def __init__(self) -> None:
+        self._versions: Dict[str, int] = {}
+        self._modified: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def bump(self, *tables: str) -> None:
+        now = time.time()
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+                self._modified[table] = now
+
+    def snapshot(self, tables: Iterable[str]) -> tuple[tuple[int, ...], float]:
+        with self._lock:
+            versions = tuple(self._versions.get(table, 0) for table in tables)
+            modified = max((self._modified.get(table, 0.0) for table in tables), default=0.0)
+        return versions, modified
+
+
+table_versions = TableVersions()
+
+
+class Validator:
+    """ETag and Last-Modified for one representation, plus the freshness check."""
+
+    def __init__(self, etag: str, last_modified: datetime, cache_control: str) -> None:
+        self.etag = etag
+        self.last_modified = last_modified
+        self.cache_control = cache_control
+
+    def is_fresh(self, request) -> bool:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2).
+        if request.if_none_match:
+            return request.if_none_match.contains_weak(self.etag)
+        if request.if_modified_since is not None:
+            return self.last_modified <= request.if_modified_since
+        return False
+
+    def apply(self, response: Response) -> Response:
+        response.set_etag(self.etag)
+        response.last_modified = self.last_modified
+        response.headers["Cache-Control"] = self.cache_control
+        return response
+
+    def not_modified(self, response_class: type[Response] = Response) -> Response:
+        return self.apply(response_class(status=304))
+
+
+def make_validator(tables: Iterable[str], *scope, private: bool = False) -> Validator:
+    """Build a validator from the versions of ``tables`` and the request ``scope``.
+
+    Counters live in this process only, so the validator also rolls over every
+    ``CONDITIONAL_GET_WINDOW_SECONDS``: writes handled by another worker (and
+    time-based changes such as video expiry) are picked up within that window.
+    """
+    tables = tuple(tables)
+    versions, modified = table_versions.snapshot(tables)
+    window = max(1, settings.conditional_get_window_seconds)
+    bucket = int(time.time() // window)
+    # Round writes up so a write inside the second a client last fetched still counts.
+    last_modified = max(math.ceil(modified), bucket * window)
+
+    raw = "|".join([*tables, *map(str, versions), *map(str, scope), str(bucket)])
+    etag = hashlib.sha1(raw.encode()).hexdigest()[:20]
+    cache_control = "private, no-cache" if private else "no-cache"
+    return Validator(etag, datetime.fromtimestamp(last_modified, tz=timezone.utc), cache_control)
@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+import hashlib
+import time
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict
 
 import jwt
 
 from backend.config.settings import settings
+from backend.utils.cache import MISSING, Cache, MemoryCache
+from backend.utils.metrics import gauge
+
+
+# Verified claims keyed by token digest; always in-process since the point is
+# to skip signature checks, not to trade them for a network round trip.
+_verified_store = MemoryCache("verified_tokens", settings.token_cache_size)
+_verified_tokens = Cache("verified_tokens", backend=_verified_store)
+gauge("token_cache_entries", "Verified tokens held in the decode cache", callback=lambda: len(_verified_store))
 
 
 def create_access_token(subject: str, additional_claims: Dict[str, Any] | None = None) -> str:
@@ -19,6 +31,54 @@ def create_access_token(subject: str, additional_claims: Dict[str, Any] | None =
     return jwt.encode(payload, settings.secret_key, algorithm=settings.jwt_algorithm)
 
 
+def create_refresh_token(subject: str, family_id: str | None = None) -> tuple[str, Dict[str, Any]]:
+    """Mint a refresh token and return it with its claims.
+
+    ``jti`` is the row key in ``refresh_tokens``; ``fam`` groups every token
+    rotated from the same login so reuse of a spent token can revoke them all.
+    """
+    now = datetime.now(tz=timezone.utc)
+    claims: Dict[str, Any] = {
+        "sub": subject,
+        "type": "refresh",
+        "jti": uuid.uuid4().hex,
+        "fam": family_id or uuid.uuid4().hex,
+        "iat": now,
+        "exp": now + timedelta(days=settings.refresh_token_expiration_days),
+    }
+    return jwt.encode(claims, settings.secret_key, algorithm=settings.jwt_algorithm), claims
+
+
 def decode_token(token: str) -> Dict[str, Any]:
     return jwt.decode(token, settings.secret_key, algorithms=[settings.jwt_algorithm])
 
+
+def decode_refresh_token(token: str) -> Dict[str, Any]:
+    claims = decode_token(token)
+    if claims.get("type") != "refresh" or not claims.get("jti") or not claims.get("fam"):
+        raise jwt.InvalidTokenError("Not a refresh token")
+    return claims
+
+
+def decode_token_cached(token: str) -> Dict[str, Any]:
+    """``decode_token`` backed by an LRU of already-verified tokens.
+
+    Entries live until the token's ``exp`` and expiry is re-checked on every
+    hit, so a cached token is rejected at exactly the moment PyJWT would.
+    Callers must treat the returned claims as read-only.
+    """
+    key = hashlib.sha256(token.encode()).hexdigest()
+    claims = _verified_tokens.get(key)
+    if claims is not MISSING:
+        if claims["exp"] <= time.time():
+            _verified_tokens.invalidate(key)
+            raise jwt.ExpiredSignatureError("Signature has expired")
+        return claims
+
+    claims = decode_token(token)
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        ttl = exp - time.time()
+        if ttl > 0:
+            _verified_tokens.set(key, claims, ttl)
+    return claims
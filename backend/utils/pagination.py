@@ -0,0 +1,84 @@
+"""Keyset pagination and column projection for list endpoints."""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Mapping, Sequence
+
+from backend.config.settings import settings
+
+
+class PaginationError(ValueError):
+    """Raised for malformed ``limit``/``cursor``/``fields`` query parameters."""
+
+
+@dataclass(frozen=True)
+class PageRequest:
+    key: str
+    limit: int
+    after: int | None
+    columns: tuple[str, ...]
+
+    @property
+    def select_list(self) -> str:
+        return ", ".join(self.columns)
+
+
+def encode_cursor(last_key: int) -> str:
+    raw = json.dumps({"after": last_key}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        after = json.loads(base64.urlsafe_b64decode(padded.encode()))["after"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+        raise PaginationError("Invalid cursor") from exc
+    if not isinstance(after, int):
+        raise PaginationError("Invalid cursor")
+    return after
+
+
+def parse_page_request(args: Mapping[str, str], key: str, columns: Sequence[str]) -> PageRequest:
+    """Read ``limit``, ``cursor`` and ``fields`` from the query string.
+
+    ``fields`` is a comma-separated subset of ``columns``; the key column is
+    always included so the next cursor can be computed.
+    """
+    raw_limit = args.get("limit")
+    if raw_limit is None or raw_limit == "":
+        limit = settings.page_size_default
+    else:
+        try:
+            limit = int(raw_limit)
+        except ValueError as exc:
+            raise PaginationError("limit must be an integer") from exc
+        if limit < 1:
+            raise PaginationError("limit must be at least 1")
+        limit = min(limit, settings.page_size_max)
+
+    cursor = args.get("cursor")
+    after = decode_cursor(cursor) if cursor else None
+
+    fields = args.get("fields")
+    if fields:
+        requested = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in requested if field not in columns]
+        if unknown:
+            raise PaginationError(f"Unknown fields: {', '.join(unknown)}")
+        selected = tuple(dict.fromkeys([key, *requested]))
+    else:
+        selected = tuple(columns)
+
+    return PageRequest(key=key, limit=limit, after=after, columns=selected)
+
+
+def split_page(rows: list[dict], page: PageRequest) -> tuple[list[dict], str | None]:
+    """Trim the look-ahead row fetched with ``LIMIT limit + 1`` and build the next cursor."""
+    if len(rows) <= page.limit:
+        return rows, None
+    rows = rows[:page.limit]
+    return rows, encode_cursor(rows[-1][page.key])
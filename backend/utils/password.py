@@ -1,4 +1,33 @@
+"""Password hashing with tunable KDFs.
+
+Stored hashes carry an algorithm prefix (``scrypt$...`` or ``pbkdf2_sha256$...``)
+so the cost can be raised over time. Bare 64-character hex digests are the
+legacy unsalted SHA-256 format; they still verify, and ``needs_rehash`` flags
+them (and hashes made with outdated parameters) for upgrade on next login.
+
+KDF work runs on a small dedicated thread pool so a burst of logins is capped
+at ``PASSWORD_HASH_WORKERS`` CPUs instead of competing with every request thread.
+"""
+from __future__ import annotations
+
+import base64
 import hashlib
+import hmac
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, TypeVar
+
+from backend.config.settings import settings
+
+T = TypeVar("T")
+
+_LEGACY_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when too many hashing jobs are already queued."""
 
 
 def hash_password_sha256(raw_password: str) -> str:
@@ -8,5 +37,136 @@ def hash_password_sha256(raw_password: str) -> str:
 
 def verify_password_sha256(raw_password: str, hashed_password: str) -> bool:
     """Verify password using SHA256"""
-    return hash_password_sha256(raw_password) == hashed_password
+    return hmac.compare_digest(hash_password_sha256(raw_password), hashed_password)
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode().rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+class PasswordHasher:
+    algorithm = ""
+
+    def encode(self, raw_password: str) -> str:
+        raise NotImplementedError
+
+    def verify(self, raw_password: str, encoded: str) -> bool:
+        raise NotImplementedError
+
+    def is_current(self, encoded: str) -> bool:
+        """Whether ``encoded`` was made with this hasher's current parameters."""
+        raise NotImplementedError
+
+
+class ScryptHasher(PasswordHasher):
+    algorithm = "scrypt"
+
+    def __init__(self, n: int, r: int, p: int) -> None:
+        self.n, self.r, self.p = n, r, p
+
+    @staticmethod
+    def _derive(raw_password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+        return hashlib.scrypt(
+            raw_password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r * p, dklen=32
+        )
+
+    def encode(self, raw_password: str) -> str:
+        salt = os.urandom(16)
+        digest = self._derive(raw_password, salt, self.n, self.r, self.p)
+        return f"{self.algorithm}${self.n}${self.r}${self.p}${_b64encode(salt)}${_b64encode(digest)}"
+
+    def verify(self, raw_password: str, encoded: str) -> bool:
+        _, n, r, p, salt, digest = encoded.split("$")
+        candidate = self._derive(raw_password, _b64decode(salt), int(n), int(r), int(p))
+        return hmac.compare_digest(candidate, _b64decode(digest))
+
+    def is_current(self, encoded: str) -> bool:
+        return encoded.split("$")[1:4] == [str(self.n), str(self.r), str(self.p)]
+
+
+class PBKDF2Hasher(PasswordHasher):
+    algorithm = "pbkdf2_sha256"
+
+    def __init__(self, iterations: int) -> None:
+        self.iterations = iterations
+
+    @staticmethod
+    def _derive(raw_password: str, salt: bytes, iterations: int) -> bytes:
+        return hashlib.pbkdf2_hmac("sha256", raw_password.encode(), salt, iterations)
+
+    def encode(self, raw_password: str) -> str:
+        salt = os.urandom(16)
+        digest = self._derive(raw_password, salt, self.iterations)
+        return f"{self.algorithm}${self.iterations}${_b64encode(salt)}${_b64encode(digest)}"
+
+    def verify(self, raw_password: str, encoded: str) -> bool:
+        _, iterations, salt, digest = encoded.split("$")
+        candidate = self._derive(raw_password, _b64decode(salt), int(iterations))
+        return hmac.compare_digest(candidate, _b64decode(digest))
+
+    def is_current(self, encoded: str) -> bool:
+        return encoded.split("$")[1] == str(self.iterations)
+
+
+_hashers: Dict[str, PasswordHasher] = {
+    ScryptHasher.algorithm: ScryptHasher(settings.scrypt_n, settings.scrypt_r, settings.scrypt_p),
+    PBKDF2Hasher.algorithm: PBKDF2Hasher(settings.pbkdf2_iterations),
+}
+
+
+def register_hasher(hasher: PasswordHasher) -> None:
+    """Make ``hasher`` available for verification and selectable via ``PASSWORD_HASHER``."""
+    _hashers[hasher.algorithm] = hasher
+
+
+def _default_hasher() -> PasswordHasher:
+    try:
+        return _hashers[settings.password_hasher]
+    except KeyError:
+        raise ValueError(f"Unknown password hasher: {settings.password_hasher}") from None
+
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers, thread_name_prefix="password-hash"
+)
+_pending = threading.BoundedSemaphore(settings.password_hash_max_pending)
+
+
+def _run(fn: Callable[..., T], *args) -> T:
+    """Run ``fn`` on the hashing pool, refusing work once the backlog is full."""
+    if not _pending.acquire(timeout=settings.password_hash_queue_timeout):
+        raise PasswordHasherBusy("Too many password hashing requests in progress")
+    try:
+        return _executor.submit(fn, *args).result()
+    finally:
+        _pending.release()
+
+
+def hash_password(raw_password: str) -> str:
+    """Hash with the configured KDF (``PASSWORD_HASHER``) on the hashing pool."""
+    return _run(_default_hasher().encode, raw_password)
+
+
+def verify_password(raw_password: str, encoded: str) -> bool:
+    """Check ``raw_password`` against any supported stored format."""
+    if _LEGACY_SHA256.match(encoded):
+        return verify_password_sha256(raw_password, encoded)
+    hasher = _hashers.get(encoded.split("$", 1)[0])
+    if hasher is None:
+        return False
+    try:
+        return _run(hasher.verify, raw_password, encoded)
+    except ValueError:
+        # Malformed stored hash
+        return False
+
 
+def needs_rehash(encoded: str) -> bool:
+    hasher = _default_hasher()
+    if not encoded.startswith(hasher.algorithm + "$"):
+        return True
+    return not hasher.is_current(encoded)
@@ -0,0 +1,48 @@
+"""Incremental JSON encoding for large list responses."""
+from __future__ import annotations
+
+from typing import Iterable, Iterator, Mapping
+
+from flask import Response, current_app
+
+from backend.config.settings import settings
+
+_TRUTHY = {"1", "true", "yes", "on"}
+
+
+def wants_stream(args: Mapping[str, str]) -> bool:
+    return (args.get("stream") or "").lower() in _TRUTHY
+
+
+def stream_json_response(rows: Iterable[dict], batch_size: int | None = None) -> Response:
+    """Stream ``{"success": true, "data": [...]}`` one batch of rows at a time.
+
+    The first row is pulled before the response is built so connection and
+    query errors still surface to the caller's ``except`` blocks; anything
+    failing after that can only truncate the body.
+    """
+    dumps = current_app.json.dumps
+    batch_size = batch_size or settings.stream_batch_size
+    rows = iter(rows)
+    first = next(rows, None)
+
+    def generate() -> Iterator[str]:
+        try:
+            yield '{"success": true, "data": ['
+            if first is not None:
+                chunk, separator = [dumps(first)], ""
+                for row in rows:
+                    chunk.append(dumps(row))
+                    if len(chunk) >= batch_size:
+                        yield separator + ",".join(chunk)
+                        chunk, separator = [], ","
+                if chunk:
+                    yield separator + ",".join(chunk)
+            yield "]}"
+        finally:
+            # Release the query's connection promptly if the client disconnects.
+            close = getattr(rows, "close", None)
+            if close is not None:
+                close()
+
+    return Response(generate(), mimetype="application/json")
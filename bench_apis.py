@@ -0,0 +1,333 @@
+"""Benchmark harness for the hot API endpoints.
+
+Seeds courses, videos and enrollments through the API (so it works against
+any backend the server is configured for), drives each endpoint with
+concurrent clients, and reports latency percentiles, throughput and pool
+checkout wait as JSON.
+
+    python bench_apis.py                               # start the app in-process
+    python bench_apis.py --url http://127.0.0.1:5000   # benchmark a running server
+    python bench_apis.py --courses 50 --videos-per-course 200 --students 2000 --clients 32 --duration 20
+
+Student tokens are minted locally, so the server must share this process's
+SECRET_KEY. Pool wait numbers come from /metrics and only cover the process
+that answers the scrape; run the server with one worker when they matter.
+"""
+import argparse
+import json
+import logging
+import math
+import random
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from test_apis import fetch_all_pages, make_request
+
+DEFAULT_SCENARIOS = ("active_courses", "all_courses", "all_videos", "student_videos")
+METRIC_LINE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})?\s+(\S+)$')
+
+
+# ---------------------- SERVER ----------------------
+
+def start_local_server():
+    """Serve the Flask app on an ephemeral port in a background thread; returns (base_url, server)."""
+    from werkzeug.serving import make_server
+
+    from backend import create_app
+
+    # Per-request access logging would dominate the measurement
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, create_app(), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server
+
+
+def wait_until_healthy(base_url, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status_code, _ = make_request("GET", f"{base_url}/health")
+        if status_code == 200:
+            return True
+        time.sleep(0.2)
+    return False
+
+
+# ---------------------- SEEDING ----------------------
+
+def login(base_url, email, password):
+    status_code, response_data = make_request(
+        "POST", f"{base_url}/api/auth/login", data={"email": email, "password": password}
+    )
+    if status_code != 200 or not isinstance(response_data, dict):
+        raise SystemExit(f"Admin login failed ({status_code}): {response_data}. Run create_admin_user.py first.")
+    return response_data["data"]["token"]
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def seed(base_url, admin_headers, args, tag):
+    """Create ``args.courses`` courses with videos and enroll ``args.students`` students.
+
+    Returns (course_ids, enrollments) where enrollments is a list of (email, course_id).
+    """
+    today = time.strftime("%Y-%m-%d")
+    for i in range(args.courses):
+        course = {
+            "courseName": f"Bench {tag} {i}",
+            "description": "Benchmark course",
+            "fees": 1000 + i,
+            "startDate": "2024-01-01",
+            "endDate": "2099-12-31",
+            "videoExpireDays": 3650,
+        }
+        status_code, response_data = make_request("POST", f"{base_url}/api/courses/add", headers=admin_headers, data=course)
+        if status_code != 200:
+            raise SystemExit(f"Seeding courses failed ({status_code}): {response_data}")
+
+    courses = fetch_all_pages(f"{base_url}/api/courses/all-courses", headers=admin_headers, params={"limit": 1000}) or []
+    course_ids = [c["course_id"] for c in courses if str(c.get("course_name", "")).startswith(f"Bench {tag} ")]
+
+    videos = [
+        {
+            "courseId": course_id,
+            "title": f"Lesson {n}",
+            "description": f"Seeded on {today}",
+            "youtubeURL": f"https://youtu.be/bench{course_id}x{n}",
+        }
+        for course_id in course_ids
+        for n in range(args.videos_per_course)
+    ]
+    for chunk in _chunks(videos, args.batch_size):
+        status_code, response_data = make_request("POST", f"{base_url}/api/videos/bulk", headers=admin_headers, data=chunk)
+        if status_code != 200:
+            raise SystemExit(f"Seeding videos failed ({status_code}): {response_data}")
+
+    rng = random.Random(args.seed)
+    enrollments = [
+        (f"bench-{tag}-{i}@example.com", rng.choice(course_ids))
+        for i in range(args.students)
+    ] if course_ids else []
+    students = [
+        {"name": f"Bench Student {i}", "email": email, "courseId": course_id, "mobileNo": "9000000000"}
+        for i, (email, course_id) in enumerate(enrollments)
+    ]
+    for chunk in _chunks(students, args.batch_size):
+        status_code, response_data = make_request(
+            "POST", f"{base_url}/api/students/bulk-register", headers=admin_headers, data=chunk
+        )
+        if status_code != 200:
+            raise SystemExit(f"Seeding students failed ({status_code}): {response_data}")
+
+    return course_ids, enrollments
+
+
+# ---------------------- SCENARIOS ----------------------
+
+def build_scenarios(base_url, admin_headers, enrollments, student_tokens):
+    """Each scenario maps an RNG to the (method, url, headers, params) of one request."""
+    def active_courses(rng):
+        return "GET", f"{base_url}/api/courses/all-active-courses", None, None
+
+    def all_courses(rng):
+        return "GET", f"{base_url}/api/courses/all-courses", admin_headers, {"limit": 100}
+
+    def all_videos(rng):
+        return "GET", f"{base_url}/api/videos/all-videos", admin_headers, {"limit": 100}
+
+    def student_videos(rng):
+        email, course_id = rng.choice(enrollments)
+        headers = {"Authorization": f"Bearer {student_tokens[email]}"}
+        return "GET", f"{base_url}/api/videos/all/{email}/{course_id}", headers, None
+
+    scenarios = {
+        "active_courses": active_courses,
+        "all_courses": all_courses,
+        "all_videos": all_videos,
+    }
+    if enrollments:
+        scenarios["student_videos"] = student_videos
+    return scenarios
+
+
+# ---------------------- MEASUREMENT ----------------------
+
+def scrape_metrics(base_url):
+    status_code, body = make_request("GET", f"{base_url}/metrics")
+    samples = {}
+    if status_code != 200 or not isinstance(body, str):
+        return samples
+    for line in body.splitlines():
+        match = METRIC_LINE.match(line)
+        if match:
+            name, labels, value = match.groups()
+            samples[name + (labels or "")] = float(value.replace("+Inf", "inf"))
+    return samples
+
+
+def pool_wait_delta(before, after):
+    """Checkout count, mean and approximate p95 wait between two scrapes."""
+    name = "db_pool_checkout_wait_seconds"
+    count = after.get(f"{name}_count", 0) - before.get(f"{name}_count", 0)
+    total = after.get(f"{name}_sum", 0) - before.get(f"{name}_sum", 0)
+    timeouts = after.get("db_pool_checkout_timeouts_total", 0) - before.get("db_pool_checkout_timeouts_total", 0)
+
+    p95 = None
+    if count:
+        buckets = sorted(
+            (float(key.split('le="')[1].rstrip('"}').replace("+Inf", "inf")), after[key] - before.get(key, 0))
+            for key in after if key.startswith(f"{name}_bucket")
+        )
+        for bound, cumulative in buckets:
+            if cumulative >= 0.95 * count:
+                p95 = bound
+                break
+
+    return {
+        "checkouts": int(count),
+        "mean_ms": round(total / count * 1000, 3) if count else None,
+        "p95_ms_upper_bound": None if p95 is None or p95 == float("inf") else p95 * 1000,
+        "timeouts": int(timeouts),
+    }
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def run_scenario(base_url, build_request, clients, duration, seed_value):
+    latencies = []
+    errors = 0
+    statuses = {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(index):
+        nonlocal errors
+        rng = random.Random(seed_value + index)
+        local, local_errors, local_statuses = [], 0, {}
+        while time.perf_counter() < deadline:
+            method, url, headers, params = build_request(rng)
+            started = time.perf_counter()
+            status_code, _ = make_request(method, url, headers=headers, params=params)
+            local.append(time.perf_counter() - started)
+            local_statuses[status_code] = local_statuses.get(status_code, 0) + 1
+            if status_code != 200:
+                local_errors += 1
+        with lock:
+            latencies.extend(local)
+            errors += local_errors
+            for status_code, count in local_statuses.items():
+                statuses[str(status_code)] = statuses.get(str(status_code), 0) + count
+
+    before = scrape_metrics(base_url)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(client, range(clients)))
+    elapsed = time.perf_counter() - started
+    after = scrape_metrics(base_url)
+
+    latencies.sort()
+    to_ms = lambda value: None if value is None else round(value * 1000, 3)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "status_codes": statuses,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            "p50": to_ms(percentile(latencies, 50)),
+            "p95": to_ms(percentile(latencies, 95)),
+            "p99": to_ms(percentile(latencies, 99)),
+            "max": to_ms(latencies[-1] if latencies else None),
+        },
+        "pool_wait": pool_wait_delta(before, after),
+    }
+
+
+# ---------------------- MAIN ----------------------
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Benchmark a running server instead of starting one in-process")
+    parser.add_argument("--admin-email", default="admin@example.com")
+    parser.add_argument("--admin-password", default="admin123")
+    parser.add_argument("--courses", type=int, default=20)
+    parser.add_argument("--videos-per-course", type=int, default=50)
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows per bulk seeding request")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent clients per scenario")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per scenario")
+    parser.add_argument("--scenarios", default=",".join(DEFAULT_SCENARIOS))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        base_url, server = start_local_server()
+    if not wait_until_healthy(base_url):
+        raise SystemExit(f"Server at {base_url} is not healthy")
+
+    try:
+        admin_headers = {"Authorization": f"Bearer {login(base_url, args.admin_email, args.admin_password)}"}
+
+        tag = f"{int(time.time())}"
+        print(f"Seeding {args.courses} courses, {args.courses * args.videos_per_course} videos, "
+              f"{args.students} students...", file=sys.stderr)
+        seed_started = time.perf_counter()
+        course_ids, enrollments = seed(base_url, admin_headers, args, tag)
+        seed_seconds = time.perf_counter() - seed_started
+
+        from backend.utils.jwt_helper import create_access_token
+        student_tokens = {email: create_access_token(email, {"role": "student"}) for email, _ in enrollments}
+        scenarios = build_scenarios(base_url, admin_headers, enrollments, student_tokens)
+
+        results = {}
+        for name in [s.strip() for s in args.scenarios.split(",") if s.strip()]:
+            if name not in scenarios:
+                print(f"Skipping unknown or unavailable scenario: {name}", file=sys.stderr)
+                continue
+            print(f"Running {name} with {args.clients} clients for {args.duration}s...", file=sys.stderr)
+            results[name] = run_scenario(base_url, scenarios[name], args.clients, args.duration, args.seed)
+
+        report = {
+            "config": {
+                "url": args.url or "in-process",
+                "courses": len(course_ids),
+                "videos": len(course_ids) * args.videos_per_course,
+                "students": len(enrollments),
+                "clients": args.clients,
+                "duration_seconds": args.duration,
+                "seed": args.seed,
+                "seed_seconds": round(seed_seconds, 2),
+            },
+            "results": results,
+        }
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
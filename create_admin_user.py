@@ -1,7 +1,6 @@
 """Script to create an admin user for testing"""
-from backend.db import Database
-from backend.utils.password import hash_password_sha256
-import mysql.connector
+from backend.db import Database, DatabaseError
+from backend.utils.password import hash_password
 
 def create_admin_user():
     """Create an admin user"""
@@ -9,7 +8,7 @@ def create_admin_user():
     password = "admin123"
     role = "admin"
     
-    hash_password = hash_password_sha256(password)
+    hashed_password = hash_password(password)
     
     connection = Database.get_connection()
     try:
@@ -23,11 +22,11 @@ def create_admin_user():
         if existing:
             print(f"User {email} already exists. Updating to admin role...")
             update_sql = "UPDATE users SET password = %s, role = %s WHERE email = %s"
-            cursor.execute(update_sql, (hash_password, role, email))
+            cursor.execute(update_sql, (hashed_password, role, email))
         else:
             print(f"Creating admin user {email}...")
             insert_sql = "INSERT INTO users (email, password, role) VALUES (%s, %s, %s)"
-            cursor.execute(insert_sql, (email, hash_password, role))
+            cursor.execute(insert_sql, (email, hashed_password, role))
         
         connection.commit()
         cursor.close()
@@ -36,7 +35,7 @@ def create_admin_user():
         print(f"   Password: {password}")
         print(f"   Role: {role}")
         
-    except mysql.connector.Error as e:
+    except DatabaseError as e:
         connection.rollback()
         print(f"❌ Error: {str(e)}")
     finally:
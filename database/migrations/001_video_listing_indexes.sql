@@ -0,0 +1,7 @@
+-- Indexes backing GET /api/videos/all/<email>/<course_id>.
+-- Apply once to databases created from an earlier schema.sql:
+--   mysql -u root -proot < database/migrations/001_video_listing_indexes.sql
+USE institute_management_db;
+
+CREATE INDEX idx_students_email_course ON students (email, course_id);
+CREATE INDEX idx_videos_course_added ON videos (course_id, added_at);
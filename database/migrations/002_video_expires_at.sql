@@ -0,0 +1,14 @@
+-- Materialise each video's expiry so student listings and expiry sweeps
+-- become indexed range reads on videos.expires_at.
+--   mysql -u root -proot < database/migrations/002_video_expires_at.sql
+USE institute_management_db;
+
+ALTER TABLE videos ADD COLUMN expires_at DATETIME NULL AFTER added_at;
+
+UPDATE videos AS v
+INNER JOIN courses AS c ON c.course_id = v.course_id
+SET v.expires_at = DATE_ADD(COALESCE(v.added_at, NOW()), INTERVAL COALESCE(c.video_expire_days, 0) DAY);
+
+CREATE INDEX idx_videos_course_expires ON videos (course_id, expires_at);
+CREATE INDEX idx_videos_expires ON videos (expires_at);
+DROP INDEX idx_videos_course_added ON videos;
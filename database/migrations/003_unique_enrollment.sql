@@ -0,0 +1,13 @@
+-- One enrollment per (email, course_id), enforced by the database so
+-- register-to-course can rely on duplicate-key errors instead of a lookup.
+--   mysql -u root -proot < database/migrations/003_unique_enrollment.sql
+USE institute_management_db;
+
+-- Keep the earliest registration where duplicates already exist.
+DELETE s1 FROM students AS s1
+INNER JOIN students AS s2
+    ON s1.email = s2.email AND s1.course_id = s2.course_id AND s1.reg_no > s2.reg_no;
+
+ALTER TABLE students
+    ADD UNIQUE KEY uq_students_email_course (email, course_id),
+    DROP INDEX idx_students_email_course;
@@ -0,0 +1,18 @@
+-- Refresh tokens for /api/auth/refresh and /api/auth/logout.
+--   mysql -u root -proot < database/migrations/004_refresh_tokens.sql
+-- Expired rows can be purged at any time:
+--   DELETE FROM refresh_tokens WHERE expires_at < NOW();
+USE institute_management_db;
+
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    token_id CHAR(32) NOT NULL PRIMARY KEY,
+    family_id CHAR(32) NOT NULL,
+    email VARCHAR(100) NOT NULL,
+    issued_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at DATETIME NOT NULL,
+    revoked_at DATETIME NULL,
+    replaced_by CHAR(32) NULL,
+    FOREIGN KEY (email) REFERENCES users(email) ON DELETE CASCADE,
+    INDEX idx_refresh_tokens_family (family_id),
+    INDEX idx_refresh_tokens_expires (expires_at)
+);
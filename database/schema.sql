@@ -25,7 +25,8 @@ CREATE TABLE IF NOT EXISTS students (
     mobile_no VARCHAR(15),
     profile_pic BLOB,
     FOREIGN KEY (email) REFERENCES users(email),
-    FOREIGN KEY (course_id) REFERENCES courses(course_id)
+    FOREIGN KEY (course_id) REFERENCES courses(course_id),
+    UNIQUE KEY uq_students_email_course (email, course_id)
 );
 
 CREATE TABLE IF NOT EXISTS videos (
@@ -34,7 +35,25 @@ CREATE TABLE IF NOT EXISTS videos (
     title VARCHAR(100) NOT NULL,
     youtube_url VARCHAR(255) NOT NULL,
     added_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    -- added_at + courses.video_expire_days, maintained by the video and course write paths
+    expires_at DATETIME NULL,
     description VARCHAR(255) NOT NULL,
-    FOREIGN KEY (course_id) REFERENCES courses(course_id) ON DELETE CASCADE
+    FOREIGN KEY (course_id) REFERENCES courses(course_id) ON DELETE CASCADE,
+    INDEX idx_videos_course_expires (course_id, expires_at),
+    INDEX idx_videos_expires (expires_at)
 );
 
+
+-- One row per issued refresh token; family_id groups the tokens rotated from a single login
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    token_id CHAR(32) NOT NULL PRIMARY KEY,
+    family_id CHAR(32) NOT NULL,
+    email VARCHAR(100) NOT NULL,
+    issued_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at DATETIME NOT NULL,
+    revoked_at DATETIME NULL,
+    replaced_by CHAR(32) NULL,
+    FOREIGN KEY (email) REFERENCES users(email) ON DELETE CASCADE,
+    INDEX idx_refresh_tokens_family (family_id),
+    INDEX idx_refresh_tokens_expires (expires_at)
+);
@@ -0,0 +1,61 @@
+-- SQLite counterpart of schema.sql, applied automatically when DB_BACKEND=sqlite.
+-- Timestamps are stored as 'YYYY-MM-DD HH:MM:SS' local time, like MySQL's DATETIME.
+
+CREATE TABLE IF NOT EXISTS users (
+    email VARCHAR(100) NOT NULL UNIQUE,
+    password VARCHAR(255) NOT NULL,
+    role TEXT DEFAULT 'student' CHECK (role IN ('student', 'admin'))
+);
+
+CREATE TABLE IF NOT EXISTS courses (
+    course_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    course_name VARCHAR(100) NOT NULL,
+    description VARCHAR(255) NOT NULL,
+    fees INT,
+    start_date DATE,
+    end_date DATE,
+    video_expire_days INT
+);
+
+CREATE TABLE IF NOT EXISTS students (
+    reg_no INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(100) NOT NULL,
+    email VARCHAR(100) NOT NULL,
+    course_id INT NOT NULL,
+    mobile_no VARCHAR(15),
+    profile_pic BLOB,
+    FOREIGN KEY (email) REFERENCES users(email),
+    FOREIGN KEY (course_id) REFERENCES courses(course_id),
+    CONSTRAINT uq_students_email_course UNIQUE (email, course_id)
+);
+
+CREATE TABLE IF NOT EXISTS videos (
+    video_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    course_id INT,
+    title VARCHAR(100) NOT NULL,
+    youtube_url VARCHAR(255) NOT NULL,
+    added_at DATETIME DEFAULT (datetime('now', 'localtime')),
+    -- added_at + courses.video_expire_days, maintained by the video and course write paths
+    expires_at DATETIME NULL,
+    description VARCHAR(255) NOT NULL,
+    FOREIGN KEY (course_id) REFERENCES courses(course_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_videos_course_expires ON videos (course_id, expires_at);
+CREATE INDEX IF NOT EXISTS idx_videos_expires ON videos (expires_at);
+
+
+-- One row per issued refresh token; family_id groups the tokens rotated from a single login
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    token_id CHAR(32) NOT NULL PRIMARY KEY,
+    family_id CHAR(32) NOT NULL,
+    email VARCHAR(100) NOT NULL,
+    issued_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+    expires_at DATETIME NOT NULL,
+    revoked_at DATETIME NULL,
+    replaced_by CHAR(32) NULL,
+    FOREIGN KEY (email) REFERENCES users(email) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_refresh_tokens_family ON refresh_tokens (family_id);
+CREATE INDEX IF NOT EXISTS idx_refresh_tokens_expires ON refresh_tokens (expires_at);
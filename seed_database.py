@@ -0,0 +1,249 @@
+"""Generate a deterministic, production-sized dataset for local capacity work.
+
+Courses get spread-out date ranges, videos are skewed towards popular courses
+with added_at spread over each course's lifetime (expires_at filled in the way
+the API maintains it), and students enroll in one or more courses. The same
+--seed and --anchor-date always produce the same rows.
+
+    python seed_database.py --courses 500 --videos 100000 --students 200000
+    python seed_database.py --method load-data ...   # LOAD DATA LOCAL INFILE (server needs local_infile=ON)
+
+Rows go to the database selected by DB_BACKEND; --method load-data is MySQL only.
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from itertools import accumulate, islice
+
+import mysql.connector
+
+from backend.config.settings import settings
+from backend.db import Database, DatabaseError, get_driver
+from backend.utils.password import hash_password
+
+DEFAULT_PASSWORD = "sunbeam"
+EXPIRE_DAY_CHOICES = (30, 90, 180, 365, 730)
+TOPICS = ("Python", "Java", "Data Structures", "DBMS", "Web Development", "Machine Learning",
+          "Operating Systems", "Networks", "C++", "Cloud Computing", "DevOps", "Android")
+
+
+# ---------------------- GENERATORS ----------------------
+
+def generate_courses(rng, count, first_id, anchor):
+    """Courses starting between two years before and six months after ``anchor``."""
+    for offset in range(count):
+        course_id = first_id + offset
+        start = anchor - timedelta(days=rng.randint(-180, 730))
+        end = start + timedelta(days=rng.randint(30, 365))
+        yield (
+            course_id,
+            f"{rng.choice(TOPICS)} Batch {course_id}",
+            f"Seeded course {course_id}",
+            rng.randrange(2000, 60000, 500),
+            start,
+            end,
+            rng.choice(EXPIRE_DAY_CHOICES),
+        )
+
+
+def generate_videos(rng, count, courses, anchor):
+    """Videos spread over courses with a long-tail skew; added_at falls within the course's run."""
+    cum_weights = list(accumulate(1 / (rank + 1) ** 0.8 for rank in range(len(courses))))
+    anchor_dt = datetime.combine(anchor, datetime.min.time())
+    for n in range(count):
+        course_id, _, _, _, start, end, expire_days = rng.choices(courses, cum_weights=cum_weights)[0]
+        first = datetime.combine(start, datetime.min.time())
+        last = min(datetime.combine(end, datetime.min.time()), anchor_dt)
+        if last < first:
+            # Course not started yet: material uploaded during the month before the anchor
+            first = last - timedelta(days=30)
+        span = max(0, int((last - first).total_seconds()))
+        added_at = first + timedelta(seconds=rng.randint(0, span))
+        yield (
+            course_id,
+            f"Lecture {n + 1}",
+            f"https://youtu.be/seed{n:08d}",
+            added_at,
+            added_at + timedelta(days=expire_days),
+            f"Seeded video {n + 1}",
+        )
+
+
+def generate_students(rng, count, course_ids, max_enrollments, prefix):
+    """Yield (email, enrollment_rows) per student; each enrolls in 1..max_enrollments courses."""
+    for n in range(count):
+        email = f"{prefix}{n:08d}@example.com"
+        picks = rng.sample(course_ids, min(len(course_ids), rng.randint(1, max_enrollments)))
+        mobile = f"9{rng.randrange(10 ** 9):09d}"
+        yield email, [(f"Student {n}", email, course_id, mobile) for course_id in picks]
+
+
+# ---------------------- WRITERS ----------------------
+
+class BatchWriter:
+    """executemany in fixed-size batches (the connector rewrites them to multi-row INSERTs)."""
+
+    def __init__(self, connection, batch_size):
+        self.connection = connection
+        self.batch_size = batch_size
+
+    def write(self, table, columns, rows, ignore=False):
+        sql = (
+            f"{get_driver().insert_ignore if ignore else 'INSERT'} INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))})"
+        )
+        total = 0
+        rows = iter(rows)
+        with self.connection.cursor() as cursor:
+            while True:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    return total
+                cursor.executemany(sql, batch)
+                self.connection.commit()
+                total += len(batch)
+
+
+class LoadDataWriter:
+    """Spool rows to a temporary TSV file and load it with LOAD DATA LOCAL INFILE."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def write(self, table, columns, rows, ignore=False):
+        total = 0
+        fd, path = tempfile.mkstemp(suffix=".tsv")
+        try:
+            # Generated values never contain tabs, newlines or backslashes.
+            with os.fdopen(fd, "w", newline="") as fh:
+                writer = csv.writer(fh, delimiter="\t", lineterminator="\n", quoting=csv.QUOTE_NONE)
+                for row in rows:
+                    writer.writerow(row)
+                    total += 1
+            sql = (
+                f"LOAD DATA LOCAL INFILE '{path.replace(os.sep, '/')}' {'IGNORE ' if ignore else ''}"
+                f"INTO TABLE {table} FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' "
+                f"({', '.join(columns)})"
+            )
+            with self.connection.cursor() as cursor:
+                cursor.execute(sql)
+            self.connection.commit()
+        finally:
+            os.remove(path)
+        return total
+
+
+# ---------------------- MAIN ----------------------
+
+COURSE_COLUMNS = ("course_id", "course_name", "description", "fees", "start_date", "end_date", "video_expire_days")
+VIDEO_COLUMNS = ("course_id", "title", "youtube_url", "added_at", "expires_at", "description")
+USER_COLUMNS = ("email", "password", "role")
+STUDENT_COLUMNS = ("name", "email", "course_id", "mobile_no")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--courses", type=int, default=200)
+    parser.add_argument("--videos", type=int, default=100000, help="Total videos across all courses")
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--max-enrollments", type=int, default=3, help="Courses per student, 1..N")
+    parser.add_argument("--prefix", default="seed", help="Student emails are <prefix><n>@example.com")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--anchor-date", type=date.fromisoformat, default=date.today(),
+                        help="Dates are generated relative to this day (YYYY-MM-DD)")
+    parser.add_argument("--method", choices=("batch", "load-data"), default="batch")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    return parser.parse_args(argv)
+
+
+# Rows are generated consistent with each other; skip per-row FK lookups.
+FOREIGN_KEY_CHECKS = {
+    "mysql": ("SET SESSION foreign_key_checks = 0", "SET SESSION foreign_key_checks = 1"),
+    "sqlite": ("PRAGMA foreign_keys = OFF", "PRAGMA foreign_keys = ON"),
+}
+
+
+def _connect(method):
+    if method == "load-data":
+        if settings.db_backend != "mysql":
+            raise SystemExit("--method load-data needs DB_BACKEND=mysql")
+        return mysql.connector.connect(
+            host=settings.mysql_host,
+            port=settings.mysql_port,
+            user=settings.mysql_user,
+            password=settings.mysql_password,
+            database=settings.mysql_database,
+            allow_local_infile=True,
+        )
+    # Bulk inserts run far longer than any request; lift the statement timeout.
+    return Database.get_connection(timeout=0)
+
+
+def _timed(label, write):
+    started = time.perf_counter()
+    rows = write()
+    elapsed = time.perf_counter() - started
+    print(f"{label}: {rows} rows in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:.0f} rows/s)", file=sys.stderr)
+    return rows
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    rng = random.Random(args.seed)
+    # Every seeded student shares one hash; a KDF call per row would dominate the run.
+    password_hash = hash_password(DEFAULT_PASSWORD)
+
+    disable_fk_checks, enable_fk_checks = FOREIGN_KEY_CHECKS.get(settings.db_backend, (None, None))
+    connection = _connect(args.method)
+    try:
+        writer = LoadDataWriter(connection) if args.method == "load-data" else BatchWriter(connection, args.batch_size)
+        with connection.cursor() as cursor:
+            if disable_fk_checks:
+                cursor.execute(disable_fk_checks)
+            cursor.execute("SELECT COALESCE(MAX(course_id), 0) FROM courses")
+            first_course_id = cursor.fetchone()[0] + 1
+
+        courses = list(generate_courses(rng, args.courses, first_course_id, args.anchor_date))
+        course_ids = [course[0] for course in courses]
+        _timed("courses", lambda: writer.write("courses", COURSE_COLUMNS, courses))
+        _timed("videos", lambda: writer.write(
+            "videos", VIDEO_COLUMNS, generate_videos(rng, args.videos, courses, args.anchor_date)
+        ))
+
+        # Users and enrollments come from one pass; enrollments are spooled per chunk of students.
+        def write_students():
+            total = 0
+            students = generate_students(rng, args.students, course_ids, args.max_enrollments, args.prefix)
+            while True:
+                chunk = list(islice(students, args.batch_size))
+                if not chunk:
+                    return total
+                # Re-runs with the same prefix skip existing users and enrollments.
+                writer.write("users", USER_COLUMNS, ((email, password_hash, "student") for email, _ in chunk), ignore=True)
+                total += writer.write("students", STUDENT_COLUMNS, (row for _, rows in chunk for row in rows), ignore=True)
+
+        _timed("enrollments", write_students)
+    except (mysql.connector.Error, DatabaseError) as e:
+        connection.rollback()
+        print(f"❌ Error: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        try:
+            if enable_fk_checks:
+                with connection.cursor() as cursor:
+                    cursor.execute(enable_fk_checks)
+        except (mysql.connector.Error, DatabaseError):
+            pass
+        connection.close()
+
+    print(f"✅ Seeded courses {course_ids[0] if course_ids else '-'}..{course_ids[-1] if course_ids else '-'} "
+          f"(seed={args.seed}, anchor={args.anchor_date.isoformat()}, default password '{DEFAULT_PASSWORD}')")
+
+
+if __name__ == "__main__":
+    main()
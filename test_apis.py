@@ -1,5 +1,7 @@
 """Test script for all API endpoints"""
 import json
+import sys
+import threading
 import time
 import urllib.request
 import urllib.parse
@@ -9,6 +11,11 @@ BASE_URL = "http://127.0.0.1:5000"
 
 def make_request(method, url, headers=None, data=None, params=None):
     """Make HTTP request"""
+    status_code, response_data, _ = make_request_with_headers(method, url, headers, data, params)
+    return status_code, response_data
+
+def make_request_with_headers(method, url, headers=None, data=None, params=None):
+    """Make HTTP request; also returns the response headers"""
     if params:
         url += "?" + urllib.parse.urlencode(params)
     
@@ -25,17 +32,31 @@ def make_request(method, url, headers=None, data=None, params=None):
             status_code = response.getcode()
             response_data = response.read().decode('utf-8')
             try:
-                return status_code, json.loads(response_data)
+                return status_code, json.loads(response_data), response.headers
             except:
-                return status_code, response_data
+                return status_code, response_data, response.headers
     except urllib.error.HTTPError as e:
         response_data = e.read().decode('utf-8')
         try:
-            return e.code, json.loads(response_data)
+            return e.code, json.loads(response_data), e.headers
         except:
-            return e.code, response_data
+            return e.code, response_data, e.headers
     except Exception as e:
-        return None, str(e)
+        return None, str(e), {}
+
+def fetch_all_pages(url, headers=None, params=None):
+    """Follow next_cursor through a paginated list endpoint and return every row"""
+    params = dict(params or {})
+    rows = []
+    while True:
+        status_code, response_data = make_request("GET", url, headers=headers, params=params)
+        if status_code != 200 or not isinstance(response_data, dict) or not response_data.get("success"):
+            return None
+        rows.extend(response_data.get("data") or [])
+        next_cursor = response_data.get("next_cursor")
+        if not next_cursor:
+            return rows
+        params["cursor"] = next_cursor
 
 def print_response(title, status_code, response_data):
     """Print formatted response"""
@@ -78,6 +99,38 @@ def test_login():
     print("\n⚠️  Login failed. Ensure admin user exists.")
     return None
 
+def test_refresh_token():
+    """Refresh rotates the refresh token; replaying the spent one is rejected"""
+    print("\n[2b] Testing Token Refresh...")
+    login_data = {"email": "admin@example.com", "password": "admin123"}
+    status_code, response_data = make_request("POST", f"{BASE_URL}/api/auth/login", data=login_data)
+    if status_code != 200 or not isinstance(response_data, dict):
+        return False
+    refresh_token = response_data.get("data", {}).get("refreshToken")
+
+    status_code, response_data = make_request("POST", f"{BASE_URL}/api/auth/refresh", data={"refreshToken": refresh_token})
+    print_response("Refresh Token", status_code, response_data)
+    if status_code != 200 or not isinstance(response_data, dict):
+        return False
+    rotated = response_data.get("data", {}).get("refreshToken")
+
+    replay_status, _ = make_request("POST", f"{BASE_URL}/api/auth/refresh", data={"refreshToken": refresh_token})
+    logout_status, _ = make_request("POST", f"{BASE_URL}/api/auth/logout", data={"refreshToken": rotated})
+    return rotated != refresh_token and replay_status == 401 and logout_status == 200
+
+def test_login_rate_limit(max_attempts=20):
+    """Repeated failed logins for one email end in 429 with Retry-After"""
+    print("\n[2c] Testing Login Lockout (Repeated Failures - Should Be 429)...")
+    login_data = {"email": f"locked{int(time.time())}@example.com", "password": "wrong-password"}
+    failures = 0
+    for _ in range(max_attempts):
+        status_code, response_data, headers = make_request_with_headers("POST", f"{BASE_URL}/api/auth/login", data=login_data)
+        if status_code != 401:
+            break
+        failures += 1
+    print_response(f"Login After {failures} Failures", status_code, response_data)
+    return failures > 0 and status_code == 429 and int(headers.get("Retry-After", 0)) > 0
+
 # ---------------------- COURSES ----------------------
 
 def test_get_all_active_courses():
@@ -87,6 +140,20 @@ def test_get_all_active_courses():
     print_response("Get All Active Courses", status_code, response_data)
     return status_code == 200
 
+def test_conditional_get_active_courses():
+    """Repeating the request with the ETag as If-None-Match gets 304 and no body"""
+    print("\n[3b] Testing Conditional GET (If-None-Match - Should Be 304)...")
+    url = f"{BASE_URL}/api/courses/all-active-courses"
+    status_code, _, headers = make_request_with_headers("GET", url)
+    etag = headers.get("ETag")
+    if status_code != 200 or not etag:
+        print("\n⚠️  No ETag on the active courses listing.")
+        return False
+
+    status_code, response_data, headers = make_request_with_headers("GET", url, headers={"If-None-Match": etag})
+    print_response("Conditional GET (If-None-Match)", status_code, response_data)
+    return status_code == 304 and not response_data and headers.get("ETag") == etag
+
 def test_get_all_courses_without_token():
     """Test get all courses without token (should fail)"""
     print("\n[4] Testing Get All Courses (Without Token - Should Fail)...")
@@ -138,16 +205,14 @@ def test_add_course_with_token(token):
         return None
 
     # Try to get the latest course_id
-    status_code2, response_data2 = make_request("GET", f"{BASE_URL}/api/courses/all-courses", headers=headers)
-    if status_code2 == 200 and isinstance(response_data2, dict) and response_data2.get("success"):
-        data = response_data2.get("data") or []
-        if isinstance(data, list) and len(data) > 0:
-            # pick the course with max course_id
-            try:
-                latest = max(data, key=lambda x: x.get("course_id", 0))
-                return latest.get("course_id")
-            except Exception:
-                return None
+    data = fetch_all_pages(f"{BASE_URL}/api/courses/all-courses", headers=headers, params={"fields": "course_id"})
+    if data:
+        # pick the course with max course_id
+        try:
+            latest = max(data, key=lambda x: x.get("course_id", 0))
+            return latest.get("course_id")
+        except Exception:
+            return None
     return None
 
 def test_update_course_with_token(token, course_id):
@@ -204,23 +269,61 @@ def test_register_student_to_course(course_id):
     # Treat 200 as pass; if already enrolled (shouldn't happen), 400
     return (status_code == 200), email
 
-def test_change_password(email):
+def test_bulk_register_students(token, course_id, enrolled_email):
+    """Bulk import reports every row: new, repeated, invalid and already-enrolled rows (JSON numbers accepted)"""
+    print("\n[11c] Testing Bulk Register Students (Admin)...")
+    headers = {"Authorization": f"Bearer {token}"}
+    email = f"bulk{int(time.time())}@example.com"
+    rows = [
+        {"name": "Bulk Student", "email": email, "courseId": course_id},
+        {"name": "Bulk Student", "email": email, "courseId": course_id},
+        {"email": f"noname{int(time.time())}@example.com", "courseId": course_id},
+        {"name": "Bulk Student", "email": email, "courseId": 999999999},
+        {"name": "Test Student", "email": enrolled_email, "courseId": course_id},
+        {"name": "Bulk Student", "email": f"numeric{int(time.time())}@example.com", "courseId": str(course_id), "mobileNo": 9876543210}
+    ]
+    status_code, response_data = make_request("POST", f"{BASE_URL}/api/students/bulk-register", headers=headers, data=rows)
+    print_response("Bulk Register Students", status_code, response_data)
+    if status_code != 200 or not isinstance(response_data, dict):
+        return False
+    statuses = [row.get("status") for row in response_data.get("data", {}).get("results", [])]
+    return statuses == ["enrolled", "duplicate", "invalid", "invalid", "already_enrolled", "enrolled"]
+
+def test_login_student(email, password="sunbeam"):
+    """Logs in a student (registration sets the default password 'sunbeam')"""
+    print("\n[11b] Testing Login (Student)...")
+    status_code, response_data = make_request("POST", f"{BASE_URL}/api/auth/login", data={"email": email, "password": password})
+    print_response("Login (Student)", status_code, response_data)
+    if status_code == 200 and isinstance(response_data, dict) and response_data.get("success"):
+        return response_data.get("data", {}).get("token")
+    return None
+
+def test_change_password(email, token):
     """Changes password for given email"""
     print("\n[12] Testing Change Password...")
+    headers = {"Authorization": f"Bearer {token}"}
     payload = {"newPassword": "newpass123", "confirmPassword": "newpass123"}
-    status_code, response_data = make_request("PUT", f"{BASE_URL}/api/students/change-password/{email}", data=payload)
+    status_code, response_data = make_request("PUT", f"{BASE_URL}/api/students/change-password/{email}", headers=headers, data=payload)
     print_response("Change Password", status_code, response_data)
     return status_code == 200
 
 # ---------------------- VIDEOS ----------------------
 
-def test_get_videos_for_student(email, course_id):
-    """Public: list videos for student+course (may be empty)"""
-    print("\n[13] Testing Get Videos for Student (Public)...")
-    status_code, response_data = make_request("GET", f"{BASE_URL}/api/videos/all/{email}/{course_id}")
+def test_get_videos_for_student(email, course_id, token):
+    """Student: list own videos for a course (may be empty)"""
+    print("\n[13] Testing Get Videos for Student...")
+    headers = {"Authorization": f"Bearer {token}"}
+    status_code, response_data = make_request("GET", f"{BASE_URL}/api/videos/all/{email}/{course_id}", headers=headers)
     print_response("Get Videos for Student", status_code, response_data)
     return status_code == 200
 
+def test_get_videos_for_student_without_token(email, course_id):
+    """Student video list without token should fail"""
+    print("\n[13b] Testing Get Videos for Student (Without Token - Should Fail)...")
+    status_code, response_data = make_request("GET", f"{BASE_URL}/api/videos/all/{email}/{course_id}")
+    print_response("Get Videos for Student (No Token)", status_code, response_data)
+    return status_code == 401
+
 def test_get_all_videos_without_token():
     """Admin videos without token should fail"""
     print("\n[14] Testing Get All Videos (Without Token - Should Fail)...")
@@ -244,14 +347,12 @@ def test_add_video(token, course_id):
 
 def get_latest_video_id(token, course_id):
     headers = {"Authorization": f"Bearer {token}"}
-    status_code, response_data = make_request("GET", f"{BASE_URL}/api/videos/all-videos", headers=headers, params={"courseId": course_id})
-    if status_code == 200 and isinstance(response_data, dict) and response_data.get("success"):
-        data = response_data.get("data") or []
-        if isinstance(data, list) and len(data) > 0:
-            try:
-                return max(data, key=lambda x: x.get("video_id", 0)).get("video_id")
-            except Exception:
-                return None
+    data = fetch_all_pages(f"{BASE_URL}/api/videos/all-videos", headers=headers, params={"courseId": course_id, "fields": "video_id"})
+    if data:
+        try:
+            return max(data, key=lambda x: x.get("video_id", 0)).get("video_id")
+        except Exception:
+            return None
     return None
 
 def test_get_all_videos_with_token(token, course_id):
@@ -281,6 +382,101 @@ def test_delete_video(token, video_id):
     print_response("Delete Video (Admin)", status_code, response_data)
     return status_code == 200
 
+def test_bulk_videos(token, course_id):
+    """Bulk upload is all-or-nothing: one bad row rejects the batch with a per-row report"""
+    print("\n[19] Testing Bulk Upload Videos (Admin)...")
+    headers = {"Authorization": f"Bearer {token}"}
+    url = f"{BASE_URL}/api/videos/bulk"
+    params = {"courseId": course_id, "fields": "video_id"}
+    video = {"courseId": course_id, "title": "Bulk Video", "description": "Bulk upload", "youtubeURL": "https://youtu.be/dQw4w9WgXcQ"}
+    before = fetch_all_pages(f"{BASE_URL}/api/videos/all-videos", headers=headers, params=params)
+
+    invalid_status, invalid_data = make_request("POST", url, headers=headers, data=[video, {"courseId": course_id}])
+    print_response("Bulk Upload Videos (Missing Title - Should Fail)", invalid_status, invalid_data)
+    unknown_status, unknown_data = make_request("POST", url, headers=headers, data=[video, dict(video, courseId=999999999)])
+    print_response("Bulk Upload Videos (Unknown Course - Should Fail)", unknown_status, unknown_data)
+    rejected = fetch_all_pages(f"{BASE_URL}/api/videos/all-videos", headers=headers, params=params)
+
+    status_code, response_data = make_request("POST", url, headers=headers, data=[video, dict(video, title="Bulk Video 2")])
+    print_response("Bulk Upload Videos", status_code, response_data)
+    after = fetch_all_pages(f"{BASE_URL}/api/videos/all-videos", headers=headers, params=params)
+
+    if None in (before, rejected, after) or not isinstance(invalid_data, dict) or not isinstance(unknown_data, dict):
+        return False
+    return (
+        invalid_status == 400 and [e["row"] for e in invalid_data.get("data", {}).get("errors", [])] == [2]
+        and unknown_status == 404 and [e["row"] for e in unknown_data.get("data", {}).get("errors", [])] == [2]
+        and len(rejected) == len(before)
+        and status_code == 200 and len(after) == len(before) + 2
+    )
+
+# ---------------------- OVERLOAD PROTECTION ----------------------
+# Run with: py test_apis.py --breaker, against a server started with
+# DB_BREAKER_SLOW_SECONDS=0 DB_BREAKER_MIN_CALLS=5 DB_BREAKER_OPEN_SECONDS=5 CACHE_TTL_SECONDS=1
+# so that every statement counts as slow and the breaker opens after a few requests.
+
+def test_breaker_open(max_attempts=30):
+    """Once the circuit breaker opens, database routes answer 503 with Retry-After"""
+    print("\n[B1] Testing Circuit Breaker (Should Be 503)...")
+    for attempt in range(max_attempts):
+        login_data = {"email": f"breaker{attempt}-{int(time.time())}@example.com", "password": "wrong-password"}
+        status_code, response_data, headers = make_request_with_headers("POST", f"{BASE_URL}/api/auth/login", data=login_data)
+        if status_code != 401:
+            break
+    print_response("Login While Breaker Open", status_code, response_data)
+    if status_code != 503:
+        return None
+    return int(headers.get("Retry-After", 0)) or None
+
+def test_stale_catalog():
+    """While the breaker is open the catalog is served from its last listing, marked stale"""
+    print("\n[B2] Testing Stale Catalog (Breaker Open)...")
+    time.sleep(1.5)  # let the cached listing expire (CACHE_TTL_SECONDS=1)
+    status_code, response_data, headers = make_request_with_headers("GET", f"{BASE_URL}/api/courses/all-active-courses")
+    print_response("Get All Active Courses (Stale)", status_code, response_data)
+    return status_code == 200 and (headers.get("Warning") or "").startswith("110")
+
+def test_breaker_single_probe(token, retry_after, callers=5):
+    """After the open period one caller probes the database; the rest keep getting 503.
+
+    The first probe goes to a bulk import with no valid rows, which checks out a
+    connection but runs no statement, so its slot is released at teardown and the
+    next caller must claim it alone.
+    """
+    print("\n[B3] Testing Circuit Breaker Probe (One Caller Admitted)...")
+    time.sleep(retry_after + 0.5)
+    headers = {"Authorization": f"Bearer {token}"}
+    status_code, response_data = make_request("POST", f"{BASE_URL}/api/students/bulk-register", headers=headers, data=[{"email": "probe@example.com"}])
+    print_response("Bulk Register (Probe Without Statements)", status_code, response_data)
+
+    statuses = []
+    def failed_login(number):
+        login_data = {"email": f"probe{number}-{int(time.time())}@example.com", "password": "wrong-password"}
+        statuses.append(make_request("POST", f"{BASE_URL}/api/auth/login", data=login_data)[0])
+    threads = [threading.Thread(target=failed_login, args=(number,)) for number in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"\nConcurrent login statuses: {sorted(statuses)}")
+    return status_code == 200 and sorted(statuses) == [401] + [503] * (callers - 1)
+
+def run_breaker_tests():
+    """Open the circuit breaker and check the degraded responses"""
+    results = []
+    # Log in and prime the catalog cache while the database is still reachable
+    token = test_login()
+    results.append(("Login", token is not None))
+    results.append(("Get All Active Courses (Public)", test_get_all_active_courses()))
+    retry_after = test_breaker_open()
+    results.append(("Circuit Breaker Open (503 With Retry-After)", retry_after is not None))
+    results.append(("Stale Catalog (Warning: 110)", test_stale_catalog()))
+    if token and retry_after:
+        results.append(("Circuit Breaker Probe (One Caller Admitted)", test_breaker_single_probe(token, retry_after)))
+    else:
+        results.append(("Circuit Breaker Probe (One Caller Admitted)", False))
+    return results
+
 # ---------------------- MAIN ----------------------
 
 def main():
@@ -293,6 +489,10 @@ def main():
     print("\nWaiting for server to be ready...")
     time.sleep(2)
     
+    if "--breaker" in sys.argv:
+        print_summary(run_breaker_tests())
+        return
+
     results = []
     
     # Test 1: Health Check
@@ -307,9 +507,11 @@ def main():
         return
     
     results.append(("Login", True))
+    results.append(("Refresh Token (Rotate, Replay, Logout)", test_refresh_token()))
     
     # Test 3: Get All Active Courses (Public)
     results.append(("Get All Active Courses (Public)", test_get_all_active_courses()))
+    results.append(("Conditional GET (304 on If-None-Match)", test_conditional_get_active_courses()))
     
     # Test 4: Get All Courses without token (should fail)
     results.append(("Get All Courses (No Token - Should Fail)", test_get_all_courses_without_token()))
@@ -341,10 +543,14 @@ def main():
     if course_id_for_student:
         ok_reg, student_email = test_register_student_to_course(course_id_for_student)
         results.append(("Register Student to Course", ok_reg))
-        results.append(("Change Password", test_change_password(student_email)))
+        results.append(("Bulk Register Students (Per-Row Report)", test_bulk_register_students(token, course_id_for_student, student_email)))
+        student_token = test_login_student(student_email)
+        results.append(("Login (Student)", student_token is not None))
+        results.append(("Change Password", test_change_password(student_email, student_token)))
 
-        # Videos: public list (likely empty initially)
-        results.append(("Get Videos for Student (Public)", test_get_videos_for_student(student_email, course_id_for_student)))
+        # Videos: student list (likely empty initially)
+        results.append(("Get Videos for Student", test_get_videos_for_student(student_email, course_id_for_student, student_token)))
+        results.append(("Get Videos for Student (No Token - Should Fail)", test_get_videos_for_student_without_token(student_email, course_id_for_student)))
 
         # Videos admin negative
         results.append(("Get All Videos (No Token - Should Fail)", test_get_all_videos_without_token()))
@@ -359,17 +565,28 @@ def main():
         else:
             results.append(("Update Video (Admin)", False))
             results.append(("Delete Video (Admin)", False))
+        results.append(("Bulk Upload Videos (All-or-Nothing)", test_bulk_videos(token, course_id_for_student)))
     else:
         results.append(("Register Student to Course", False))
+        results.append(("Bulk Register Students (Per-Row Report)", False))
+        results.append(("Login (Student)", False))
         results.append(("Change Password", False))
-        results.append(("Get Videos for Student (Public)", False))
+        results.append(("Get Videos for Student", False))
+        results.append(("Get Videos for Student (No Token - Should Fail)", False))
         results.append(("Get All Videos (No Token - Should Fail)", False))
         results.append(("Add Video (Admin)", False))
         results.append(("Get All Videos (With Token)", False))
         results.append(("Update Video (Admin)", False))
         results.append(("Delete Video (Admin)", False))
+        results.append(("Bulk Upload Videos (All-or-Nothing)", False))
     
-    # Print summary
+    # Last, as it spends this client's login budget
+    results.append(("Login Lockout (429 With Retry-After)", test_login_rate_limit()))
+
+    print_summary(results)
+
+def print_summary(results):
+    """Print pass/fail per test and the totals"""
     print("\n" + "="*60)
     print("TEST SUMMARY")
     print("="*60)